@@ -2,12 +2,13 @@ import sys
 
 from biscuit.core import App, check_python_installation
 
-check_python_installation()
+# symbol scanning worker processes import this module again
+if __name__ == "__main__":
+    check_python_installation()
 
-dir = None
-if len(sys.argv) >= 2:
-    dir = sys.argv[1]
-
-app = App(sys.argv[0], dir=dir)
-app.run()
+    dir = None
+    if len(sys.argv) >= 2:
+        dir = sys.argv[1]
 
+    app = App(sys.argv[0], dir=dir)
+    app.run()
@@ -287,6 +287,15 @@ class Commands:
     
     def change_git_branch(self, *_) -> None:
         self.base.palette.show('branch:')
+
+    def git_push(self, *_) -> None:
+        self.base.git.push()
+
+    def git_pull(self, *_) -> None:
+        self.base.git.pull()
+
+    def git_fetch(self, *_) -> None:
+        self.base.git.fetch()
     
     @command_palette_ignore
     def show_run_config_palette(self, command) -> None:
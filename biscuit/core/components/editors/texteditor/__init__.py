@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import queue
+import threading
 import tkinter as tk
 from hashlib import md5
 from tkinter.font import Font
@@ -9,6 +11,7 @@ from biscuit.core.utils import Scrollbar
 
 from ..comment_prefix import register_comment_prefix
 from ..editor import BaseEditor
+from .gutter import diff_markers
 from .linenumbers import LineNumbers
 from .menu import RunMenu
 from .minimap import Minimap
@@ -27,6 +30,11 @@ class TextEditor(BaseEditor):
         self.run_command_value = None
         self.unsupported = False
         self.content_hash = ''
+        self.git_diff_job = None
+        # diffs against HEAD run on a worker, the latest generation's markers are shown
+        self.git_diff_generation = 0
+        self.git_diff_polling = False
+        self.git_diff_results = queue.Queue()
         
         if not self.standalone:
             self.__buttons__ = [('sync', self.base.editorsmanager.reopen_active_editor),]
@@ -147,10 +155,62 @@ class TextEditor(BaseEditor):
         self.text.refresh()
         if not self.minimalist:
             self.minimap.redraw_cursor()
+        self.schedule_git_diff()
         self.event_generate("<<Change>>")
 
+    def schedule_git_diff(self):
+        """Updates the git change markers once typing pauses"""
+
+        if self.standalone or not self.exists or not self.path:
+            return
+
+        if self.git_diff_job:
+            self.after_cancel(self.git_diff_job)
+        self.git_diff_job = self.after(400, self.update_git_diff)
+
+    def update_git_diff(self):
+        self.git_diff_job = None
+        # results of diffs still running are outdated from here on
+        self.git_diff_generation += 1
+
+        repo = self.base.git.repo if self.base.git_found else None
+        if not (repo and self.editable) or not (path := repo.relpath(self.path)):
+            # nothing to diff, this generation still gets a result so a running poll ends
+            self.git_diff_results.put((self.git_diff_generation, {}))
+        else:
+            threading.Thread(target=self.diff_with_head, daemon=True,
+                             args=(repo, path, self.text.get_all_text(), self.git_diff_generation)).start()
+
+        if not self.git_diff_polling:
+            self.git_diff_polling = True
+            self.after(20, self.poll_git_diff)
+
+    def diff_with_head(self, repo, path: str, text: str, generation: int):
+        """Reads the file at HEAD and diffs the text against it, runs on a worker thread"""
+
+        try:
+            markers = diff_markers(repo.blobs.get(path).splitlines(), text.splitlines())
+        except Exception:
+            # untracked, new or binary file
+            markers = {}
+        self.git_diff_results.put((generation, markers))
+
+    def poll_git_diff(self):
+        try:
+            while True:
+                generation, markers = self.git_diff_results.get_nowait()
+                if generation == self.git_diff_generation:
+                    break
+        except queue.Empty:
+            self.after(20, self.poll_git_diff)
+            return
+
+        self.git_diff_polling = False
+        self.linenumbers.set_git_markers(markers)
+
     def on_scroll(self, *_):
         self.linenumbers.redraw()
+        self.text.tag_visible_semantic_tokens()
         if not self.minimalist:
             self.minimap.redraw()
         self.event_generate("<<Scroll>>")
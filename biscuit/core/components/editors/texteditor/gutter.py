@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+
+
+def diff_markers(old: list[str], new: list[str]) -> dict[int, str]:
+    """Compares the lines of a file at HEAD with the lines in the editor.
+
+    Returns {line: 'added' | 'modified' | 'deleted'} with 1 based line numbers of the
+    editor, 'deleted' marks the line that follows the removed lines. The common head
+    and tail are skipped first, as edits are usually local to one part of the file
+    only the lines in between are actually diffed.
+    """
+
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+
+    end = 0
+    while end < limit - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+
+    markers = {}
+    matcher = SequenceMatcher(None, old[start:len(old) - end], new[start:len(new) - end], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+
+        if tag == 'delete':
+            # past the last line, shown on the last line instead
+            markers.setdefault(max(1, min(start + j1 + 1, len(new))), 'deleted')
+            continue
+
+        kind = 'added' if tag == 'insert' else 'modified'
+        for j in range(j1, j2):
+            markers[start + j + 1] = kind
+
+    return markers
@@ -14,6 +14,11 @@ class LineNumbers(Canvas):
         self.bp_hover_color, _, self.bp_enabled_color, _ = self.base.theme.editors.linenumbers.breakpoint.values()
         self.breakpoints = set()
 
+        # lines changed since HEAD, {line: 'added' | 'modified' | 'deleted'}
+        self.git_markers = {}
+        diff = self.base.theme.editors.diff
+        self.git_colors = {'added': diff.gutter_added, 'modified': diff.gutter_modified, 'deleted': diff.gutter_deleted}
+
     def attach(self, text):
         self.text = text
 
@@ -32,6 +37,11 @@ class LineNumbers(Canvas):
     def set_bar_width(self, width):
         self.configure(width=width)
 
+    def set_git_markers(self, markers):
+        if markers != self.git_markers:
+            self.git_markers = markers
+            self.redraw()
+
     def toggle_breakpoint(self, line):
         if line in self.breakpoints:
             self.breakpoints.remove(line)
@@ -69,6 +79,15 @@ class LineNumbers(Canvas):
                           lambda _, linenum=linenum: self.toggle_breakpoint(linenum))
 
             self.create_text(40, y, anchor=tk.NE, text=linenum, font=self.font, tag=i, fill=self.hfg if y == cur_y else self.fg)
+
+            # Render git change marker next to the text
+            if marker := self.git_markers.get(linenum):
+                # kept within the last 5 visible pixels, right edge included
+                x = max(self.winfo_width(), int(self.cget('width'))) - 5
+                if marker == 'deleted':
+                    self.create_polygon(x, y - 3, x + 4, y, x, y + 3, fill=self.git_colors[marker], outline="")
+                else:
+                    self.create_rectangle(x, y, x + 3, y + dline[3], fill=self.git_colors[marker], outline="")
             i = self.text.index(f"{i}+1line")
 
     def on_breakpoint_enter(self, id, flag):
@@ -16,6 +16,7 @@ if typing.TYPE_CHECKING:
     from biscuit.core.components.lsp.data import WorkspaceEdits, HoverResponse, Jump, Underlines, Completions
     from . import TextEditor
 
+from biscuit.core.components.lsp.semantic import TOKEN_TYPES
 from biscuit.core.utils import Text as BaseText
 from biscuit.core.utils import textutils
 
@@ -27,6 +28,9 @@ BRACKET_MAP_REV = {v: k for k, v in BRACKET_MAP.items()}
 OPENING_BRACKETS = ("(", "{", "[")
 CLOSING_BRACKETS = (")", "}", "]")
 
+# underline tag per LSP DiagnosticSeverity
+DIAGNOSTIC_TAGS = {1: "diagnostic.error", 2: "diagnostic.warning", 3: "diagnostic.information", 4: "diagnostic.hint"}
+
 class Text(BaseText):
     """Improved Text widget"""
 
@@ -50,9 +54,16 @@ class Text(BaseText):
         self.words: list[str] = []
         self.lsp: bool = False
         
-        self.hover_after = None
         self.last_hovered = None
 
+        # diagnostics tagged in the text, (start, end, severity, text) -> mark id
+        self.diagnostics: dict[tuple, int] = {}
+        self.diagnostic_marks = 0
+
+        # semantic tokens by line (0 based), and the lines that are tagged already
+        self.semantic_lines: dict[int, list[tuple[int, int, str]]] = {}
+        self.semantic_tagged: set[int] = set()
+
         # self.last_change = Change(None, None, None, None, None)
         self.highlighter = Highlighter(self, language)
         if not self.standalone and not self.minimalist:
@@ -92,9 +103,24 @@ class Text(BaseText):
 
         self.tag_config("activebracket", background=self.base.theme.editors.activebracket)
         self.tag_config("red", foreground="red")
+        for tag, color in (("diagnostic.error", "red"), ("diagnostic.warning", "orange"),
+                           ("diagnostic.information", "#3794ff"), ("diagnostic.hint", "gray")):
+            try:
+                self.tag_config(tag, underline=True, underlinefg=color)
+            except tk.TclError:
+                # underline color needs Tk 8.6.6+
+                self.tag_config(tag, underline=True)
         for i in self.base.theme.editors.bracket_colors:
             self.tag_config(i, foreground=f"#{i}")
 
+        # semantic tokens are configured after the pygments tags, so they take priority
+        syntax = self.base.theme.syntax
+        for kind, token in TOKEN_TYPES.items():
+            while token not in syntax and token.parent:
+                token = token.parent
+            if token in syntax:
+                self.tag_config(f"semantic.{kind}", foreground=syntax[token])
+
     def config_bindings(self):
         self.bind("<KeyRelease>", self.key_release_events) 
 
@@ -578,10 +604,11 @@ class Text(BaseText):
             if self.ctrl_down:
                 self.tag_add("hyperlink", start, end)
         else:
-            # TODO hide with a delay, cancel hiding if mouse is on top of hover popup
-            self.hover.hide()
+            # the pointer may be on its way to the popup
+            self.hover.hide_later()
             self.tag_remove("hover", 1.0, tk.END)
             self.last_hovered = None
+            self.base.language_server_manager.cancel_hover(self)
             return
             
         if self.last_hovered == word:
@@ -591,12 +618,7 @@ class Text(BaseText):
         self.tag_remove("hover", 1.0, tk.END)
         self.tag_add("hover", start, end)
 
-        # TODO delayed hovers
-        # if self.hover_after:
-        #     self.after_cancel(self.hover_after)
-        
-        # self.after(500, ...)
-
+        # shown right away if cached, requested once the pointer rests otherwise
         self.base.language_server_manager.request_hover(self)
 
     def request_autocomplete(self, _):
@@ -614,12 +636,79 @@ class Text(BaseText):
     def lsp_show_autocomplete(self, response: Completions) -> None:
         self.autocomplete.lsp_update_completions(self, response.completions)
     
-    def lsp_diagnostics(self, response: Underlines) -> None: ...
-        # print("LSP <<< ", response)
-        # for i in response.underline_list:
-        #     # self.tag_add("error", f"{i.start[0]}.{i.start[1]}", f"{i.end[0]}.{i.end[1]}")
-        #     print(i.start, i.color, i.tooltip_text)
-    
+    def lsp_diagnostics(self, response: Underlines) -> None:
+        """Tags the diagnostics, only touching the ones that changed since the last publish.
+        Each one is tracked with a pair of marks so it can be untagged after edits moved it."""
+
+        new = {(i.start, i.end, i.severity, i.tooltip_text): i for i in response.underline_list}
+        removed = [key for key in self.diagnostics if key not in new]
+
+        touched = []
+        for key in removed:
+            mark = self.diagnostics.pop(key)
+            start, end = self.index(f"diag{mark}s"), self.index(f"diag{mark}e")
+            self.tag_remove(self.diagnostic_tag(key[2]), start, end)
+            self.mark_unset(f"diag{mark}s", f"diag{mark}e")
+            touched.append((int(start.split('.')[0]), int(end.split('.')[0])))
+
+        for key, underline in new.items():
+            if key in self.diagnostics:
+                continue
+
+            self.diagnostic_marks += 1
+            mark = self.diagnostic_marks
+            self.mark_set(f"diag{mark}s", underline.start)
+            self.mark_set(f"diag{mark}e", underline.end)
+            self.mark_gravity(f"diag{mark}s", tk.RIGHT)
+            self.mark_gravity(f"diag{mark}e", tk.LEFT)
+            self.tag_add(self.diagnostic_tag(underline.severity), underline.start, underline.end)
+            self.diagnostics[key] = mark
+
+        if not touched:
+            return
+
+        # untagging may have cut into diagnostics overlapping the removed ones
+        for key, mark in self.diagnostics.items():
+            start, end = self.index(f"diag{mark}s"), self.index(f"diag{mark}e")
+            first, last = int(start.split('.')[0]), int(end.split('.')[0])
+            if any(first <= b and a <= last for a, b in touched):
+                self.tag_add(self.diagnostic_tag(key[2]), start, end)
+
+    def lsp_semantic_tokens(self, lines: dict[int, list[tuple[int, int, str]]], changed: set[int] | None) -> None:
+        """Takes the decoded semantic tokens, `changed` being the lines to re-tag (None for all).
+        Only the visible lines are tagged, the rest as they are scrolled into view."""
+
+        self.semantic_lines = lines
+        if changed is None:
+            for kind in TOKEN_TYPES:
+                self.tag_remove(f"semantic.{kind}", "1.0", tk.END)
+            self.semantic_tagged.clear()
+        else:
+            for line in changed:
+                if line in self.semantic_tagged:
+                    self.semantic_tagged.discard(line)
+                    for kind in TOKEN_TYPES:
+                        self.tag_remove(f"semantic.{kind}", f"{line + 1}.0", f"{line + 1}.end")
+
+        self.tag_visible_semantic_tokens()
+
+    def tag_visible_semantic_tokens(self) -> None:
+        if not self.semantic_lines:
+            return
+
+        first = int(self.index("@0,0").split('.')[0]) - 1
+        last = int(self.index(f"@0,{self.winfo_height()}").split('.')[0])
+        for line in range(first, last):
+            if line in self.semantic_tagged:
+                continue
+
+            self.semantic_tagged.add(line)
+            for start, length, kind in self.semantic_lines.get(line, ()):
+                self.tag_add(f"semantic.{kind}", f"{line + 1}.{start}", f"{line + 1}.{start + length}")
+
+    def diagnostic_tag(self, severity: int) -> str:
+        return DIAGNOSTIC_TAGS.get(severity, "diagnostic.warning")
+
     def lsp_goto_definition(self, response: Jump) -> None:
         if not response.locations:
             return
@@ -938,7 +1027,8 @@ class Text(BaseText):
         self.hover.hide()
     
     def event_leave(self, _: tk.Event):
-        self.hover.hide()
+        self.hover.hide_later()
+        self.base.language_server_manager.cancel_hover(self)
 
     def event_mapped(self, _):
         try:
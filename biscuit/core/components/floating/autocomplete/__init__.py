@@ -3,13 +3,12 @@ from __future__ import annotations
 import re
 import tkinter as tk
 import typing
-from itertools import chain
 
 if typing.TYPE_CHECKING:
     from biscuit.core.components.editors.texteditor import Text
     from biscuit.core.components.lsp.data import Completion, Completions
 
-from biscuit.core.utils import Toplevel
+from biscuit.core.utils import Toplevel, fuzzy_filter
 
 from .item import CompletionItem
 
@@ -82,7 +81,7 @@ class AutoComplete(Toplevel):
         for i, completion in enumerate(completions):
             self.active_items[i].lsp_set_data(completion, term)
     
-    def set_active_items(self, words: list[str], term: str):
+    def set_active_items(self, words: list[str], positions: list[list[int]]):
         while len(self.active_items) > len(words):
             i = self.active_items.pop()
             i.grid_forget()
@@ -96,7 +95,7 @@ class AutoComplete(Toplevel):
 
         # now we have the same amount of items as words
         for i, word in enumerate(words):
-            self.active_items[i].set_data(word, term)
+            self.active_items[i].set_data(word, positions[i])
         
     def clear(self) -> None:
         while self.active_items:
@@ -125,19 +124,10 @@ class AutoComplete(Toplevel):
             self.hide()
             return
 
-        exact, starts, includes = [], [], []
-        for word in tab.words:
-            if word == term:
-                exact.append(word)
-            elif word.startswith(term):
-                starts.append(word)
-            elif term in word:
-                includes.append(word)
-        new = list(chain(exact, starts, includes))
-
-        if new:
+        matches = fuzzy_filter(term, tab.words, limit=10)
+        if matches:
             self.lsp_mode = False
-            self.set_active_items(new[:10], term)
+            self.set_active_items([i.item for i in matches], [i.positions for i in matches])
             self.show(tab)
         else:
             self.hide()
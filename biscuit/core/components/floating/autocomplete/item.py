@@ -3,7 +3,7 @@ from __future__ import annotations
 import tkinter as tk
 import typing
 
-from biscuit.core.utils import Frame
+from biscuit.core.utils import Frame, fuzzy_match
 
 from .kind import Kind
 
@@ -47,7 +47,7 @@ class CompletionItem(Frame):
         self.bind("<Enter>", self.on_hover)
         self.bind("<Leave>", self.off_hover)
     
-    def set_data(self, word: str, term: str):
+    def set_data(self, word: str, positions: list[int]):
         self.replace_start = ""
         self.replace_end = ""
         self.replace_text = word
@@ -59,7 +59,7 @@ class CompletionItem(Frame):
         self.text.config(state=tk.DISABLED)
 
         self.kind.set_kind()
-        self.mark_term(word, term)
+        self.mark_term(positions)
     
     def lsp_set_data(self, completion: Completion, term: str):
         self.replace_start = completion.replace_start
@@ -73,7 +73,8 @@ class CompletionItem(Frame):
         self.text.config(state=tk.DISABLED)
 
         self.kind.set_kind(completion.kind)
-        self.mark_term(completion.display_text, term)
+        match = fuzzy_match(term, completion.display_text)
+        self.mark_term(match[1] if match else [])
 
     def clear_data(self):
         self.replace_start = ""
@@ -91,19 +92,10 @@ class CompletionItem(Frame):
     def clear_mark(self):
         self.text.tag_remove("term", 1.0, tk.END)
 
-    def mark_term(self, display_text: str, term: str):
+    def mark_term(self, positions: list[int]):
         self.clear_mark()
-
-        # Prioritize case sensitive match
-        start_pos = display_text.find(term)
-        if start_pos == -1:
-            # Case insensitive match
-            start_pos = display_text.lower().find(term)
-            if start_pos == -1:
-                return
-        
-        end_pos = start_pos + len(term)
-        self.text.tag_add("term", f"1.{start_pos}", f"1.{end_pos}")
+        for pos in positions:
+            self.text.tag_add("term", f"1.{pos}")
 
     def on_click(self, *_):
         self.master.choose(this=self)
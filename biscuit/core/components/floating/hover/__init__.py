@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import tkinter as tk
 import typing
+from collections import OrderedDict
 
 from biscuit.core.utils import Toplevel
 
-from .renderer import Renderer
+from .renderer import Renderer, stylesheet
 
 if typing.TYPE_CHECKING:
     from biscuit import App
@@ -14,6 +15,16 @@ if typing.TYPE_CHECKING:
 
 
 class Hover(Toplevel):
+    """Popup showing the hover of the symbol under the mouse
+
+    Rendered docs are kept in a few renderers, least recently shown one replaced
+    first, so hovering back to a symbol shows its docs without laying them out again.
+    Hiding is delayed so the pointer can move from the text onto the popup.
+    """
+
+    cache_size = 8
+    hide_delay = 300    # ms
+
     def __init__(self, master: App, bd: int=1, *args, **kw) -> None:
         super().__init__(master, *args, **kw)
         self.overrideredirect(True)
@@ -24,10 +35,13 @@ class Hover(Toplevel):
                               anchor=tk.W, justify=tk.LEFT, **self.base.theme.editors.hover.text)
         self.label.pack(fill=tk.BOTH, expand=True)
 
-        self.renderer = Renderer(self)
-        self.renderer.pack(fill=tk.BOTH, expand=True)
+        # the stylesheet only depends on the theme, formatted once for all renderers
+        self.css = stylesheet(self.base)
+        self.renderers: OrderedDict[str, Renderer] = OrderedDict()
+        self.renderer: Renderer = None
 
         self.hovered = False
+        self.hide_after = None
         self.withdraw()
 
         self.bind("<Enter>", lambda _: self.set_hovered(True))
@@ -36,6 +50,10 @@ class Hover(Toplevel):
 
     def set_hovered(self, flag: bool) -> None:
         self.hovered = flag
+        if flag:
+            self.cancel_hide()
+        else:
+            self.hide_later()
 
     def update_position(self, pos: str, tab: Text):
         tab.update_idletasks()
@@ -50,20 +68,33 @@ class Hover(Toplevel):
         bbx_x, bbx_y, _, _ = bbox
         self.geometry("+{}+{}".format(pos_x + bbx_x - 1, pos_y + bbx_y - self.winfo_height()))
 
+    def get_renderer(self, docs: str) -> Renderer:
+        if renderer := self.renderers.get(docs):
+            self.renderers.move_to_end(docs)
+            return renderer
+
+        renderer = Renderer(self)
+        renderer.render_markdown(docs)
+        self.renderers[docs] = renderer
+        if len(self.renderers) > self.cache_size:
+            self.renderers.popitem(last=False)[1].destroy()
+        return renderer
+
     def show(self, tab: Text, response: HoverResponse) -> None:
+        self.cancel_hide()
+        if self.renderer:
+            self.renderer.pack_forget()
+            self.renderer = None
+
         if response.text:
-            if response.docs:
-                self.renderer.pack_forget()
             self.label.config(text=response.text[1])
             self.label.pack(fill=tk.BOTH, expand=True)
         else:
             self.label.pack_forget()
 
         if response.docs:
-            self.renderer.render_markdown(response.docs)
+            self.renderer = self.get_renderer(response.docs)
             self.renderer.pack(fill=tk.BOTH, pady=(1, 0) if response.text else 0)
-        else:
-            self.renderer.pack_forget()
 
         self.update()
         self.deiconify()
@@ -73,8 +104,21 @@ class Hover(Toplevel):
             pass
 
     def hide(self, *_) -> None:
+        self.cancel_hide()
         self.withdraw()
 
+    def hide_later(self) -> None:
+        "Hides after a short delay, unless the pointer gets on the popup meanwhile"
+
+        self.cancel_hide()
+        self.hide_after = self.after(self.hide_delay, self.hide_if_not_hovered)
+
+    def cancel_hide(self) -> None:
+        if self.hide_after:
+            self.after_cancel(self.hide_after)
+            self.hide_after = None
+
     def hide_if_not_hovered(self) -> None:
+        self.hide_after = None
         if not self.hovered:
             self.hide()
@@ -5,7 +5,7 @@ import typing
 
 from biscuit.core.utils import Frame, Toplevel
 
-from .actionset import ActionSet
+from .actionset import ActionSet, item_key
 from .item import PaletteItem
 from .searchbar import Searchbar
 
@@ -37,14 +37,18 @@ class Palette(Toplevel):
         self.container.grid_columnconfigure(0, weight=1)
         self.container.grid_rowconfigure(0, weight=1)
 
-        self.row = 1
         self.selected = 0
+        self.max_items = 10
 
         self.shown_items = []
+        self.highlighted: PaletteItem = None
 
         self.actionsets = []
+        self.prefixes: dict[str, typing.Callable[[], ActionSet]] = None
         self.active_set = None
+        self.file_search = None
         self.add_search_bar()
+        self.add_item_pool()
 
         self.configure_bindings()
 
@@ -55,6 +59,30 @@ class Palette(Toplevel):
             actionset (ActionSet): lambda returning the actionset instead of the actionset itself
         """
         self.actionsets.append(actionset)
+        self.prefixes = None
+
+    def build_prefixes(self) -> None:
+        """Maps each actionset prefix to its factory, so that searching doesn't
+        have to call every factory on each keystroke. Prefixes are tried in the order
+        their actionsets were registered, the first one registered wins a prefix."""
+
+        prefixes = {}
+        for factory in self.actionsets:
+            prefix = factory().prefix
+            if prefix and prefix not in prefixes:
+                prefixes[prefix] = factory
+
+        self.prefixes = prefixes
+
+    def find_actionset(self, term: str) -> ActionSet | None:
+        """Returns the actionset whose prefix the term starts with, if any"""
+
+        if self.prefixes is None:
+            self.build_prefixes()
+
+        for prefix, factory in self.prefixes.items():
+            if term.startswith(prefix):
+                return factory()
 
     def generate_help_actionset(self) -> None:
         self.help_actionset = ActionSet("Help", "?")
@@ -67,39 +95,77 @@ class Palette(Toplevel):
         self.register_actionset(lambda: self.help_actionset)
 
     def add_item(self, text: str, command, *args, **kwargs) -> PaletteItem:
-        new_item = PaletteItem(self, text, command, *args, **kwargs)
-        new_item.grid(row=self.row, sticky=tk.EW, in_=self.container)
+        """Fills the next free row of the pool with the item"""
 
-        self.shown_items.append(new_item)
+        item = self.items[len(self.shown_items)]
+        item.set_data(text, command, *args, **kwargs)
+        item.grid()
 
-        self.row += 1
-        self.refresh_selected()
-        return new_item
+        self.shown_items.append(item)
+        return item
 
     def add_search_bar(self) -> None:
         self.searchbar = Searchbar(self)
         self.searchbar.grid(row=0, sticky=tk.EW, pady=(1, 7), padx=1, in_=self.container)
 
+    def add_item_pool(self) -> None:
+        """Result rows are created once and reused, typing only updates their content"""
+
+        self.items: list[PaletteItem] = []
+        for row in range(1, self.max_items + 1):
+            item = PaletteItem(self)
+            item.grid(row=row, sticky=tk.EW, in_=self.container)
+            item.grid_remove()
+            self.items.append(item)
+
     def configure_bindings(self) -> None:
         self.bind("<FocusOut>", self.hide)
         self.bind("<Escape>", self.hide)
 
-        self.row += 1
-        self.refresh_selected()
-
     def pick_actionset(self, actionset) -> None:
+        if actionset is not self.active_set and actionset.loader:
+            actionset.loader()
         self.active_set = actionset
 
-    def pick_file_search(self, term: str) -> None:
-        self.active_set = self.base.explorer.get_actionset(term)
+    def refresh(self, actionset: ActionSet) -> None:
+        """Filters again if the actionset is being shown, eg. after it loaded its items"""
+
+        if self.active_set is actionset and self.winfo_viewable():
+            self.searchbar.filter()
+
+    def pick_file_search(self, term: str="") -> None:
+        if not term and self.file_search is None:
+            # nothing typed yet, recent files are known without walking the workspace
+            self.active_set = self.base.explorer.get_recent_actionset()
+            return
+
+        # files are listed once per palette session, fuzzy filtering narrows them down
+        if self.file_search is None:
+            self.file_search = self.base.explorer.get_actionset()
+        self.active_set = self.file_search
 
     def choose(self, *_) -> None:
-        if item := self.shown_items[self.selected]:
-            picked_command = item.command
-            term = self.searchbar.term
+        if not self.shown_items:
+            return
+
+        self.pick(self.shown_items[self.selected])
+
+    def pick(self, item: PaletteItem) -> None:
+        """Runs the item, recording it for frecency ranking unless it is pinned"""
+
+        # hiding resets the palette, which refills the row
+        command, row = item.command, item.row
+        term = self.searchbar.term
+        picker = self.active_set.picker if self.active_set is not None and not item.pinned else None
+
+        if not item.pinned and self.active_set is not None:
+            self.base.history.register_palette_selection(self.active_set.prefix, item_key(row))
 
-            self.hide()
-            picked_command(term)
+        self.hide()
+        if picker:
+            picker(row)
+        else:
+            command(term)
 
     def get_items(self) -> ActionSet:
         return self.active_set
@@ -107,27 +173,32 @@ class Palette(Toplevel):
     def hide(self, *args) -> None:
         self.withdraw()
         self.reset()
+        self.file_search = None
+        self.active_set = None
 
     def hide_all_items(self) -> None:
-        for i in self.shown_items:
-            i.destroy()
+        self.clear_items()
+        for i in self.items:
+            i.grid_remove()
 
+    def clear_items(self) -> None:
         self.shown_items = []
-        self.row = 1
 
     def reset_selection(self) -> None:
         self.selected = 0
         self.refresh_selected()
 
     def refresh_selected(self) -> None:
+        if self.highlighted:
+            self.highlighted.deselect()
+            self.highlighted = None
+
         if not self.shown_items:
             return
 
-        for i in self.shown_items:
-            i.deselect()
-
         try:
-            self.shown_items[self.selected].select()
+            self.highlighted = self.shown_items[self.selected]
+            self.highlighted.select()
         except IndexError as e:
             self.base.logger.error(f"Command '{self.selected}' doesnt exist: {e}")
 
@@ -140,28 +211,34 @@ class Palette(Toplevel):
         return "break"
 
     def show_no_results(self) -> None:
-        self.hide_all_items()
-        self.reset_selection()
-        self.add_item("No results found", lambda _:...)
+        self.show_items([("No results found", lambda _:...)], [[]], pinned=1)
 
     def select(self, delta: int) -> None:
         self.selected += delta
         self.selected = min(max(0, self.selected), len(self.shown_items) - 1)
         self.refresh_selected()
 
-    def show_items(self, items: list[PaletteItem]) -> None:
-        self.hide_all_items()
+    def show_items(self, items: list[tuple], positions: list[list[int]], pinned: int=0) -> None:
+        """Shows the items, highlighting the matched positions of each.
+        The first `pinned` items are pinned actions rather than items of the actionset."""
+
+        self.clear_items()
+
+        for index, (i, matched) in enumerate(zip(items[:self.max_items], positions)):
+            item = self.add_item(*i[:3])
+            item.row = i
+            item.mark_term(matched)
+            item.pinned = index < pinned
 
-        for i in items[:10]:
-            item = self.add_item(*i)
-            item.mark_term(self.searchbar.term)
+        # rows that aren't needed this time are only hidden, not destroyed
+        for i in self.items[len(self.shown_items):]:
+            i.grid_remove()
 
         self.reset_selection()
 
     def show(self, prefix: str=None, default: str=None) -> None:
         """Shows the palette with the passed prefix"""
         self.update_idletasks()
-        self.update()
 
         x = self.master.winfo_rootx() + int((self.master.winfo_width() - self.winfo_width())/2)
         y = self.master.winfo_rooty() + self.base.menubar.searchbar.winfo_y()
@@ -1,9 +1,18 @@
 from typing import Callable, List, Tuple
 
 
+def item_key(item: tuple) -> str:
+    """Identifies an item across palette sessions, for ranking: its text, or the data
+    of plain data rows (eg. the path of a file, as file names are far from unique)"""
+    if len(item) > 3:
+        return "\0".join(map(str, item[3:]))
+    return item[0]
+
+
 class ActionSet(list):
     def __init__(self, description: str, prefix: str, items: List[Tuple[str, Callable]] = [], 
-                    pinned: List[Tuple[str, Callable]] = [], *args, **kwargs) -> None:
+                    pinned: List[Tuple[str, Callable]] = [], loader: Callable = None, picker: Callable = None,
+                    *args, **kwargs) -> None:
         """Palette Actionset
         A list of items that can be searched through.
 
@@ -17,12 +26,20 @@ class ActionSet(list):
             The items in the actionset.
         pinned : List[Tuple[str, Callable]]
             The pinned items in the actionset.
+        loader : Callable
+            Called whenever the actionset is picked in the palette, for actionsets
+            that fill their items lazily (call `Palette.refresh` once they're in).
+        picker : Callable
+            Called with the picked item in place of its command, for actionsets of
+            many items that keep plain data rows (text, None, description, ...).
         """
         super().__init__(items, *args, **kwargs)
         self.description: str = description
         self.prefix: str = prefix
 
         self.pinned: List[Tuple[str, Callable]] = pinned # [[command, callback], ...]
+        self.loader = loader
+        self.picker = picker
     
     def __repr__(self) -> str:
         return self.description
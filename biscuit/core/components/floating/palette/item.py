@@ -9,11 +9,8 @@ if typing.TYPE_CHECKING:
     from . import Palette
 
 class PaletteItem(Text):
-    def __init__(self, master: Palette, text: str, command: str, description="", *args, **kwargs) -> None:
+    def __init__(self, master: Palette, text: str="", command: str=None, description="", *args, **kwargs) -> None:
         super().__init__(master, *args, **kwargs)
-        self.text = text
-        self.description = description
-        self.command  = command
 
         self.bg, self.fg, self.hbg, self.hfg = self.base.theme.palette.item.values()
         self.config(font=self.base.settings.uifont, fg=self.fg, bg=self.bg, cursor="hand2",
@@ -22,9 +19,7 @@ class PaletteItem(Text):
         self.tag_config("term", foreground=self.base.theme.biscuit)
         self.tag_config("description", foreground=self.base.theme.primary_foreground)
 
-        self.insert(tk.END, text)
-        self.insert(tk.END, f" {description}", "description")
-        self.config(state=tk.DISABLED)
+        self.set_data(text, command, description)
 
         self.bind("<Button-1>", self.on_click)
         self.bind("<Enter>", self.on_hover)
@@ -32,12 +27,25 @@ class PaletteItem(Text):
 
         self.selected = False
         self.hovered = False
+        self.pinned = False
+        # the actionset item shown
+        self.row: tuple = None
 
-    def on_click(self, *args) -> None:
-        term = self.master.searchbar.term
+    def set_data(self, text: str, command: str, description="") -> None:
+        """Updates the row in place with a new result"""
 
-        self.master.hide()
-        self.command(term)
+        self.text = text
+        self.description = description
+        self.command = command
+
+        self.config(state=tk.NORMAL)
+        self.delete(1.0, tk.END)
+        self.insert(tk.END, text)
+        self.insert(tk.END, f" {description}", "description")
+        self.config(state=tk.DISABLED)
+
+    def on_click(self, *args) -> None:
+        self.master.pick(self)
 
     def toggle_selection(self) -> None:
         if self.selected:
@@ -45,11 +53,12 @@ class PaletteItem(Text):
         else:
             self.deselect()
 
-    def mark_term(self, term: str) -> None:
-        start_pos = self.text.lower().find(term.lower())
-        end_pos = start_pos + len(term)
+    def mark_term(self, positions: list[int]) -> None:
+        """Highlights the characters at the matched positions"""
+
         self.tag_remove("term", 1.0, tk.END)
-        self.tag_add("term", f"1.{start_pos}", f"1.{end_pos}")
+        for pos in positions or ():
+            self.tag_add("term", f"1.{pos}")
 
     def on_hover(self, *args) -> None:
         if not self.selected:
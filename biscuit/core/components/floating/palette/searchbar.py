@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import tkinter as tk
 import typing
-from itertools import chain
 
-from biscuit.core.utils import Frame
+from biscuit.core.utils import Frame, fuzzy_filter
+
+from .actionset import item_key
 
 if typing.TYPE_CHECKING:
     from . import Palette
@@ -53,41 +54,37 @@ class Searchbar(Frame):
         self.search_bar.icursor(tk.END)
 
     def get_search_term(self) -> str:
-        return self.search_bar.get().lower()
+        # as typed, matching ignores case but rewards matching it
+        return self.search_bar.get()
 
     def filter(self, *args) -> None:
         term = self.get_search_term()
 
-        prefix_found = False
-        for actionset in self.master.actionsets:
-            actionset = actionset()
-            if term.startswith(actionset.prefix):
-                self.master.pick_actionset(actionset)
-                term = term[len(actionset.prefix):].strip()
-
-                prefix_found = True
-                break
+        if actionset := self.master.find_actionset(term.lower()):
+            self.master.pick_actionset(actionset)
+            term = term[len(actionset.prefix):].strip()
+        else:
+            self.master.pick_file_search(term)
 
         self.term = term
-        if not prefix_found:
-            self.master.pick_file_search(term)
 
-        exact, starts, includes = [], [], []
-        temp = term.lower()
-        for i in self.master.active_set:
-            if not i or not i[0]:
-                continue
-            
-            item = i[0].lower()
-            if item == temp:
-                exact.append(i)
-            elif item.startswith(temp):
-                starts.append(i)
-            elif temp in item:
-                includes.append(i)
-
-        new = list(chain(actionset.get_pinned(term), exact, starts, includes))
-        if any(new):
-            self.master.show_items(new)
+        # equally good matches (and everything, for an empty query) are ordered by frecency
+        frecency = self.base.history.get_frecency(self.master.active_set.prefix)
+        pinned = self.master.active_set.get_pinned(term)
+        matches = fuzzy_filter(term, self.master.active_set, key=lambda i: i and i[0],
+                               limit=self.master.max_items, tiebreak=lambda i: frecency.get(item_key(i), 0))
+
+        items = pinned + [i.item for i in matches]
+        positions = [self.pinned_positions(i[0], term) for i in pinned] + [i.positions for i in matches]
+
+        if items:
+            self.master.show_items(items, positions, pinned=len(pinned))
         else:
             self.master.show_no_results()
+
+    def pinned_positions(self, text: str, term: str) -> list[int]:
+        "Pinned items have the term formatted into them, highlight it as is."
+        start = text.lower().rfind(term.lower()) if term else -1
+        if start == -1:
+            return []
+        return list(range(start, start + len(term)))
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import os
+import queue
 import re
+import threading
+import time
 import typing
 from tkinter import messagebox
 
@@ -11,7 +14,10 @@ git_available = True
 try:
     import git
 
+    from .history import CommitHistory
+    from .jobs import GitJobRunner
     from .repo import GitRepo
+    from .status import GitStatus, run_git
 except ImportError:
     messagebox.showerror("Git not found", "Git is not installed on your PC. Install and add Git to the PATH to use Biscuit")
     git_available = False
@@ -27,12 +33,21 @@ class Git(git.Git):
         super().__init__(*args, **kwargs)
         self.base = master
         self.repo = None
-        self.branches =  {}
+        self.branches = []
+        self.status = GitStatus(self)
+        self.jobs = GitJobRunner(self)
+        self.history = CommitHistory(self)
+
+        # branches are only listed when the actionset is first shown after a change
+        self.branches_stale = True
+        self.loading_branches = False
+        self.branch_results = queue.Queue()
 
         self.actionset = ActionSet(
             "Manage git branches", "branch:",
             self.branches,
             pinned=[["Create new branch: {}", lambda branch=None: self.repo.create_branch(branch)]],
+            loader=self.load_branches,
         )
     
     def late_setup(self) -> None:
@@ -45,21 +60,66 @@ class Git(git.Git):
 
         try:
             self.repo = GitRepo(self, self.base.active_directory)
+            self.status.reset()
             self.base.git_found = True
             self.update_repo_info()
         except git.exc.InvalidGitRepositoryError:
             self.base.git_found = False
 
     def update_repo_info(self) -> None:
-        self.branches = {}
+        """Marks the branches as changed, they are listed again the next time
+        the branch actionset is shown (right away if it is being shown)."""
+
+        self.branches_stale = True
+        if self.base.palette.active_set is self.actionset:
+            self.load_branches()
+
+    def load_branches(self) -> None:
+        """Lists the branches by latest commit with a single `git for-each-ref`
+        on a worker thread, the actionset is filled once it's done."""
+
+        if not self.repo or self.loading_branches or not self.branches_stale:
+            return
+
+        self.branches_stale = False
+        self.loading_branches = True
+        threading.Thread(target=self.read_branches, args=(self.repo.working_tree_dir,), daemon=True).start()
+        self.base.after(10, self.poll_branches)
+
+    def read_branches(self, path: str) -> None:
+        try:
+            output = run_git(path, 'for-each-ref', '--sort=-committerdate',
+                             '--format=%(refname:short)%00%(committerdate:unix)', 'refs/heads')
+            branches = []
+            for line in output.decode('utf-8', 'replace').splitlines():
+                name, _, timestamp = line.partition('\0')
+                branches.append((name, int(timestamp or 0)))
+            self.branch_results.put((path, branches))
+        except Exception as e:
+            self.branch_results.put((path, e))
+
+    def poll_branches(self) -> None:
+        try:
+            path, branches = self.branch_results.get_nowait()
+        except queue.Empty:
+            self.base.after(10, self.poll_branches)
+            return
+
+        self.loading_branches = False
+        if isinstance(branches, Exception):
+            self.branches_stale = True
+            self.base.logger.error(f"Listing git branches failed: {branches}")
+            return
 
-        for branch in self.repo.branches:
-            latest_commit = next(self.repo.iter_commits(branch))            
-            self.branches[branch] = latest_commit.committed_datetime
-        self.branches = sorted(self.branches.items(), key=lambda x: x[1], reverse=True)
+        if not self.repo or path != self.repo.working_tree_dir:
+            return
 
-        # TODO: make use of the commit_time in palette items
-        self.actionset.update([(str(branch), lambda e=None, b=branch: self.repo.switch_to_branch(b)) for branch, commit_time in self.branches])
+        self.branches = branches
+        self.actionset.update([
+            (name, lambda e=None, b=name: self.repo.switch_to_branch(b),
+             time.strftime("%d %b %Y", time.localtime(timestamp)) if timestamp else "")
+            for name, timestamp in branches])
+        self.base.palette.refresh(self.actionset)
 
     def get_version(self) -> str:
         if not git_available:
@@ -68,27 +128,72 @@ class Git(git.Git):
         return self.version()
 
     @property
-    def active_branch(self) -> str:
+    def active_branch(self) -> str | None:
+        """Name of the checked out branch, None on a detached HEAD"""
+
         if not git_available:
             return 
 
-        return self.repo.active_branch
+        # read straight from HEAD, listing the branches isn't needed for this
+        try:
+            with open(os.path.join(self.repo.git_dir, 'HEAD'), encoding='utf-8') as f:
+                head = f.read().strip()
+        except OSError:
+            return
+
+        if head.startswith('ref: '):
+            return head[5:].removeprefix('refs/heads/')
 
     def checkout(self, branch: str) -> None:
         self.repo.index.checkout(branch)
 
-    def clone(self, url: str, dir: str) -> str:    
+    def clone(self, url: str, dir: str, on_done: typing.Callable[[str], None]=None) -> None:
+        """Clones the repo into a new directory under dir in the background,
+        `on_done` is called with the path of the clone once it's done."""
+
         if not URL.match(url):
             # assumes github as repo host
             url = f'http://github.com/{url}'
 
         if name := self.repo_name(url):
-            dir = os.path.join(dir, name)
-            GitRepo(self).clone_from(url, dir)
-            return dir
+            path = os.path.join(dir, name)
+            self.jobs.run(f"Cloning {name}", dir, 'clone', '--progress', url, path,
+                          on_done=lambda: on_done and on_done(path))
+            return
 
         raise Exception(f'The url `{url}` does not point to a git repo')
 
+    def push(self, remote: str=None, branch: str=None) -> None:
+        if not self.repo:
+            return
+
+        remote = remote or 'origin'
+        branch = branch or self.active_branch
+        if not branch:
+            self.base.notifications.warning("HEAD is detached, check out a branch to push")
+            return
+
+        self.jobs.run(f"Pushing {branch}", self.repo.working_tree_dir, 'push', '--progress', remote, branch,
+                      on_done=self.update_repo_info)
+
+    def pull(self) -> None:
+        if not self.repo:
+            return
+
+        self.jobs.run("Pulling", self.repo.working_tree_dir, 'pull', '--progress', on_done=self.on_pulled)
+
+    def fetch(self) -> None:
+        if not self.repo:
+            return
+
+        self.jobs.run("Fetching", self.repo.working_tree_dir, 'fetch', '--progress', '--all', '--prune',
+                      on_done=self.update_repo_info)
+
+    def on_pulled(self) -> None:
+        self.update_repo_info()
+        self.base.update_git()
+        self.base.explorer.directory.refresh_root()
+
     def repo_name(self, url: str) -> None:
         match = re.search(r'/([^/]+?)(\.git)?$', url)
         if match:
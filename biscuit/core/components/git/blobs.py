@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+import typing
+from collections import OrderedDict
+
+from .status import run_git
+
+if typing.TYPE_CHECKING:
+    from .repo import GitRepo
+
+
+class BlobCache:
+    """Contents of files at HEAD, keyed by blob SHA.
+
+    Files that didn't change between commits keep their SHA, so switching branches or
+    committing doesn't throw away content that is still valid. The path to SHA lookups
+    are kept until HEAD, the branch it points to or the index is written to. The least
+    recently used blobs are dropped past `size`.
+
+    git is run as a subprocess instead of going through the repo's object database,
+    so blobs can be read from worker threads.
+    """
+
+    def __init__(self, repo: GitRepo, size: int=64) -> None:
+        self.repo = repo
+        self.size = size
+
+        self.lock = threading.Lock()
+        self.blobs: OrderedDict[str, str] = OrderedDict()
+        # path -> blob SHA at HEAD, None for paths not in HEAD, valid while `stamp` holds
+        self.shas: dict[str, str | None] = {}
+        self.stamp = None
+
+    def head_stamp(self) -> tuple:
+        """Modification times of the files that change when HEAD moves or the index
+        is written, stat calls are much cheaper than asking git"""
+
+        git_dir = self.repo.git_dir
+        common_dir = getattr(self.repo, 'common_dir', git_dir)
+        files = [os.path.join(git_dir, 'HEAD'), os.path.join(git_dir, 'index'), os.path.join(common_dir, 'packed-refs')]
+        try:
+            with open(files[0], encoding='utf-8') as f:
+                head = f.read().strip()
+            if head.startswith('ref: '):
+                files.append(os.path.join(common_dir, head[5:]))
+        except OSError:
+            pass
+
+        stamp = []
+        for file in files:
+            try:
+                stat = os.stat(file)
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def sha(self, path: str) -> str | None:
+        stamp = self.head_stamp()
+        with self.lock:
+            if stamp != self.stamp:
+                self.shas.clear()
+                self.stamp = stamp
+            if path in self.shas:
+                return self.shas[path]
+
+        try:
+            sha = run_git(self.repo.working_tree_dir, 'rev-parse', '--verify', '--quiet', f'HEAD:{path}').decode().strip()
+        except subprocess.CalledProcessError:
+            sha = None
+
+        with self.lock:
+            if stamp == self.stamp:
+                self.shas[path] = sha
+        return sha
+
+    def get(self, path: str) -> str:
+        """Returns the content of the file (path relative to the repo) at HEAD,
+        raises KeyError if the file isn't in HEAD."""
+
+        if not (sha := self.sha(path)):
+            raise KeyError(path)
+
+        with self.lock:
+            if sha in self.blobs:
+                self.blobs.move_to_end(sha)
+                return self.blobs[sha]
+
+        content = run_git(self.repo.working_tree_dir, 'cat-file', 'blob', sha).decode('utf-8')
+        with self.lock:
+            self.blobs[sha] = content
+            if len(self.blobs) > self.size:
+                self.blobs.popitem(last=False)
+        return content
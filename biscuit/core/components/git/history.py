@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import queue
+import subprocess
+import threading
+import typing
+
+from .status import run_git
+
+if typing.TYPE_CHECKING:
+    from . import Git
+
+LOG_FORMAT = '--format=%x1e%H%x00%h%x00%an%x00%at%x00%s'
+
+
+class Commit(typing.NamedTuple):
+    sha: str
+    short: str
+    author: str
+    time: int
+    subject: str
+
+
+def parse_commit(record: bytes) -> Commit:
+    sha, short, author, timestamp, subject = record.decode('utf-8', 'replace').strip().split('\0', 4)
+    return Commit(sha, short, author, int(timestamp or 0), subject)
+
+
+def parse_numstat(data: bytes) -> list[tuple[str, str, str]]:
+    """Parses `--numstat` output into (path, added, deleted), '-' for binary files"""
+
+    stats = []
+    for line in data.decode('utf-8', 'replace').splitlines():
+        added, deleted, path = line.split('\t', 2)
+        stats.append((path, added, deleted))
+    return stats
+
+
+class CommitHistory:
+    """Reads the commit log of the repo (or of a single file) a page at a time.
+
+    Each page is a `git log --skip --max-count` of its own on a worker thread, so any
+    part of a log of any length can be read without holding on to the rest of it.
+    Diff stats of single commits are read on demand. Results come through `results`,
+    tagged with the generation of the log they belong to, starting a new log drops
+    results still coming for the previous one.
+    """
+
+    page_size = 200
+
+    def __init__(self, master: Git) -> None:
+        self.master = master
+        self.base = master.base
+
+        self.results = queue.Queue()
+        self.generation = 0
+
+    def start(self) -> int:
+        self.generation += 1
+        return self.generation
+
+    def request_page(self, path: str, skip: int, file: str=None) -> None:
+        threading.Thread(target=self.read_page, args=(self.generation, path, skip, file), daemon=True).start()
+
+    def read_page(self, generation: int, path: str, skip: int, file: str=None) -> None:
+        args = ['log', LOG_FORMAT, f'--skip={skip}', f'--max-count={self.page_size}']
+        if file:
+            args += ['--follow', '--', file]
+
+        try:
+            output = run_git(path, *args)
+        except subprocess.CalledProcessError:
+            # eg. a repo without any commits yet
+            output = b''
+        except OSError as e:
+            return self.results.put(('error', generation, e))
+
+        commits = [parse_commit(record) for record in output.split(b'\x1e') if record.strip()]
+        self.results.put(('page', generation, (skip, commits)))
+
+    def request_stats(self, path: str, sha: str) -> None:
+        threading.Thread(target=self.read_stats, args=(self.generation, path, sha), daemon=True).start()
+
+    def read_stats(self, generation: int, path: str, sha: str) -> None:
+        try:
+            output = run_git(path, 'diff-tree', '--no-commit-id', '--numstat', '-r', '--root', '-m', '--first-parent', sha)
+            self.results.put(('stats', generation, (sha, parse_numstat(output))))
+        except (OSError, subprocess.CalledProcessError, ValueError):
+            self.results.put(('stats', generation, (sha, None)))
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import os
+import queue
+import re
+import subprocess
+import threading
+import typing
+from collections import deque
+
+if typing.TYPE_CHECKING:
+    from . import Git
+
+# eg. "Receiving objects:  45% (450/1000), 1.2 MiB | 600 KiB/s"
+PROGRESS = re.compile(r'^(?:remote: )?([\w ]+):\s+(\d+)%')
+
+
+class GitJob:
+    def __init__(self, title: str, path: str, args: list[str], on_done: typing.Callable[[], None]=None) -> None:
+        self.title = title
+        self.path = path
+        self.args = args
+        self.on_done = on_done
+
+        self.process: subprocess.Popen = None
+        self.cancelled = False
+        self.output: deque[str] = deque(maxlen=20)
+
+
+class GitJobRunner:
+    """Runs git network operations (clone, push, pull, fetch) one at a time on a worker.
+
+    Progress reported by git is forwarded to the statusbar process indicator, which
+    cancels the running job when clicked. Workers only ever talk to the UI through
+    the `events` queue, completion callbacks run on the UI thread.
+    """
+
+    def __init__(self, master: Git) -> None:
+        self.master = master
+        self.base = master.base
+
+        self.jobs: deque[GitJob] = deque()
+        self.current: GitJob = None
+        self.events = queue.Queue()
+
+    def run(self, title: str, path: str, *args: str, on_done: typing.Callable[[], None]=None) -> None:
+        """Queues `git <args>` to run in path, `on_done` is called on the UI thread if it succeeds"""
+
+        self.jobs.append(GitJob(title, path, list(args), on_done))
+        if not self.current:
+            self.next()
+
+    def next(self) -> None:
+        if not self.jobs:
+            self.current = None
+            return
+
+        job = self.current = self.jobs.popleft()
+        self.base.statusbar.start_process('git', job.title, f"git {job.args[0]}", cancel=self.cancel)
+        threading.Thread(target=self.work, args=(job,), daemon=True).start()
+        self.base.after(50, self.poll)
+
+    def cancel(self, *_) -> None:
+        if job := self.current:
+            job.cancelled = True
+            if job.process:
+                job.process.terminate()
+
+    def work(self, job: GitJob) -> None:
+        # never wait on a credentials prompt nobody can answer
+        env = dict(os.environ, GIT_TERMINAL_PROMPT='0')
+        try:
+            job.process = subprocess.Popen(
+                ['git', *job.args], cwd=job.path, env=env,
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
+            if job.cancelled:
+                job.process.terminate()
+
+            # progress lines are terminated by \r, read them as they come
+            line = b''
+            while chunk := job.process.stderr.read1(4096):
+                *lines, line = re.split(rb'[\r\n]', line + chunk)
+                for text in lines:
+                    self.report(job, text.decode('utf-8', 'replace').strip())
+            self.report(job, line.decode('utf-8', 'replace').strip())
+
+            self.events.put((job, 'done', job.process.wait()))
+        except OSError as e:
+            self.events.put((job, 'done', e))
+
+    def report(self, job: GitJob, text: str) -> None:
+        if not text:
+            return
+
+        job.output.append(text)
+        if match := PROGRESS.match(text):
+            self.events.put((job, 'progress', f"{job.title} {match.group(1).strip().lower()} {match.group(2)}%"))
+
+    def poll(self) -> None:
+        progress = None
+        while True:
+            try:
+                job, kind, value = self.events.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'progress':
+                # only the latest progress of this tick is shown
+                progress = value
+                continue
+
+            self.base.statusbar.end_process('git')
+            self.finish(job, value)
+            self.next()
+            return
+
+        if progress:
+            self.base.statusbar.update_process('git', progress)
+        self.base.after(50, self.poll)
+
+    def finish(self, job: GitJob, result: int | Exception) -> None:
+        if job.cancelled:
+            self.base.notifications.info(f"{job.title} cancelled")
+        elif isinstance(result, Exception) or result != 0:
+            output = '\n'.join(job.output) if job.output else result
+            self.base.logger.error(f"git {' '.join(job.args)} failed: {output}")
+            self.base.notifications.error(f"{job.title} failed: {job.output[-1] if job.output else result}")
+        elif job.on_done:
+            job.on_done()
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import os
 import typing
 
 import git
 
+from .blobs import BlobCache
+
 if typing.TYPE_CHECKING:
     from . import Git
 
@@ -22,6 +25,7 @@ class GitRepo(git.Repo):
         self.author_name = self.config.get_value("user", "name")
         self.author_email = self.config.get_value("user", "email")
         self.author = git.Actor(self.author_name, self.author_email)
+        self.blobs = BlobCache(self)
 
     def switch_to_branch(self, branch: git.Head):
         self.git.checkout(str(branch))
@@ -37,32 +41,19 @@ class GitRepo(git.Repo):
         self.create_head(branch.strip())
         self.switch_to_branch(branch)
     
-    def get_untracked_files(self) -> list:
-        return list(self.untracked_files)
-
-    def get_added_files(self) -> list:
-        return [item.a_path for item in self.index.diff(None).iter_change_type('A')]
-
-    def get_deleted_files(self) -> list:
-        return [item.a_path for item in self.index.diff(None).iter_change_type('D')]
-
-    def get_modified_files(self) -> list:
-        return [item.a_path for item in self.index.diff(None).iter_change_type('M')]
-
-    def get_staged_added_files(self) -> list:
-        return [item.a_path for item in self.index.diff("HEAD").iter_change_type('D')]
-
-    def get_staged_deleted_files(self) -> list:
-        return [item.a_path for item in self.index.diff("HEAD").iter_change_type('A')]
-
-    def get_staged_modified_files(self) -> list:
-        return [item.a_path for item in self.index.diff("HEAD").iter_change_type('M')]
-
     def get_latest_commit(self):
         return self.head.commit
 
     def get_commit_filedata(self, filename) -> str:
-        return self.head.commit.tree[filename].data_stream.read().decode('utf-8')
+        return self.blobs.get(filename)
+
+    def relpath(self, path) -> str | None:
+        """Path relative to the repo as git spells it, None if it's outside the repo"""
+
+        path = os.path.relpath(os.path.abspath(path), self.working_tree_dir)
+        if path.startswith('..'):
+            return
+        return path.replace(os.sep, '/')
 
     def stage_files(self, *paths) -> None:
         for path, change_type in paths:
@@ -76,8 +67,17 @@ class GitRepo(git.Repo):
     def unstage_files(self, *paths) -> None:
         self.index.reset(paths=paths)
 
-    def discard_changes(self, *path) -> None:
-        self.git.checkout("--", *path)
+    def discard_changes(self, *paths) -> None:
+        self.do(self.checkout_paths, paths)
+
+    def checkout_paths(self, paths, batch=100) -> None:
+        # in batches, so any number of paths fits on the command line
+        for i in range(0, len(paths), batch):
+            self.git.checkout("--", *paths[i:i + batch])
+
+    def delete_untracked(self, *paths) -> None:
+        for path in paths:
+            self.do(os.remove, os.path.join(self.working_tree_dir, path))
 
     def commit_files(self, message=None, **kwargs):
         if not message:
@@ -85,12 +85,9 @@ class GitRepo(git.Repo):
 
         return self.index.commit(message, author=self.author, **kwargs)
 
-    def push_files(self, remote=None, branch=None, **kwargs):
-        if not remote:
-            remote = "origin"
-        if not branch:
-            branch = self.active_branch.name
-        return self.do(self.remotes[remote].push, branch, **kwargs)
+    def push_files(self, remote=None, branch=None):
+        # runs in the background, see `GitJobRunner`
+        self.master.push(remote, branch)
 
     def do(self, fn, *args, **kwargs):
         try:
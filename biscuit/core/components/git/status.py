@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import os
+import queue
+import subprocess
+import threading
+import typing
+
+if typing.TYPE_CHECKING:
+    from . import Git
+
+# change kinds used by source control
+# 0 - deleted, 1 - added, 2 - modified, 3 - untracked
+KINDS = {'D': 0, 'A': 1, 'R': 1, 'C': 1, 'M': 2, 'T': 2}
+
+
+def run_git(path: str, *args: str) -> bytes:
+    """Runs the git command in the repository and returns its output,
+    raises CalledProcessError if it fails. Meant to be used off the UI thread."""
+
+    return subprocess.run(
+        ['git', *args], cwd=path, capture_output=True, check=True,
+        creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0).stdout
+
+
+def parse_status(data: bytes) -> tuple[dict[str, int], dict[str, int]]:
+    """Parses the output of `git status --porcelain=v2 -z`
+
+    Returns the staged and unstaged changes as {path: kind}. Conflicted files are
+    reported as modified, renamed files as the new path added and the old one deleted.
+    """
+
+    staged, unstaged = {}, {}
+    records = iter(data.decode('utf-8', 'surrogateescape').split('\0'))
+    for record in records:
+        if not record or record[0] in '#!':
+            continue
+
+        if record[0] == '?':
+            unstaged[record[2:]] = 3
+            continue
+
+        if record[0] == '1':
+            fields = record.split(' ', 8)
+        elif record[0] == '2':
+            fields = record.split(' ', 9)
+            # the original path follows as a separate record
+            original = next(records, '')
+            if fields[1][0] == 'R':
+                staged[original] = 0
+        elif record[0] == 'u':
+            unstaged[record.split(' ', 10)[-1]] = 2
+            continue
+        else:
+            continue
+
+        path, (x, y) = fields[-1], fields[1]
+        if x in KINDS:
+            staged[path] = KINDS[x]
+        if y in KINDS:
+            unstaged[path] = KINDS[y]
+
+    return staged, unstaged
+
+
+def diff_status(old: dict[str, int], new: dict[str, int]) -> tuple[dict[str, int], set[str]]:
+    """Returns the entries that were added or changed kind, and the removed paths"""
+
+    changed = {path: kind for path, kind in new.items() if old.get(path) != kind}
+    return changed, old.keys() - new.keys()
+
+
+class GitStatus:
+    """Reads the status of the repository on a worker thread.
+
+    A single `git status --porcelain=v2` replaces the separate index/tree diffs, and
+    it's skipped altogether if neither the index, HEAD nor the working tree changed
+    since the last run. The working tree can't be cheaply checked, so it has to be
+    marked dirty with `invalidate` (done on file system events). Only the entries
+    that changed since the last status are handed to source control.
+    """
+
+    def __init__(self, master: Git) -> None:
+        self.master = master
+        self.base = master.base
+
+        self.results = queue.Queue()
+        self.running = False
+        self.rerun = False
+
+        self.generation = 0
+        self.key = None
+        self.staged: dict[str, int] = {}
+        self.unstaged: dict[str, int] = {}
+
+    def reset(self) -> None:
+        """Forgets the last status, the next refresh reports every change again"""
+
+        self.generation += 1
+        self.key = None
+        self.staged, self.unstaged = {}, {}
+
+    def invalidate(self) -> None:
+        """Marks the working tree as changed"""
+
+        self.generation += 1
+
+    def refresh(self) -> None:
+        if not self.master.repo:
+            return
+
+        if self.running:
+            self.rerun = True
+            return
+
+        self.running = True
+        repo = self.master.repo
+        args = (repo.working_tree_dir, repo.git_dir, self.generation, self.key)
+        threading.Thread(target=self.run, args=args, daemon=True).start()
+        self.base.after(10, self.poll)
+
+    def run(self, path: str, git_dir: str, generation: int, last_key: tuple) -> None:
+        try:
+            key = (path, generation, *self.stat(git_dir))
+            if key == last_key:
+                return self.results.put((path, key, None))
+
+            output = run_git(path, 'status', '--porcelain=v2', '-z', '--untracked-files=all')
+            self.results.put((path, key, parse_status(output)))
+        except (OSError, subprocess.CalledProcessError) as e:
+            self.results.put((path, None, e))
+
+    def stat(self, git_dir: str) -> tuple:
+        stamps = []
+        for name in ('index', 'HEAD'):
+            try:
+                st = os.stat(os.path.join(git_dir, name))
+                stamps.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def poll(self, delay: int=10) -> None:
+        """Picks up the status once the worker is done, checking back less often the
+        longer it takes: an unchanged repository is done right away, while a status of
+        a big working tree can take seconds."""
+
+        try:
+            path, key, result = self.results.get_nowait()
+        except queue.Empty:
+            delay = min(delay * 2, 100)
+            self.base.after(delay, lambda: self.poll(delay))
+            return
+
+        self.running = False
+        if isinstance(result, Exception):
+            self.base.logger.error(f"Reading git status failed: {result}")
+        elif result and self.master.repo and path == self.master.repo.working_tree_dir:
+            self.key = key
+            staged, unstaged = result
+            staged_diff = diff_status(self.staged, staged)
+            unstaged_diff = diff_status(self.unstaged, unstaged)
+            self.staged, self.unstaged = staged, unstaged
+
+            if any(staged_diff) or any(unstaged_diff):
+                self.base.source_control.tree.update_changes(staged_diff, unstaged_diff)
+
+        if self.rerun:
+            self.rerun = False
+            self.refresh()
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import os
+import queue
 import typing
 
 import tarts as lsp
 
 from .client import LangServerClient
-from .utils import decode_position
+from .lifecycle import ServerLifecycle
+from .symbols import SymbolIndex
 
 if typing.TYPE_CHECKING:
     from biscuit.core import App
@@ -20,18 +22,56 @@ class LanguageServerManager:
         # built-in support for python-lsp-server
         self.langservers["Python"] = "pylsp"
             
-        self.existing: dict[str, LangServerClient] = {}
+        # (root_dir, language) -> instance, servers with workspace folder support
+        # are shared by all the roots of their language
+        self.existing: dict[tuple[str, str], LangServerClient] = {}
         self.latest: LangServerClient = None
 
-        self.kill_thread = None
+        self.lifecycle = ServerLifecycle(self)
+        self.symbols = SymbolIndex(self)
 
-    def _update_symbols(self, tab, resp) -> None:
-        try:
-            self.base.settings.symbols_actionset.update([(i.name, lambda _, i=i: self.base.goto_location_in_active_editor(decode_position(i.location.range.start))) for i in resp])
-            self.base.palette.update()
-        except:
-            #TODO: currently only supports lsp.SymbolInformation; implement this for lsp.DocumentSymbol
-            pass
+        # reader threads only hand their client over here, tk is touched on the UI thread
+        # alone: an after() loop drains the queue while servers are running. It polls
+        # every `min_interval` ms while messages flow and backs off to `max_interval`
+        # when the servers are quiet, until something is sent again.
+        self.ready: queue.Queue[LangServerClient] = queue.Queue()
+        self.min_interval, self.max_interval = 10, 50
+        self.interval = self.min_interval
+        self.dispatcher = None
+
+    def notify(self, instance: LangServerClient) -> None:
+        """Called from reader threads when the instance has messages waiting"""
+
+        self.ready.put(instance)
+
+    def expect(self) -> None:
+        "Polls quickly again, a response is on its way"
+
+        self.interval = self.min_interval
+        if self.dispatcher:
+            self.base.after_cancel(self.dispatcher)
+        self.dispatcher = self.base.after(self.interval, self.dispatch)
+
+    def dispatch(self) -> None:
+        """Processes incoming messages of every instance that has some waiting"""
+
+        self.dispatcher = None
+        done = set()
+        while True:
+            try:
+                instance = self.ready.get(block=False)
+            except queue.Empty:
+                break
+
+            if instance in done:
+                continue
+            done.add(instance)
+            if not instance.run():
+                self.exited(instance)
+
+        self.interval = self.min_interval if done else min(self.interval * 2, self.max_interval)
+        if self.instances():
+            self.dispatcher = self.base.after(self.interval, self.dispatch)
 
     def register_langserver(self, language, command) -> None:
         self.langservers[language] = command
@@ -44,80 +84,153 @@ class LanguageServerManager:
         return self.latest is not None
    
     def request_removal(self, tab: Text) -> None:
-        for instance in list(self.existing.values()):
+        for instance in self.instances():
             instance.close_tab(tab)
 
     def tab_closed(self, tab: Text) -> None:
-        if inst :=  self.request_client_instance(tab):
-            inst.close_tab(tab)
+        for instance in self.instances():
+            instance.close_tab(tab)
 
-    def request_completions(self, tab: Text) -> None:
-        for instance in list(self.existing.values()):
+    def instances(self) -> list[LangServerClient]:
+        return list(dict.fromkeys(self.existing.values()))
+
+    def root_of(self, tab: Text) -> str:
+        return self.base.active_directory or os.path.dirname(tab.path)
+
+    def clients_of(self, tab: Text) -> typing.Iterator[LangServerClient]:
+        """Instances the tab is opened in, marking them as used"""
+
+        for instance in self.instances():
             if tab in instance.tabs_opened:
-                instance.request_completions(tab)
+                self.lifecycle.touch(instance)
+                yield instance
+
+    def request_completions(self, tab: Text) -> None:
+        for instance in self.clients_of(tab):
+            instance.request_completions(tab)
 
     def request_goto_definition(self, tab: Text) -> None:
-        for instance in list(self.existing.values()):
-            if tab in instance.tabs_opened:
-                instance.request_go_to_definition(tab)
+        for instance in self.clients_of(tab):
+            instance.request_go_to_definition(tab)
     
     def request_references(self, tab: Text) -> None:
-        for instance in list(self.existing.values()):
-            if tab in instance.tabs_opened:
-                instance.request_references(tab)
+        for instance in self.clients_of(tab):
+            instance.request_references(tab)
 
     def request_rename(self, tab: Text, new_name: str) -> None:
-        for instance in list(self.existing.values()):
-            if tab in instance.tabs_opened:
-                instance.request_rename(tab, new_name)
+        for instance in self.clients_of(tab):
+            instance.request_rename(tab, new_name)
 
     def request_hover(self, tab: Text) -> None:
-        for instance in list(self.existing.values()):
+        for instance in self.clients_of(tab):
+            instance.request_hover(tab)
+
+    def cancel_hover(self, tab: Text) -> None:
+        for instance in self.instances():
             if tab in instance.tabs_opened:
-                instance.request_hover(tab)
+                instance.cancel_hover(tab)
 
     def request_outline(self, tab: Text) -> None:
-        for instance in list(self.existing.values()):
-            if tab in instance.tabs_opened:
-                instance.request_outline(tab)
+        for instance in self.clients_of(tab):
+            instance.request_outline(tab)
+
+    def request_workspace_symbols(self) -> None:
+        for instance in self.instances():
+            instance.request_workspace_symbols()
 
     def content_changed(self, tab: Text) -> None:
-        for instance in list(self.existing.values()):
-            if tab in instance.tabs_opened:
-                instance.send_change_events(tab)
+        for instance in self.clients_of(tab):
+            instance.send_change_events(tab)
 
     def request_client_instance(self, tab: Text) -> LangServerClient | None:
         if tab.path is None or not tab.language or tab.language not in self.langservers.keys():
             return
         
-        root_dir = self.base.active_directory or os.path.dirname(tab.path)
+        root_dir = self.root_of(tab)
 
         try:
-            return self.existing[(root_dir, tab.language)]
+            instance = self.existing[(root_dir, tab.language)]
+            self.lifecycle.touch(instance)
+            return instance
         except KeyError:
             pass
 
+        # a server already running for the language takes the root on as another workspace folder
+        for instance in self.instances():
+            if instance.language == tab.language and instance.supports_folders():
+                self.base.logger.trace(f"<<-- Adding --[{root_dir}] to <LSPC>({tab.language}) -->>")
+                instance.add_folder(root_dir)
+                self.existing[(root_dir, tab.language)] = instance
+                self.lifecycle.touch(instance)
+                return instance
 
-        self.base.statusbar.process_indicator.show()
         self.base.logger.trace(f"<<-- Requesting <LSPC>({tab.language}) instance for --[{root_dir}] -->>")
+        return self.spawn(tab, root_dir)
 
-        # TODO multithread this process
+    def spawn(self, tab: Text, root_dir: str) -> LangServerClient:
+        # the server is spawned and initialized in the background, tabs opened
+        # meanwhile are sent over once it reports Initialized
         langserver = LangServerClient(self, tab, root_dir)
-        langserver.run_loop()
+        self.base.statusbar.start_process(
+            langserver.process_key, f"{tab.language}: starting", f"{langserver.command} --[{root_dir}]")
+        langserver.flush()
         self.existing[(root_dir, tab.language)] = langserver
+        self.lifecycle.started(langserver)
 
         return langserver
 
+    def restart(self, instance: LangServerClient) -> None:
+        """Replaces the instance with a fresh server, reopening its tabs"""
+
+        tabs = list(instance.tabs_opened)
+        self.kill(instance)
+        if not tabs:
+            return
+
+        langserver = self.spawn(tabs[0], instance.root_dir)
+        for folder in instance.folders[1:]:
+            langserver.add_folder(folder)
+            self.existing[(folder, langserver.language)] = langserver
+        for tab in tabs:
+            langserver.open_tab(tab)
+
+    def folder_removed(self, instance: LangServerClient, folder: str) -> None:
+        if self.existing.get((folder, instance.language)) is instance:
+            self.existing.pop((folder, instance.language))
+
+    def forget(self, instance: LangServerClient) -> None:
+        "Drops every root the instance serves"
+
+        for key in [key for key, i in self.existing.items() if i is instance]:
+            self.existing.pop(key)
+
+    def exited(self, instance: LangServerClient) -> None:
+        """Forgets about an instance whose server process is gone"""
+
+        self.base.statusbar.end_process(instance.process_key)
+        self.lifecycle.stopped(instance)
+        self.symbols.forget_server(instance)
+        self.forget(instance)
+
+        if instance.io.error:
+            self.base.notifications.error(f"Language server for {instance.language} failed to start: {instance.io.error}")
+        else:
+            self.base.logger.trace(f"-- LSPC({instance.language}) exited --")
+
     def kill(self, instance: LangServerClient) -> None:
-        if not self.existing.get((instance.root_dir, instance.language), None):
+        if instance not in self.instances():
             return
         
-        self.base.logger.trace(f"-- Killing LSPC({instance.language}) PID: {instance.io.p.pid} --")
+        self.base.logger.trace(f"-- Killing LSPC({instance.language}) --")
         
-        self.existing.pop((instance.root_dir, instance.language))
+        self.forget(instance)
+        self.lifecycle.stopped(instance)
+        self.symbols.forget_server(instance)
+        self.base.statusbar.end_process(instance.process_key)
         if instance.client.state == lsp.ClientState.NORMAL:
             instance.client.shutdown()
+            instance.flush()
+            # in case it doesn't exit on its own
+            self.base.after(5000, instance.io.stop)
         else:
-            instance.io.p.kill()          
-
-        del instance
+            instance.io.stop()
@@ -5,16 +5,25 @@ Porcupine's LSP plugin https://github.com/Akuli/porcupine/
 
 from __future__ import annotations
 
+import dataclasses
 import itertools
+import re
 import tkinter as tk
 import typing
+from collections import OrderedDict
 from pathlib import Path
 
 import tarts as lsp
 
+from biscuit.core.utils import fuzzy_filter
+
 from .data import *
 from .handler import EventHandler
 from .io import IO
+from .protocol import Client, capabilities
+from .requests import RequestManager
+from .semantic import CAPABILITY as SEMANTIC_TOKENS
+from .semantic import apply_edits, changed_lines, decode_tokens
 from .utils import *
 
 if typing.TYPE_CHECKING:
@@ -23,7 +32,13 @@ if typing.TYPE_CHECKING:
 
     from . import LanguageServerManager
 
+CAPABILITIES = capabilities({"semanticTokens": SEMANTIC_TOKENS})
+
+
 class LangServerClient:
+    # hovers kept per client, least recently shown ones dropped first
+    hover_cache_size = 64
+
     def __init__(self, master: LanguageServerManager, tab: Text, root_dir: str) -> None:
         self.master = master
         self.base = master.base
@@ -31,83 +46,243 @@ class LangServerClient:
         self.language = tab.language
         self.command = master.langservers.get(self.language, None)
         self.root_dir = root_dir
+        # unique per instance, a restarted server's indicator outlives the old process
+        self.process_key = f"lsp:{self.language}:{self.root_dir}:{id(self)}"
         self._counter = itertools.count()
-
-        # TODO: Make this configurable
-        # when all tabs using this lsp are closed, after this delay, delete the instance
-        self.deletion_delay = 10000
         self.tabs_opened: set[Text] = set()
         self._count = 0
         
-        self.client = lsp.Client(root_uri=Path(self.root_dir).as_uri())
+        # workspace folders served, the root first, and the folder of each tab
+        self.folders: list[str] = [root_dir]
+        self.tab_folders: dict[Text, str] = {}
+        self.client = Client(root_uri=Path(self.root_dir).as_uri(), workspace_folders=[workspace_folder(root_dir)],
+                             capabilities=CAPABILITIES)
+        # server capabilities, known once initialized
+        self.capabilities: dict = {}
         self.io = IO(self, self.command, self.root_dir)
         self.io.start()
         self.handler = EventHandler(self)
 
-        # requests
-        self._autocomplete_req: dict[int, tuple[Text, CompletionRequest]] = {}
-        self._hover_requests: dict[int, tuple[Text, str]] = {}
-        self._gotodef_requests: dict[int, tuple[Text, str]] = {}
-        self._rename_requests: dict[int, Text] = {}
-        self._outline_requests: dict[int, Text] = {}
-        
-        self._ref_requests: list[tuple[Text, str]] = []
+        # pending requests, keyed by message id
+        self.requests = RequestManager(self)
+        # last completion list per tab, filtered locally while the same word is typed
+        self.completion_cache: dict[Text, CompletionCache] = {}
+        # semantic tokens per tab: result id for delta requests, raw and decoded tokens
+        self.semantic_tokens: dict[Text, tuple[str | None, list[int], dict]] = {}
+        # document version the outline was last requested for
+        self.outline_versions: dict[Text, int] = {}
+        # hovers by (uri, version, start, end) of the symbol they are for
+        self.hover_cache: OrderedDict[tuple[str, int, str, str], HoverResponse] = OrderedDict()
+
+    def flush(self) -> None:
+        "Writes out whatever the client has queued up to send"
+
+        if data := self.client.send():
+            self.io.write(data)
+            self.master.expect()
 
-    def run_loop(self) -> None:
-        if self.run():
-            self.base.after(50, self.run_loop)
+    def run(self) -> bool:
+        """Processes the messages read so far, returns False once the server has exited.
+        Called by the manager whenever the reader thread signals new messages."""
 
-    def run(self):
-        self.io.write(self.client.send())
         r = self.io.read()
 
-        if not r:
+        if r is None:
             return True
         elif r == b"":
+            if self.io.stderr:
+                self.base.logger.error(f"<LSPC>({self.language}) exited:\n" + "\n".join(self.io.stderr))
             return False
 
         try:
-            for lsp_event in self.client.recv(r):
-                self.handler.process(lsp_event)
+            events = self.client.recv(r)
+            while True:
+                # not every response event carries its message id, so note
+                # which request each one answered
+                unanswered = self.client.unanswered()
+                try:
+                    lsp_event = next(events)
+                except StopIteration:
+                    break
+                except NotImplementedError as e:
+                    # tarts has no events for some responses (eg. semantic tokens),
+                    # handle those directly and carry on with the rest of the buffer
+                    response, request = e.args[0]
+                    self.handler.process_response(request.method, response.result, response.id)
+                    events = self.client.recv(b"")
+                    continue
+
+                answered = unanswered.difference(self.client.unanswered())
+                self.handler.process(lsp_event, next(iter(answered), None))
         except Exception as e:
             print(e)
 
+        # replies the client makes on its own, eg. initialized after initialize
+        self.flush()
         return True
 
     def open_tab(self, tab: Text) -> None:
+        # until the server is initialized the tab is only remembered,
+        # the Initialized handler opens all of them
         self.tabs_opened.add(tab)
+        self.tab_folders.setdefault(tab, self.master.root_of(tab))
 
         if self.client.state == lsp.ClientState.NORMAL:
+            version = next(self._counter)
+            self.requests.set_version(tab, version)
             self.client.did_open(
                 lsp.TextDocumentItem(
                     uri=Path(tab.path).as_uri(),
                     languageId=self.language,
                     text=tab.get_all_text(),
-                    version=next(self._counter),
+                    version=version,
                 )
             )
+            self.flush()
+            self.request_semantic_tokens(tab)
     
     def close_tab(self, tab: Text) -> None:
         if not tab in self.tabs_opened:
             return
         
         self.tabs_opened.remove(tab)
+        self.requests.forget(tab)
+        self.completion_cache.pop(tab, None)
+        self.semantic_tokens.pop(tab, None)
+        self.outline_versions.pop(tab, None)
+        uri = Path(tab.path).as_uri()
+        for key in [key for key in self.hover_cache if key[0] == uri]:
+            self.hover_cache.pop(key)
         if self.client.state == lsp.ClientState.NORMAL:
             self.client.did_close(
                 lsp.TextDocumentIdentifier(uri=Path(tab.path).as_uri())
             )
+        self.flush()
+
+        folder = self.tab_folders.pop(tab, None)
+        if folder not in self.tab_folders.values():
+            self.remove_folder(folder)
 
         if not self.tabs_opened:
-            def delayed_removal(self=self):
-                if self.tabs_opened:
-                    return
-                self.master.kill(self)   
-            
-            if self.master.kill_thread:
-                self.base.after_cancel(self.master.kill_thread)
-            self.master.kill_thread = self.base.after(50000, delayed_removal)
+            self.master.lifecycle.idle(self)
+
+    def supports_folders(self) -> bool:
+        "Whether the server can take on more workspace folders, assumed so until it is initialized"
+
+        if self.client.state != lsp.ClientState.NORMAL:
+            return True
+
+        folders = self.capabilities.get("workspace", {}).get("workspaceFolders", {})
+        return bool(folders.get("supported") and folders.get("changeNotifications"))
+
+    def add_folder(self, folder: str) -> None:
+        if folder in self.folders:
+            return
+
+        self.folders.append(folder)
+        if self.client.state == lsp.ClientState.NORMAL:
+            self.client.did_change_workspace_folders(added=[workspace_folder(folder)], removed=[])
+            self.flush()
+
+    def remove_folder(self, folder: str) -> None:
+        "Drops a folder none of the open tabs are in anymore, the root is kept for good"
+
+        if folder == self.root_dir or folder not in self.folders:
+            return
+
+        self.folders.remove(folder)
+        self.master.folder_removed(self, folder)
+        if self.client.state == lsp.ClientState.NORMAL:
+            self.client.did_change_workspace_folders(added=[], removed=[workspace_folder(folder)])
+            self.flush()
+
+    def send_folders(self) -> None:
+        """Sends over the folders added while the server was starting up. If the server
+        turns out to serve its root only, the tabs of the other folders are handed to
+        servers of their own."""
+
+        if len(self.folders) == 1:
+            return
+
+        if self.supports_folders():
+            self.client.did_change_workspace_folders(added=[workspace_folder(i) for i in self.folders[1:]], removed=[])
+            self.flush()
+            return
+
+        extra = self.folders[1:]
+        del self.folders[1:]
+        for folder in extra:
+            self.master.folder_removed(self, folder)
+
+        # only remembered so far, the Initialized handler hasn't opened them yet
+        for tab in [tab for tab, folder in self.tab_folders.items() if folder in extra]:
+            self.tabs_opened.discard(tab)
+            self.tab_folders.pop(tab)
+            self.master.tab_opened(tab)
+
+        if not self.tabs_opened:
+            self.master.lifecycle.idle(self)
 
     def request_completions(self, tab: Text) -> None:
+        # a complete list for the word being typed only needs filtering again
+        cache = self.completion_cache.get(tab)
+        if self.show_completions(tab) and not cache.incomplete:
+            return
+
+        self.requests.debounce('completion', tab, lambda: self.send_completions(tab))
+
+    def word_start(self, tab: Text, cursor: str) -> str:
+        before_cursor = tab.get(f"{cursor} linestart", cursor)
+        prefix_len = len(re.search(r"\w*$", before_cursor).group())
+        return tab.index(f"{cursor} - {prefix_len} chars")
+
+    def cache_completions(self, tab: Text, request: CompletionRequest, completion_list: lsp.CompletionList | None) -> None:
+        """Converts a completion list once, ordered by the server's sort text"""
+
+        word_start = self.word_start(tab, request.cursor)
+        items = completion_list.items if completion_list else []
+        self.completion_cache[tab] = CompletionCache(
+            id=request.id,
+            word_start=word_start,
+            context=tab.get(f"{word_start} linestart", word_start),
+            items=[
+                Completion(
+                    kind=item.kind,
+                    display_text=item.label,
+                    replace_start=word_start,
+                    replace_end=word_start,
+                    replace_text=item.insertText or item.label,
+                    filter_text=item.filterText or item.label,
+                    documentation=get_completion_item_doc(item),
+                )
+                for item in sorted(items, key=(lambda item: item.sortText or item.label))
+            ],
+            incomplete=bool(completion_list and completion_list.isIncomplete),
+        )
+
+    def show_completions(self, tab: Text) -> bool:
+        """Filters the cached completions by the part of the word typed so far.
+        Returns False if there is no cached list for the word at the cursor."""
+
+        cache = self.completion_cache.get(tab)
+        if not cache:
+            return False
+
+        cursor = tab.get_cursor_pos()
+        word_start = self.word_start(tab, cursor)
+        if word_start != cache.word_start or tab.get(f"{word_start} linestart", word_start) != cache.context:
+            return False
+
+        matches = fuzzy_filter(tab.get(word_start, cursor), cache.items, key=lambda item: item.filter_text, limit=10)
+        tab.lsp_show_autocomplete(
+            Completions(
+                id=cache.id,
+                completions=[dataclasses.replace(i.item, replace_end=cursor) for i in matches],
+            )
+        )
+        return True
+
+    def send_completions(self, tab: Text) -> None:
         if tab.path is None or self.client.state != lsp.ClientState.NORMAL:
             return
         
@@ -122,19 +297,50 @@ class LangServerClient:
             ),
         )
 
-        self._autocomplete_req[req_id] = (tab, request)
+        self.requests.track('completion', tab, req_id, request)
+        self.flush()
     
     def request_hover(self, tab: Text) -> None:
+        if tab.path and (response := self.cached_hover(tab, tab.get_mouse_pos())):
+            self.requests.drop('hover', tab)
+            tab.lsp_hover(response)
+            return
+
+        self.requests.debounce('hover', tab, lambda: self.send_hover(tab))
+
+    def cancel_hover(self, tab: Text) -> None:
+        self.requests.drop('hover', tab)
+
+    def send_hover(self, tab: Text) -> None:
         if tab.path is None or self.client.state != lsp.ClientState.NORMAL:
             return
         
+        pos = tab.get_mouse_pos()
         request_id = self.client.hover(
             lsp.TextDocumentPosition(
                 textDocument=lsp.TextDocumentIdentifier(uri=Path(tab.path).as_uri()),
-                position=encode_position(tab.get_mouse_pos()),
+                position=encode_position(pos),
             )
         )
-        self._hover_requests[request_id] = (tab, tab.get_mouse_pos())
+        self.requests.track('hover', tab, request_id,
+                            HoverRequest(pos, tab.index(f"{pos} wordstart"), tab.index(f"{pos} wordend")))
+        self.flush()
+
+    def cache_hover(self, tab: Text, version: int, start: str, end: str, response: HoverResponse) -> None:
+        key = (Path(tab.path).as_uri(), version, start, end)
+        self.hover_cache[key] = response
+        self.hover_cache.move_to_end(key)
+        if len(self.hover_cache) > self.hover_cache_size:
+            self.hover_cache.popitem(last=False)
+
+    def cached_hover(self, tab: Text, pos: str) -> HoverResponse | None:
+        "Hover of the symbol at pos, if one was received for this version of the document"
+
+        uri, version = Path(tab.path).as_uri(), self.requests.versions.get(tab)
+        for key in reversed(self.hover_cache):
+            if key[:2] == (uri, version) and tab.compare(key[2], "<=", pos) and tab.compare(pos, "<", key[3]):
+                self.hover_cache.move_to_end(key)
+                return dataclasses.replace(self.hover_cache[key], location=pos)
     
     def request_go_to_definition(self, tab: Text) -> None:
         if tab.path is None or self.client.state != lsp.ClientState.NORMAL:
@@ -152,7 +358,8 @@ class LangServerClient:
                 position=encode_position(pos),
             )
         )
-        self._gotodef_requests[request_id] = (tab, pos)
+        self.requests.track('definition', tab, request_id, pos)
+        self.flush()
     
     def request_references(self, tab: Text) -> None:
         if tab.path is None or self.client.state != lsp.ClientState.NORMAL:
@@ -169,7 +376,8 @@ class LangServerClient:
                 position=encode_position(pos),
             )
         )
-        self._ref_requests.append((tab, pos))
+        self.requests.track('references', tab, request_id, pos)
+        self.flush()
 
     def request_rename(self, tab: Text, new_name: str) -> None:
         if tab.path is None or self.client.state != lsp.ClientState.NORMAL:
@@ -185,24 +393,46 @@ class LangServerClient:
             ),
             new_name=new_name,
         )
-        self._rename_requests[request_id] = tab
+        self.requests.track('rename', tab, request_id)
+        self.flush()
     
     def request_outline(self, tab: Text) -> None:
+        self.requests.debounce('outline', tab, lambda: self.send_outline(tab))
+
+    def send_outline(self, tab: Text) -> None:
         if tab.path is None or self.client.state != lsp.ClientState.NORMAL:
             return
+
+        # cursor moves refresh the editor too, the symbols only change with the text
+        version = self.requests.versions.get(tab)
+        if self.outline_versions.get(tab) == version and self.base.outline.tree.tab is tab:
+            return
+        self.outline_versions[tab] = version
         
         request_id = self.client.documentSymbol(
             lsp.TextDocumentIdentifier(uri=Path(tab.path).as_uri()),
         )
-        self._outline_requests[request_id] = tab
+        self.requests.track('outline', tab, request_id)
+        self.flush()
+
+    def request_workspace_symbols(self) -> None:
+        if self.client.state != lsp.ClientState.NORMAL or not self.capabilities.get("workspaceSymbolProvider"):
+            return
+
+        # all of them, the palette filters locally
+        request_id = self.client.workspace_symbol("")
+        self.requests.track('workspace_symbols', None, request_id)
+        self.flush()
 
     def send_change_events(self, tab: Text) -> None:
         if self.client.state != lsp.ClientState.NORMAL:
             return
 
+        version = next(self._counter)
+        self.requests.set_version(tab, version)
         self.client.did_change(
             text_document=lsp.VersionedTextDocumentIdentifier(
-                uri=Path(tab.path).as_uri(), version=next(self._counter)
+                uri=Path(tab.path).as_uri(), version=version
             ),
             content_changes=[
                 lsp.TextDocumentContentChangeEvent(
@@ -213,3 +443,44 @@ class LangServerClient:
                 )
             ],
         )
+        self.flush()
+        self.request_semantic_tokens(tab)
+
+    def request_semantic_tokens(self, tab: Text) -> None:
+        self.requests.debounce('semantic', tab, lambda: self.send_semantic_tokens(tab))
+
+    def send_semantic_tokens(self, tab: Text) -> None:
+        if tab.path is None or self.client.state != lsp.ClientState.NORMAL:
+            return
+
+        provider = self.capabilities.get("semanticTokensProvider")
+        if not provider or not provider.get("full"):
+            return
+
+        document = {"textDocument": {"uri": Path(tab.path).as_uri()}}
+        result_id = self.semantic_tokens.get(tab, (None,))[0]
+        if result_id and isinstance(provider["full"], dict) and provider["full"].get("delta"):
+            request_id = self.client.send_request("textDocument/semanticTokens/full/delta",
+                                                  {**document, "previousResultId": result_id})
+        else:
+            request_id = self.client.send_request("textDocument/semanticTokens/full", document)
+
+        self.requests.track('semantic', tab, request_id)
+        self.flush()
+
+    def update_semantic_tokens(self, tab: Text, result: dict) -> None:
+        """Decodes full or delta results, re-tagging only the lines whose tokens changed"""
+
+        legend = self.capabilities["semanticTokensProvider"].get("legend", {})
+        previous = self.semantic_tokens.get(tab)
+
+        if "edits" in result:
+            if not previous:
+                return
+            data = apply_edits(previous[1], result["edits"])
+        else:
+            data = result.get("data", [])
+
+        lines = decode_tokens(data, legend.get("tokenTypes", []))
+        self.semantic_tokens[tab] = (result.get("resultId"), data, lines)
+        tab.lsp_semantic_tokens(lines, changed_lines(previous[2], lines) if previous else None)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import dataclasses
-from typing import List, Optional, Union
+from typing import Any, List, Optional, Union
 
 import tarts as lsp
 
@@ -12,11 +12,33 @@ class CompletionRequest:
     id: int
     cursor: str
 
+@dataclasses.dataclass
+class HoverRequest:
+    location: str
+    # range of the word hovered, used unless the server gives the symbol's range
+    start: str
+    end: str
+
 @dataclasses.dataclass
 class JumpRequest:
     file_path: str
     location: str
 
+@dataclasses.dataclass
+class CompletionCache:
+    id: int
+    word_start: str
+    context: str
+    items: List[Completion]
+    incomplete: bool
+
+@dataclasses.dataclass
+class PendingRequest:
+    kind: str
+    tab: Any
+    version: Optional[int]
+    data: Any = None
+
 
 # Responses
 
@@ -26,6 +48,7 @@ class Underline:
     end: str
     tooltip_text: str
     color: Optional[str] = None
+    severity: Optional[int] = None
 
     def __repr__(self) -> str:
         return self.start
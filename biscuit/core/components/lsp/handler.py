@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import pprint
-import re
 import typing
 
 import tarts as lsp
@@ -18,7 +17,18 @@ class EventHandler:
         self.client = master.client
         self.base = master.base
 
-    def process(self, e: lsp.Event) -> None:
+    def process_response(self, method: str, result, message_id: int) -> None:
+        """Handles responses that tarts doesn't turn into events"""
+
+        if not (request := self.master.requests.resolve(message_id)):
+            return
+
+        if method.startswith("textDocument/semanticTokens") and result:
+            self.master.update_semantic_tokens(request.tab, result)
+
+    def process(self, e: lsp.Event, message_id: int=None) -> None:
+        """Handles an event, `message_id` being the request it answers if it is a response"""
+
         if isinstance(e, lsp.Shutdown):
             self.client.exit()
             return
@@ -33,79 +43,62 @@ class EventHandler:
         
         if isinstance(e, lsp.Initialized):
             self.base.logger.info("Capabilities " + pprint.pformat(e.capabilities))
+            self.master.capabilities = e.capabilities or {}
+            self.master.send_folders()
             for tab in self.master.tabs_opened:
                 self.master.open_tab(tab)
                 self.master.request_outline(tab)
 
-            self.base.statusbar.process_indicator.hide()
+            self.base.statusbar.end_process(self.master.process_key)
             return
         
+        if isinstance(e, lsp.WorkspaceFolders):
+            e.reply([workspace_folder(i) for i in self.master.folders])
+            return
+
+        if isinstance(e, lsp.ResponseError):
+            # cancelled requests are answered with an error, nothing to report
+            if self.master.requests.resolve(message_id) and e.code != -32800:
+                self.base.logger.error(f"<LSPC>({self.master.language}) {e.message}")
+            return
+
         if isinstance(e, lsp.Completion):
-            tab, req = self.master._autocomplete_req.pop(e.message_id)
-            if tab not in self.master.tabs_opened:
+            # the list stays useful while the same word is being typed, so
+            # an edit since the request doesn't make it stale
+            if not (request := self.master.requests.resolve(message_id, check_version=False)):
                 return
 
-            before_cursor = tab.get(f"{req.cursor} linestart", req.cursor)
-            match = re.fullmatch(r".*?(\w*)", before_cursor)
-            prefix_len = len(match.group(1))
-            tab.lsp_show_autocomplete(
-                Completions(
-                    id=req.id,
-                    completions=[
-                        Completion(
-                            kind=item.kind,
-                            display_text=item.label,
-                            replace_start=tab.index(f"{req.cursor} - {prefix_len} chars"),
-                            replace_end=req.cursor,
-                            replace_text=item.insertText or item.label,
-                            filter_text=(item.filterText or item.insertText or item.label)[prefix_len:],
-                            documentation=get_completion_item_doc(item),
-                        )
-                        for item in sorted(
-                            e.completion_list.items,
-                            key=(lambda item: item.sortText or item.label),
-                        )
-                    ],
-                ),
-            )
+            self.master.cache_completions(request.tab, request.data, e.completion_list)
+            self.master.show_completions(request.tab)
             return
         
         if isinstance(e, lsp.PublishDiagnostics):
-            matching_tabs = [
-                tab
-                for tab in self.master.tabs_opened
-                if tab.path is not None and Path(tab.path).as_uri() == e.uri
+            underlines = [
+                Underline(
+                    start=decode_position(diagnostic.range.start),
+                    end=decode_position(diagnostic.range.end),
+                    tooltip_text=f"{diagnostic.source}: {diagnostic.message}" if diagnostic.source else diagnostic.message,
+                    color=(
+                        "red"
+                        if diagnostic.severity == lsp.DiagnosticSeverity.ERROR
+                        else "orange"
+                    ),
+                    severity=diagnostic.severity or lsp.DiagnosticSeverity.WARNING,
+                )
+                for diagnostic in e.diagnostics
             ]
-            if not matching_tabs:
-                return
-            tab = matching_tabs[0]
-
-            tab.lsp_diagnostics(
-                Underlines(
-                    id="diagnostics",
-                    underline_list=[
-                        Underline(
-                            start=decode_position(diagnostic.range.start),
-                            end=decode_position(diagnostic.range.end),
-                            tooltip_text=f"{diagnostic.source}: {diagnostic.message}",
-                            color=(
-                                "red"
-                                if diagnostic.severity == lsp.DiagnosticSeverity.ERROR
-                                else "orange"
-                            ),
-                        )
-                        for diagnostic in sorted(
-                            e.diagnostics,
-                            key=(lambda d: d.severity or lsp.DiagnosticSeverity.WARNING),
-                            reverse=True,
-                        )
-                    ],
-                ),
-            )
+
+            self.base.problems.update_file(decode_path_uri(e.uri), underlines)
+            for tab in self.master.tabs_opened:
+                if tab.path is not None and Path(tab.path).as_uri() == e.uri:
+                    tab.lsp_diagnostics(Underlines(id="diagnostics", underline_list=underlines))
             return
         
         if isinstance(e, lsp.Definition):
-            tab, pos = self.master._gotodef_requests.pop(e.message_id)
+            if not (request := self.master.requests.resolve(message_id)):
+                return
+
+            tab, pos = request.tab, request.data
 
             tab.lsp_goto_definition(
                 Jump(
@@ -123,13 +116,10 @@ class EventHandler:
             return
     
         if isinstance(e, lsp.References):
-            if not self.master._ref_requests:
+            if not (request := self.master.requests.resolve(message_id)):
                 return
 
-            try:
-                tab, pos = self.master._ref_requests.pop(0)
-            except Exception as e:
-                print(e)
+            tab, pos = request.tab, request.data
 
             tab.lsp_goto_definition(
                 Jump(
@@ -140,14 +130,17 @@ class EventHandler:
                             start=decode_position(loc.range.start),
                             end=decode_position(loc.range.end),
                         )
-                        for loc in e.result
+                        for loc in e.result or ()
                     ]
                 ),
             )
             return
         
         if isinstance(e, lsp.WorkspaceEdit):
-            tab = self.master._rename_requests.pop(e.message_id)
+            if not (request := self.master.requests.resolve(message_id)):
+                return
+
+            tab = request.tab
             if not e.documentChanges:
                 return
             
@@ -168,19 +161,33 @@ class EventHandler:
                 ]))
 
         if isinstance(e, lsp.Hover):
-            requesting_tab, location = self.master._hover_requests.pop(e.message_id)
-            requesting_tab.lsp_hover(HoverResponse(location, *hover_filter(e.contents)))
+            if not (request := self.master.requests.resolve(message_id)):
+                return
+
+            hover = request.data
+            start, end = hover.start, hover.end
+            if e.range:
+                start, end = decode_position(e.range.start), decode_position(e.range.end)
+
+            response = HoverResponse(hover.location, *hover_filter(e.contents))
+            self.master.cache_hover(request.tab, request.version, start, end, response)
+            request.tab.lsp_hover(response)
             return
         
         if isinstance(e, lsp.MDocumentSymbols):
-            tab = self.master._outline_requests.pop(e.message_id)
-            if tab not in self.master.tabs_opened:
+            if not (request := self.master.requests.resolve(message_id)):
                 return
 
-            self.base.language_server_manager._update_symbols(tab, e.result)
+            tab = request.tab
+
             self.base.outline.update_symbols(tab, e.result if e.result and isinstance(e.result[0], lsp.DocumentSymbol) else to_document_symbol(e.result))
             return
         
+        if isinstance(e, lsp.MWorkspaceSymbols):
+            if self.master.requests.resolve(message_id):
+                self.base.language_server_manager.symbols.update_server(self.master, e.result)
+            return
+
         # DEBUG ones that are not implemented yet
         self.base.logger.trace(e.__class__.__name__.upper())
         # print(e)
@@ -6,10 +6,13 @@ Porcupine's LSP plugin https://github.com/Akuli/porcupine/
 
 from __future__ import annotations
 
+import os
 import queue
+import shlex
 import subprocess
 import typing
-from threading import Thread
+from collections import deque
+from threading import Lock, Thread
 
 if typing.TYPE_CHECKING:
     from biscuit.core import App
@@ -30,16 +33,27 @@ class IO:
         self.master = master
         self.base = master.base
         self.alive = True
+        # guards alive and p, stop() can run while the process is still being spawned
+        self.lock = Lock()
         self.cmd = cmd
         self.cwd = cwd
+        self.p: subprocess.Popen = None
+        self.t_out: Thread = None
+        self.error: OSError = None
 
         self.in_queue = queue.Queue() # input data
-        self.out_queue = queue.Queue() # output results
+        # complete messages, bounded so a flood from the server waits on the reader
+        # thread instead of piling up in memory while the UI catches up
+        self.out_queue = queue.Queue(maxsize=256)
+        self.stderr: deque[str] = deque(maxlen=200)
 
     def write(self, buf) -> None:
         self.in_queue.put(buf)
 
-    def read(self) -> None:
+    def read(self) -> bytes | None:
+        """Returns the complete messages received since the last read, None if
+        there are none yet and b"" once the server has exited."""
+
         buf = bytearray()
         while True:
             try:
@@ -47,30 +61,61 @@ class IO:
             except queue.Empty:
                 break
 
-        if self.t_out.is_alive() and not buf:
+        if buf:
+            return bytes(buf)
+        if self.t_out is None:
+            # still spawning, unless that failed
+            return b"" if self.error else None
+        if self.t_out.is_alive():
             return None
         return bytes(buf)
-        # return self.out_queue.get()
 
     def start(self, *_) -> None:
-        "Start the process"
-        self.p = subprocess.Popen(
-            self.cmd, 
-            stdout=subprocess.PIPE,
-            stdin=subprocess.PIPE, 
-            stderr=subprocess.PIPE,
-            shell=True)
-        self.base.logger.info(f"PID: {self.p.pid} CMD: {self.cmd} CWD: {self.cwd}")
+        """Starts the process in the background, anything written meanwhile
+        is sent once it is up"""
+
+        self.base.logger.info(f"CMD: {self.cmd} CWD: {self.cwd}")
+        Thread(target=self._spawn, daemon=True).start()
+
+    def _spawn(self) -> None:
+        # no shell in between, the server is our direct child
+        args = self.cmd if os.name == 'nt' else shlex.split(self.cmd)
+        try:
+            p = subprocess.Popen(
+                args,
+                stdout=subprocess.PIPE,
+                stdin=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=self.cwd,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
+        except OSError as e:
+            self.error = e
+            self.master.master.notify(self.master)
+            return
+
+        with self.lock:
+            if self.alive:
+                self.p = p
+        if self.p is not p:
+            # stopped while spawning, nobody wants this process anymore
+            p.kill()
+            p.wait()
+            return
 
         Thread(target=self._process_in, daemon=True).start()
-        self.t_out = Thread(target=self._process_out, daemon=True)
-        self.t_out.start()
+        Thread(target=self._process_err, daemon=True).start()
+        t_out = Thread(target=self._process_out, daemon=True)
+        t_out.start()
+        self.t_out = t_out
 
     def stop(self, *_) -> None:
-        "Stop the process"
-        self.alive = False
-        self.p.kill()
-        self.p.wait()
+        "Stop the process, or have it stopped as soon as it is spawned"
+        with self.lock:
+            self.alive = False
+            p = self.p
+        if p:
+            p.kill()
+            p.wait()
 
     def _process_in(self) -> None:
         while self.alive:
@@ -83,8 +128,45 @@ class IO:
             self.p.stdin.flush()
     
     def _process_out(self) -> None:
+        try:
+            self._read_messages()
+        finally:
+            # let the client notice that the server exited
+            self.master.master.notify(self.master)
+
+    def _read_messages(self) -> None:
+        """Reads framed messages: headers up to a blank line, then exactly
+        Content-Length bytes of body in a single read."""
+
+        stdout = self.p.stdout
         while self.alive:
-            data = self.p.stdout.read(1)
-            if not data:
-                break
-            self.out_queue.put(data)
+            header = bytearray()
+            length = None
+            while True:
+                line = stdout.readline()
+                if not line:
+                    return
+                header += line
+                if line in (b"\r\n", b"\n"):
+                    break
+
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value.strip())
+
+            if length is None:
+                # not a message we can frame, skip the headers
+                continue
+
+            body = stdout.read(length)
+            if len(body) < length:
+                return
+            self.out_queue.put(bytes(header + body))
+            self.master.master.notify(self.master)
+
+    def _process_err(self) -> None:
+        """Keeps draining stderr so a chatty server never blocks on a full pipe"""
+
+        for line in iter(self.p.stderr.readline, b""):
+            text = line.decode("utf-8", "replace").rstrip()
+            self.stderr.append(text)
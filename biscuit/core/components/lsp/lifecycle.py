@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import typing
+from collections import OrderedDict
+
+import psutil
+
+if typing.TYPE_CHECKING:
+    from . import LanguageServerManager
+    from .client import LangServerClient
+
+
+def rss(pid: int) -> int | None:
+    """Resident memory of a process in bytes, None if it is gone"""
+
+    try:
+        return psutil.Process(pid).memory_info().rss
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+class ServerLifecycle:
+    """Decides when language servers are stopped or restarted
+
+    - a server without open tabs is shut down after its own idle timeout
+    - at most `max_servers` run at once, the least recently used is evicted
+      (servers without open tabs first)
+    - memory is sampled periodically, servers above `memory_cap` are restarted
+    """
+
+    idle_timeout = 50000        # ms
+    max_servers = 4
+    memory_cap = 1024 ** 3      # bytes
+    sample_interval = 30000     # ms
+
+    def __init__(self, master: LanguageServerManager) -> None:
+        self.master = master
+        self.base = master.base
+
+        # least recently used first
+        self.instances: OrderedDict[LangServerClient, None] = OrderedDict()
+        self.idle_timers: dict[LangServerClient, str] = {}
+        self.sampler = None
+
+    def started(self, instance: LangServerClient) -> None:
+        self.instances[instance] = None
+        self.evict()
+
+        if not self.sampler:
+            self.sampler = self.base.after(self.sample_interval, self.sample)
+
+    def stopped(self, instance: LangServerClient) -> None:
+        self.instances.pop(instance, None)
+        self.cancel_idle(instance)
+
+    def touch(self, instance: LangServerClient) -> None:
+        "Marks the instance as used just now"
+
+        if instance in self.instances:
+            self.instances.move_to_end(instance)
+            self.cancel_idle(instance)
+
+    def idle(self, instance: LangServerClient) -> None:
+        "Schedules the shutdown of an instance whose tabs are all closed"
+
+        if instance not in self.instances:
+            return
+
+        self.cancel_idle(instance)
+
+        def expire():
+            self.idle_timers.pop(instance, None)
+            if not instance.tabs_opened:
+                self.master.kill(instance)
+
+        self.idle_timers[instance] = self.base.after(self.idle_timeout, expire)
+
+    def cancel_idle(self, instance: LangServerClient) -> None:
+        if timer := self.idle_timers.pop(instance, None):
+            self.base.after_cancel(timer)
+
+    def evict(self) -> None:
+        while len(self.instances) > self.max_servers:
+            # the one just started is never the victim
+            candidates = list(self.instances)[:-1]
+            unused = [i for i in candidates if not i.tabs_opened]
+            victim = unused[0] if unused else candidates[0]
+            self.base.logger.warning(f"-- Too many language servers, stopping LSPC({victim.language}) --")
+            self.master.kill(victim)
+
+    def sample(self) -> None:
+        self.sampler = None
+
+        for instance in list(self.instances):
+            if not instance.io.p:
+                continue
+
+            memory = rss(instance.io.p.pid)
+            if memory is not None and memory > self.memory_cap:
+                self.base.logger.warning(
+                    f"-- LSPC({instance.language}) is using {memory // 1024 ** 2} MB, restarting --")
+                self.master.restart(instance)
+
+        if self.instances:
+            self.sampler = self.base.after(self.sample_interval, self.sample)
@@ -0,0 +1,48 @@
+"""Everything that reaches past the public API of tarts lives here.
+
+tarts has no way to pass per-client capabilities (0.12.0), no public way to send
+requests or notifications it has no method for, and does not tell which request a
+response event answers. The client below builds on its private `_send_request`,
+`_send_notification` and `_unanswered_requests` for that; the rest of the editor only
+uses the methods here, and tests/test_lsp_protocol.py breaks if tarts changes them.
+"""
+
+from __future__ import annotations
+
+import copy
+
+import tarts as lsp
+
+
+class Client(lsp.Client):
+    """tarts client that initializes with the given capabilities instead of tarts' module wide ones"""
+
+    def __init__(self, *args, capabilities: dict, **kwargs) -> None:
+        # set before tarts queues the initialize request in its __init__
+        self.client_capabilities = capabilities
+        super().__init__(*args, **kwargs)
+
+    def _send_request(self, method: str, params: dict=None):
+        if method == "initialize" and params is not None:
+            params = dict(params, capabilities=self.client_capabilities)
+        return super()._send_request(method, params)
+
+    def send_request(self, method: str, params: dict=None) -> int:
+        "Queues a request tarts has no method for, returns its message id"
+        return self._send_request(method, params)
+
+    def cancel_request(self, request_id: int) -> None:
+        "Queues a $/cancelRequest for a request still in flight"
+        self._send_notification("$/cancelRequest", {"id": request_id})
+
+    def unanswered(self) -> set[int]:
+        "Message ids of the requests the server has not answered yet"
+        return set(self._unanswered_requests)
+
+
+def capabilities(text_document: dict=None) -> dict:
+    "A copy of the capabilities tarts advertises, with the given textDocument ones added"
+
+    caps = copy.deepcopy(lsp.CAPABILITIES)
+    caps.setdefault("textDocument", {}).update(text_document or {})
+    return caps
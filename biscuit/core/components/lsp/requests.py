@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import typing
+
+from .data import PendingRequest
+
+if typing.TYPE_CHECKING:
+    from biscuit.core.components.editors.texteditor.text import Text
+
+    from .client import LangServerClient
+
+
+class RequestManager:
+    """Keeps track of the requests a client has in flight
+
+    Every request is keyed by its message id. Hover, completion and outline
+    requests are debounced per tab, and a newer request of the same kind
+    for a tab cancels the one before it. Responses to requests made against
+    an older version of the document are dropped.
+    """
+
+    # debounce delays in ms, kinds not listed here are sent right away
+    delays = {
+        'hover': 150,
+        'completion': 30,
+        'outline': 500,
+        'semantic': 300,
+    }
+
+    def __init__(self, master: LangServerClient) -> None:
+        self.master = master
+        self.base = master.base
+
+        self.pending: dict[int, PendingRequest] = {}
+        self.latest: dict[tuple[str, Text], int] = {}
+        self.scheduled: dict[tuple[str, Text], str] = {}
+        self.versions: dict[Text, int] = {}
+
+    def debounce(self, kind: str, tab: Text, send: typing.Callable[[], None]) -> None:
+        """Calls `send` once requests of this kind for the tab settle down"""
+
+        key = (kind, tab)
+        if after := self.scheduled.pop(key, None):
+            self.base.after_cancel(after)
+
+        def fire():
+            self.scheduled.pop(key, None)
+            send()
+
+        self.scheduled[key] = self.base.after(self.delays.get(kind, 0), fire)
+
+    def track(self, kind: str, tab: Text, request_id: int, data=None) -> None:
+        """Records a sent request, cancelling the previous one of its kind for the tab"""
+
+        key = (kind, tab)
+        if (previous := self.latest.get(key)) is not None and previous in self.pending:
+            self.cancel(previous)
+
+        self.latest[key] = request_id
+        self.pending[request_id] = PendingRequest(kind, tab, self.versions.get(tab), data)
+
+    def cancel(self, request_id: int) -> None:
+        if self.pending.pop(request_id, None) is None:
+            return
+
+        self.master.client.cancel_request(request_id)
+        self.master.flush()
+
+    def drop(self, kind: str, tab: Text) -> None:
+        "Cancels the scheduled and the in flight request of a kind for the tab"
+
+        if after := self.scheduled.pop((kind, tab), None):
+            self.base.after_cancel(after)
+        if (request_id := self.latest.pop((kind, tab), None)) is not None:
+            self.cancel(request_id)
+
+    def resolve(self, request_id: int, check_version: bool=True) -> PendingRequest | None:
+        """Returns the request a response answers, None if it is no longer wanted:
+        cancelled, superseded, for a closed tab or an outdated document"""
+
+        request = self.pending.pop(request_id, None)
+        if request is None:
+            return
+
+        if self.latest.get((request.kind, request.tab)) == request_id:
+            self.latest.pop((request.kind, request.tab))
+
+        # workspace wide requests are not made for a tab
+        if request.tab is not None and request.tab not in self.master.tabs_opened:
+            return
+        if check_version and request.version != self.versions.get(request.tab):
+            return
+
+        return request
+
+    def set_version(self, tab: Text, version: int) -> None:
+        self.versions[tab] = version
+
+    def forget(self, tab: Text) -> None:
+        "Drops everything pending for a closed tab"
+
+        for key in [key for key in self.scheduled if key[1] is tab]:
+            self.base.after_cancel(self.scheduled.pop(key))
+        for request_id in [i for i, request in self.pending.items() if request.tab is tab]:
+            self.cancel(request_id)
+        for key in [key for key in self.latest if key[1] is tab]:
+            self.latest.pop(key)
+        self.versions.pop(tab, None)
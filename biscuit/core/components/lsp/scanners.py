@@ -0,0 +1,139 @@
+"""Symbol scanners for files no language server answers for.
+
+Python is parsed with `ast`, other languages are scanned line by line with regular
+expressions that only catch top level looking definitions. Symbols are
+(name, kind, line, column, container) tuples, lines 1 based and kinds as in LSP SymbolKind.
+
+These run in worker processes, so they only take and return plain data.
+"""
+
+from __future__ import annotations
+
+import ast
+import os
+import re
+
+# LSP SymbolKind
+CLASS, METHOD, ENUM, INTERFACE, FUNCTION, VARIABLE, CONSTANT, STRUCT = 5, 6, 10, 11, 12, 13, 14, 23
+
+# files bigger than this are most likely generated, they're not scanned
+MAX_SIZE = 1024 * 1024
+
+Symbol = tuple[str, int, int, int, str]
+
+
+def scan_python(source: str) -> list[Symbol]:
+    symbols = []
+
+    def visit(body: list[ast.stmt], container: str, in_class: bool) -> None:
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                symbols.append((node.name, CLASS, node.lineno, node.col_offset, container))
+                visit(node.body, node.name, True)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                # locals of functions are left out
+                symbols.append((node.name, METHOD if in_class else FUNCTION, node.lineno, node.col_offset, container))
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+                for target in (node.targets if isinstance(node, ast.Assign) else [node.target]):
+                    if isinstance(target, ast.Name):
+                        kind = CONSTANT if target.id.isupper() else VARIABLE
+                        symbols.append((target.id, kind, target.lineno, target.col_offset, container))
+            elif isinstance(node, (ast.If, ast.Try)):
+                # definitions behind `if TYPE_CHECKING:`, `try: import ...` and alike
+                visit(node.body, container, in_class)
+                visit(node.orelse, container, in_class)
+
+    visit(ast.parse(source).body, "", False)
+    return symbols
+
+
+C_LIKE = [
+    (r"^\s*(?:typedef\s+)?(?:struct|union)\s+(\w+)\s*\{", STRUCT),
+    (r"^\s*(?:typedef\s+)?enum\s+(?:class\s+)?(\w+)", ENUM),
+    (r"^\s*(?:template\s*<[^>]*>\s*)?class\s+(\w+)", CLASS),
+    (r"^(?:[\w:*&<>]+\s+)+\**(\w+)\s*\([^;]*$", FUNCTION),
+]
+
+JAVA_LIKE = [
+    (r"^\s*(?:(?:public|private|protected|internal|static|abstract|final|sealed|partial)\s+)*class\s+(\w+)", CLASS),
+    (r"^\s*(?:(?:public|private|protected|internal|static)\s+)*interface\s+(\w+)", INTERFACE),
+    (r"^\s*(?:(?:public|private|protected|internal|static)\s+)*enum\s+(\w+)", ENUM),
+    (r"^\s*(?:(?:public|private|protected|internal|static)\s+)*(?:record|struct)\s+(\w+)", STRUCT),
+    (r"^\s+(?:(?:public|private|protected|internal|static|final|abstract|override|virtual|async|synchronized)\s+)+[\w<>\[\],.? ]+\s+(\w+)\s*\(", METHOD),
+]
+
+JS_LIKE = [
+    (r"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)", FUNCTION),
+    (r"^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+([A-Za-z_$][\w$]*)", CLASS),
+    (r"^\s*(?:export\s+)?interface\s+([A-Za-z_$][\w$]*)", INTERFACE),
+    (r"^\s*(?:export\s+)?(?:const\s+)?enum\s+([A-Za-z_$][\w$]*)", ENUM),
+    (r"^\s*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s+)?(?:function|\([^)]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)", FUNCTION),
+]
+
+REGEX_SCANNERS: dict[str, list[tuple[re.Pattern, int]]] = {}
+
+for exts, patterns in (
+    ((".c", ".h", ".cc", ".cpp", ".cxx", ".hpp", ".hh"), C_LIKE),
+    ((".java", ".cs", ".kt"), JAVA_LIKE),
+    ((".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx"), JS_LIKE),
+    ((".go",), [
+        (r"^func\s+(?:\([^)]*\)\s*)?(\w+)", FUNCTION),
+        (r"^type\s+(\w+)\s+struct\b", STRUCT),
+        (r"^type\s+(\w+)\s+interface\b", INTERFACE),
+        (r"^type\s+(\w+)", CLASS),
+    ]),
+    ((".rs",), [
+        (r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:const\s+)?(?:async\s+)?(?:unsafe\s+)?fn\s+(\w+)", FUNCTION),
+        (r"^\s*(?:pub(?:\([^)]*\))?\s+)?struct\s+(\w+)", STRUCT),
+        (r"^\s*(?:pub(?:\([^)]*\))?\s+)?enum\s+(\w+)", ENUM),
+        (r"^\s*(?:pub(?:\([^)]*\))?\s+)?trait\s+(\w+)", INTERFACE),
+    ]),
+    ((".rb",), [
+        (r"^\s*class\s+([\w:]+)", CLASS),
+        (r"^\s*module\s+([\w:]+)", CLASS),
+        (r"^\s*def\s+(?:self\.)?(\w+[?!=]?)", METHOD),
+    ]),
+    ((".lua",), [
+        (r"^\s*(?:local\s+)?function\s+([\w.:]+)", FUNCTION),
+    ]),
+    ((".php",), [
+        (r"^\s*(?:abstract\s+|final\s+)?class\s+(\w+)", CLASS),
+        (r"^\s*interface\s+(\w+)", INTERFACE),
+        (r"^\s*(?:(?:public|private|protected|static|abstract|final)\s+)*function\s+(\w+)", FUNCTION),
+    ]),
+):
+    compiled = [(re.compile(pattern), kind) for pattern, kind in patterns]
+    for ext in exts:
+        REGEX_SCANNERS[ext] = compiled
+
+# keywords the c like function pattern picks up from control flow
+C_KEYWORDS = {"if", "for", "while", "switch", "return", "sizeof", "else", "catch", "new", "delete"}
+
+EXTENSIONS = {".py", ".pyw", *REGEX_SCANNERS}
+
+
+def scan_regex(source: str, patterns: list[tuple[re.Pattern, int]]) -> list[Symbol]:
+    symbols = []
+    for lineno, line in enumerate(source.splitlines(), 1):
+        for pattern, kind in patterns:
+            if (match := pattern.match(line)) and match.group(1) not in C_KEYWORDS:
+                symbols.append((match.group(1), kind, lineno, match.start(1), ""))
+                break
+    return symbols
+
+
+def scan_file(path: str) -> list[Symbol]:
+    """Symbols of a file, an empty list if it can't be read or parsed"""
+
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        if os.path.getsize(path) > MAX_SIZE:
+            return []
+        with open(path, encoding="utf-8", errors="replace") as f:
+            source = f.read()
+
+        if ext in (".py", ".pyw"):
+            return scan_python(source)
+        return scan_regex(source, REGEX_SCANNERS.get(ext, ()))
+    except (OSError, SyntaxError, ValueError, RecursionError):
+        return []
@@ -0,0 +1,82 @@
+"""Semantic tokens: decoding the relative-encoded integer arrays servers send.
+
+Tokens come as a flat list of 5 integers each (deltaLine, deltaStart, length,
+tokenType, tokenModifiers), lines and starts being relative to the previous token.
+"""
+
+from __future__ import annotations
+
+from pygments.token import Token
+
+# semantic token type -> pygments token whose color it takes
+TOKEN_TYPES = {
+    'namespace': Token.Name.Namespace,
+    'type': Token.Name.Class,
+    'class': Token.Name.Class,
+    'enum': Token.Name.Class,
+    'interface': Token.Name.Class,
+    'struct': Token.Name.Class,
+    'typeParameter': Token.Name.Class,
+    'parameter': Token.Name.Variable,
+    'variable': Token.Name.Variable,
+    'property': Token.Name.Property,
+    'enumMember': Token.Name.Constant,
+    'event': Token.Name.Variable,
+    'function': Token.Name.Function,
+    'method': Token.Name.Function,
+    'macro': Token.Name.Function,
+    'decorator': Token.Name.Decorator,
+    'keyword': Token.Keyword,
+    'modifier': Token.Keyword,
+    'comment': Token.Comment,
+    'string': Token.String,
+    'number': Token.Number,
+    'regexp': Token.String.Regex,
+    'operator': Token.Operator,
+}
+
+# registered statically only, client/registerCapability isn't handled
+CAPABILITY = {
+    'dynamicRegistration': False,
+    'requests': {'full': {'delta': True}},
+    'tokenTypes': list(TOKEN_TYPES),
+    'tokenModifiers': [],
+    'formats': ['relative'],
+}
+
+
+def decode_tokens(data: list[int], token_types: list[str]) -> dict[int, list[tuple[int, int, str]]]:
+    """Decodes the token array into {line: [(start, length, type), ...]}, 0 based"""
+
+    lines: dict[int, list[tuple[int, int, str]]] = {}
+    line = start = 0
+    n_types = len(token_types)
+
+    it = iter(data)
+    for delta_line, delta_start, length, kind, _ in zip(it, it, it, it, it):
+        if delta_line:
+            line += delta_line
+            start = delta_start
+        else:
+            start += delta_start
+
+        if kind < n_types and token_types[kind] in TOKEN_TYPES:
+            lines.setdefault(line, []).append((start, length, token_types[kind]))
+
+    return lines
+
+
+def apply_edits(data: list[int], edits: list[dict]) -> list[int]:
+    """Applies the edits of a delta response to the previous token array"""
+
+    data = list(data)
+    for edit in sorted(edits, key=lambda edit: edit['start'], reverse=True):
+        start = edit['start']
+        data[start:start + edit.get('deleteCount', 0)] = edit.get('data') or []
+    return data
+
+
+def changed_lines(old: dict[int, list], new: dict[int, list]) -> set[int]:
+    """Lines whose tokens differ between two decoded sets"""
+
+    return {line for line in old.keys() | new.keys() if old.get(line) != new.get(line)}
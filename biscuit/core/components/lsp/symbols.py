@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+import typing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import tarts as lsp
+
+from ..floating.palette.actionset import ActionSet
+from .scanners import EXTENSIONS, scan_file
+from .utils import decode_path_uri
+
+if typing.TYPE_CHECKING:
+    from . import LanguageServerManager
+    from .client import LangServerClient
+
+# stale files scanned in one go above which the scanning is spread over processes
+POOL_THRESHOLD = 64
+
+
+class SymbolIndex:
+    """Symbols of the whole workspace, for the `@` palette
+
+    Language servers that support `workspace/symbol` are asked for the symbols of
+    their language. Every other file is scanned on a worker thread (python files
+    are parsed in a process pool when there are many), and the results are kept in
+    an sqlite database so only files modified since the last scan are scanned again.
+
+    The actionset holds plain (name, None, location, path, position) rows that are
+    only rebuilt when the symbols change, picking one goes through `goto`.
+    """
+
+    def __init__(self, master: LanguageServerManager) -> None:
+        self.master = master
+        self.base = master.base
+        self.path = os.path.join(self.base.datadir, "symbols.db")
+
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS symbols (
+                path TEXT NOT NULL,
+                name TEXT NOT NULL,
+                kind INTEGER NOT NULL,
+                line INTEGER NOT NULL,
+                col INTEGER NOT NULL,
+                container TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS symbols_path ON symbols (path);
+            """
+        )
+
+        # (path, name, kind, line, col, container) per language server
+        self.server_symbols: dict[LangServerClient, list[tuple]] = {}
+        # scanned symbols under `root`, read from the database when the index changes
+        self.scanned: list[tuple] = []
+        self.root: str = None
+        self.stale = True
+
+        self.indexing = False
+        self.results = queue.Queue()
+        self.actionset = ActionSet("Go to symbol in workspace", "@", [], loader=self.load, picker=self.goto)
+
+    def load(self) -> None:
+        """Shows what is indexed already, then asks the servers and rescans
+        the files modified since in the background"""
+
+        root = self.base.active_directory
+        if not root:
+            self.actionset.update([])
+            return
+
+        if os.path.abspath(root) != self.root:
+            self.read_scanned()
+        if self.stale:
+            self.fill()
+        self.master.request_workspace_symbols()
+
+        if self.indexing:
+            return
+        self.indexing = True
+        threading.Thread(target=self.index, args=(os.path.abspath(root),), daemon=True).start()
+        self.base.after(50, self.poll)
+
+    def poll(self) -> None:
+        try:
+            result = self.results.get_nowait()
+        except queue.Empty:
+            self.base.after(50, self.poll)
+            return
+
+        self.indexing = False
+        if isinstance(result, Exception):
+            self.base.logger.error(f"Indexing workspace symbols failed: {result}")
+            return
+
+        root, changed = result
+        if changed or root != self.root:
+            self.read_scanned()
+            self.fill()
+
+    def update_server(self, instance: LangServerClient, symbols: list[lsp.SymbolInformation]) -> None:
+        self.server_symbols[instance] = [
+            (os.path.abspath(decode_path_uri(i.location.uri)), i.name, i.kind,
+             i.location.range.start.line + 1, i.location.range.start.character, i.containerName or "")
+            for i in symbols or ()
+        ]
+        self.stale = True
+        self.fill()
+
+    def forget_server(self, instance: LangServerClient) -> None:
+        if self.server_symbols.pop(instance, None):
+            self.stale = True
+
+    def read_scanned(self) -> None:
+        "Reads the scanned symbols under the workspace from the database"
+
+        if not (root := self.base.active_directory):
+            return
+        self.root = os.path.abspath(root)
+
+        # everything under root + os.sep, as a range so the index is used
+        self.scanned = self.db.execute(
+            "SELECT path, name, kind, line, col, container FROM symbols WHERE path >= ? AND path < ?;",
+            (self.root + os.sep, self.root + chr(ord(os.sep) + 1)),
+        ).fetchall()
+        self.stale = True
+
+    def goto(self, row: tuple) -> None:
+        self.base.goto_location(row[3], row[4])
+
+    def fill(self) -> None:
+        """Fills the actionset with the symbols under the workspace, those of
+        language servers taking the place of scanned ones for the same files"""
+
+        if not self.root:
+            return
+
+        served = [symbol for symbols in self.server_symbols.values() for symbol in symbols
+                  if symbol[0].startswith(self.root + os.sep)]
+        served_files = {symbol[0] for symbol in served}
+
+        self.actionset.update([
+            (name, None, f"{container + '  ' if container else ''}{os.path.relpath(path, self.root)}:{line}",
+             path, f"{line}.{col}")
+            for path, name, kind, line, col, container in served + [i for i in self.scanned if i[0] not in served_files]
+        ])
+        self.stale = False
+        self.base.palette.refresh(self.actionset)
+
+    def index(self, root: str) -> None:
+        """Rescans the files under root modified since they were last scanned, runs on a worker thread"""
+
+        try:
+            db = sqlite3.connect(self.path)
+            known = dict(db.execute(
+                "SELECT path, mtime FROM files WHERE path >= ? AND path < ?;",
+                (root + os.sep, root + chr(ord(os.sep) + 1)),
+            ).fetchall())
+
+            files = dict(self.walk(root))
+            stale = [path for path, mtime in files.items() if known.get(path) != mtime]
+            removed = [(path,) for path in known.keys() - files.keys()]
+
+            if len(stale) >= POOL_THRESHOLD:
+                # forking a process that runs Tk and threads isn't safe
+                with ProcessPoolExecutor(mp_context=get_context("spawn")) as pool:
+                    scanned = list(pool.map(scan_file, stale, chunksize=16))
+            else:
+                scanned = [scan_file(path) for path in stale]
+
+            with db:
+                db.executemany("DELETE FROM symbols WHERE path = ?;", [(path,) for path in stale] + removed)
+                db.executemany("DELETE FROM files WHERE path = ?;", removed)
+                db.executemany("INSERT OR REPLACE INTO files (path, mtime) VALUES (?, ?);",
+                               [(path, files[path]) for path in stale])
+                db.executemany("INSERT INTO symbols (path, name, kind, line, col, container) VALUES (?, ?, ?, ?, ?, ?);",
+                               [(path, *symbol) for path, symbols in zip(stale, scanned) for symbol in symbols])
+            db.close()
+            self.results.put((root, bool(stale or removed)))
+        except Exception as e:
+            self.results.put(e)
+
+    def walk(self, root: str) -> typing.Iterator[tuple[str, float]]:
+        "(path, mtime) of the files that can be scanned, leaving out ignored directories"
+
+        ignore_dirs = self.base.explorer.directory.ignore_dirs
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [i for i in dirnames if i not in ignore_dirs and not i.startswith('.')]
+            for name in filenames:
+                if os.path.splitext(name)[1].lower() not in EXTENSIONS:
+                    continue
+
+                path = os.path.join(dirpath, name)
+                try:
+                    yield path, os.stat(path).st_mtime
+                except OSError:
+                    continue
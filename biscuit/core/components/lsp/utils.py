@@ -24,6 +24,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import os
 import sys
 from pathlib import Path
 from typing import Iterator, Optional
@@ -72,6 +73,9 @@ def hover_filter(content: lsp.MarkupContent | str) -> list[Optional[list[str, st
 
     return None, value
 
+def workspace_folder(path: str) -> lsp.WorkspaceFolder:
+    return lsp.WorkspaceFolder(uri=Path(path).as_uri(), name=os.path.basename(path) or path)
+
 def encode_position(pos: str | list[int]) -> lsp.Position:
     if isinstance(pos, str):
         line, column = map(int, pos.split("."))
@@ -1,41 +1,115 @@
+from __future__ import annotations
+
+import os
 import tkinter as tk
+import typing
 
-from biscuit.core.utils import Scrollbar
+from biscuit.core.utils import Label, VirtualTree
 
 from ..panelview import PanelView
 
+if typing.TYPE_CHECKING:
+    from biscuit.core.components.lsp.data import Underline
+
+# severity -> (codicon, color), as in LSP DiagnosticSeverity
+SEVERITIES = {1: ("error", "red"), 2: ("warning", "orange"), 3: ("info", "#3794ff"), 4: ("info", "gray")}
+
 
 class Problems(PanelView):
+    """
+    Diagnostics of all files, grouped by file.
+
+    Rows are drawn by a virtualized tree. Publishing diagnostics for a file only
+    replaces the rows of that file, and the rows of a file are only inserted once
+    its group is expanded.
+    """
     def __init__(self, master, *args, **kwargs) -> None:
         super().__init__(master, *args, **kwargs)
-        self.__buttons__ = (('clear-all', self.clear),)
+        self.__buttons__ = (('collapse-all', self.collapse_all), ('clear-all', self.clear),)
 
         self.rowconfigure(0, weight=1)
         self.columnconfigure(0, weight=1)
 
-        self.text = tk.Text(self, relief=tk.FLAT, padx=10, pady=10, 
-                            font=("Consolas", 11), **self.base.theme.views.panel.logs)
-        self.text.grid(row=0, column=0, sticky=tk.NSEW)
+        self.tree = VirtualTree(self, doubleclick=self.open_problem, singleclick=None, loader=self.load_group)
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
 
-        self.scrollbar = Scrollbar(self)
-        self.scrollbar.grid(sticky=tk.NSEW, row=0, column=1)
-        
-        self.text.config(yscrollcommand=self.scrollbar.set)
-        self.scrollbar.config(command=self.text.yview)
+        self.placeholder = Label(self, text="No problems detected.", anchor=tk.NW, padx=10, pady=10,
+                                 **self.base.theme.views.panel.logs)
+        self.placeholder.config(fg="gray")
 
-        self.text.tag_config("no-problems", foreground="gray")
-        self.clear()
+        # files with fewer problems than this are expanded right away
+        self.expand_limit = 50
 
-    def write(self, text) -> None:
-        self.text.config(state=tk.NORMAL)
-        self.text.delete(1.0, tk.END)
-        self.text.insert(tk.END, text)
-        self.text.see(tk.END)
-        self.text.config(state=tk.DISABLED)
+        self.problems: dict[str, list[Underline]] = {}
+        self.groups: dict[str, str] = {}
+        # problems per severity, hints are not counted
+        self.counts = {1: 0, 2: 0, 3: 0}
+        self.show_placeholder()
 
-    def clear(self, *_) -> None:
-        self.text.config(state=tk.NORMAL)
-        self.text.delete(1.0, tk.END)
-        self.text.insert(tk.END, "No problems detected.", "no-problems")
-        self.text.config(state=tk.DISABLED)
+    def update_file(self, path: str, problems: list[Underline]) -> None:
+        """Replaces the problems reported for a file, leaving other files' rows alone"""
+
+        for i in self.problems.pop(path, ()):
+            self.count(i, -1)
+
+        if not problems:
+            if group := self.groups.pop(path, None):
+                self.tree.delete(group)
+            return self.refresh()
+
+        problems = sorted(problems, key=lambda i: tuple(map(int, i.start.split('.'))))
+        self.problems[path] = problems
+        for i in problems:
+            self.count(i, 1)
+
+        detail = f"{len(problems)}  {os.path.dirname(path)}"
+        if group := self.groups.get(path):
+            self.tree.item(group, detail=detail)
+            if not self.tree.item(group, 'lazy'):
+                self.load_group(group)
+        else:
+            self.groups[path] = self.tree.insert('', text=os.path.basename(path), values=(path, 'directory'),
+                                                 icon='file', detail=detail, lazy=True)
+            if len(problems) <= self.expand_limit:
+                self.tree.open_node(self.groups[path])
 
+        self.refresh()
+
+    def count(self, problem: Underline, delta: int) -> None:
+        if problem.severity in self.counts:
+            self.counts[problem.severity] += delta
+
+    def load_group(self, group) -> None:
+        path = self.tree.item_fullpath(group)
+        self.tree.set_children(group, [
+            dict(text=i.tooltip_text, values=(path, 'problem', i.start),
+                 icon=SEVERITIES.get(i.severity, SEVERITIES[2])[0], iconcolor=SEVERITIES.get(i.severity, SEVERITIES[2])[1],
+                 detail=f"[Ln {i.start.split('.')[0]}, Col {int(i.start.split('.')[1]) + 1}]")
+            for i in self.problems.get(path, ())
+        ])
+
+    def open_problem(self, _) -> None:
+        if (node := self.tree.focus()) and self.tree.item_type(node) == 'problem':
+            path, _, position = self.tree.item(node, "values")
+            self.base.goto_location(path, position)
+
+    def show_placeholder(self) -> None:
+        if self.problems:
+            self.placeholder.place_forget()
+        else:
+            self.placeholder.place(relx=0, rely=0, relwidth=1, relheight=1)
+
+    def refresh(self) -> None:
+        self.show_placeholder()
+        self.base.statusbar.update_problems(self.counts[1], self.counts[2], self.counts[3])
+
+    def collapse_all(self, *_) -> None:
+        self.tree.collapse_all()
+
+    def clear(self, *_) -> None:
+        self.tree.clear_tree()
+        self.problems.clear()
+        self.groups.clear()
+        # problems per severity, hints are not counted
+        self.counts = {1: 0, 2: 0, 3: 0}
+        self.refresh()
@@ -1,20 +1,22 @@
 import tkinter as tk
 
-from biscuit.core.utils import Tree
+from biscuit.core.utils import VirtualTree
 
 from ..item import SidebarViewItem
 
 
 class Variables(SidebarViewItem):
     """A view that displays the local variables of the debugger.
-    Variables are populated when the debugger is running only."""
+    Variables are populated when the debugger is running only.
+    Containers are expanded lazily, their items are only read when opened."""
     
     def __init__(self, master, *args, **kwargs) -> None:
         self.title = 'Variables'
         self.__buttons__ = ()
         super().__init__(master, itembar=True, *args, **kwargs)
 
-        self.tree = Tree(self.content, *args, **kwargs)
+        self.values = {}
+        self.tree = VirtualTree(self.content, singleclick=None, loader=self.expand, *args, **kwargs)
         self.tree.grid(row=0, column=0, sticky=tk.NSEW)
         
     def show(self, frame):
@@ -25,10 +27,41 @@ class Variables(SidebarViewItem):
 
         self.clear()
         for var, val in frame.f_locals.items():
-            locals_str = f"{var}: {val}"
-            self.tree.add(text=locals_str)
+            self.add('', var, val)
+
+    def add(self, parent, name, value):
+        try:
+            text = f"{name}: {value!r}"
+        except Exception:
+            text = f"{name}: <{type(value).__name__}>"
+
+        node = self.tree.insert(parent, text=text, lazy=self.has_members(value))
+        self.values[node] = value
+
+    def members(self, value):
+        if isinstance(value, (str, bytes, int, float, complex, bool)) or value is None:
+            return ()
+        if isinstance(value, dict):
+            return value.items()
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return enumerate(value)
+        try:
+            return vars(value).items()
+        except TypeError:
+            return ()
+
+    def has_members(self, value) -> bool:
+        # enumerate() is truthy even for empty containers
+        if isinstance(value, (dict, list, tuple, set, frozenset)):
+            return len(value) > 0
+        return bool(self.members(value))
+
+    def expand(self, node):
+        for name, value in self.members(self.values[node]):
+            self.add(node, name, value)
     
     def clear(self):
         """Clear the local variables."""
         
-        self.tree.delete(*self.tree.get_children())
+        self.values.clear()
+        self.tree.clear_tree()
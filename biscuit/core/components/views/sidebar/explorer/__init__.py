@@ -28,7 +28,7 @@ class Explorer(SidebarView):
         self.directory = DirectoryTree(self, observe_changes=True)
         self.add_widget(self.directory)
 
-        self.filesearch_actionset = ActionSet("Search files", "file:", [])
+        self.filesearch_actionset = ActionSet("Search files", "file:", [], picker=self.open_file)
 
         self.newfile_actionset = ActionSet(
             "Add new file to directory", "newfile:", pinned=[["Create new file: {}", lambda filename=None: self.directory.new_file(filename)]]
@@ -52,20 +52,45 @@ class Explorer(SidebarView):
             self.open_editors.pack(fill=tk.X, before=self.directory)
         self.active_editors_visible = not self.active_editors_visible
 
-    def get_actionset(self, term: str) -> ActionSet:
+    def get_actionset(self, term: str="") -> ActionSet:
         self.filesearch_actionset.update(self.filesearch(term))
         return self.filesearch_actionset 
+
+    def get_recent_actionset(self) -> ActionSet:
+        """Files picked in the file search or opened before, under the active directory"""
+
+        root = self.base.active_directory
+        if not root:
+            return ActionSet("Search files", "file:", [], picker=self.open_file)
+
+        root = os.path.abspath(root)
+        frecency = self.base.history.get_frecency("file:")
+        paths = dict.fromkeys([*sorted(frecency, key=frecency.get, reverse=True),
+                               *map(os.path.abspath, reversed(self.base.history.file_history.stack))])
+        return ActionSet("Search files", "file:", [self.file_row(root, path) for path in paths
+                                                   if path.startswith(root + os.sep) and os.path.isfile(path)],
+                         picker=self.open_file)
+
+    def file_row(self, root: str, path: str) -> tuple:
+        "(name, None, directory relative to root, path) row of the file search"
+
+        directory = os.path.relpath(os.path.dirname(path), root)
+        return (os.path.basename(path), None, "" if directory == "." else directory, path)
+
+    def open_file(self, row: tuple) -> None:
+        self.base.open_editor(row[3])
     
     def filesearch(self, t):
         if not self.base.active_directory:
             return []
         
+        root = os.path.abspath(self.base.active_directory)
         pys = []
-        for r, d, f in os.walk(self.base.active_directory):
+        for r, d, f in os.walk(root):
             if any(i in r for i in self.directory.ignore_dirs):
                 d[:] = []
                 continue
             for file in f:
                 if t in file:
-                    pys.append((file, lambda _, path=os.path.join(r, file): self.base.open_editor(path)))
+                    pys.append(self.file_row(root, os.path.join(r, file)))
         return pys
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import typing
+
+if typing.TYPE_CHECKING:
+    from biscuit.core import App
+
+
+class ExplorerCache:
+    """Persists the explorer state of each workspace in the data directory.
+
+    Keeps the expanded directories and their last scanned listings along with the
+    directory modification times, so reopening a workspace can show the tree right
+    away and only rescan the directories that changed in the meantime.
+    """
+
+    def __init__(self, base: App) -> None:
+        self.base = base
+        self.dir = os.path.join(self.base.datadir, "explorer")
+
+    def file(self, workspace: str) -> str:
+        return os.path.join(self.dir, hashlib.sha1(workspace.encode()).hexdigest() + ".json")
+
+    def load(self, workspace: str) -> tuple[set[str], dict[str, tuple[float, list]]]:
+        """Returns the expanded directories and {path: (mtime, entries)} listings"""
+
+        try:
+            with open(self.file(workspace), encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("workspace") != workspace:
+                return set(), {}
+
+            listings = {path: (mtime, [tuple(e) for e in entries]) for path, (mtime, entries) in data["listings"].items()}
+            return set(data["expanded"]), listings
+        except (OSError, ValueError, KeyError, TypeError):
+            return set(), {}
+
+    def save(self, workspace: str, expanded: set[str], listings: dict[str, tuple[float, list]]) -> None:
+        data = {"workspace": workspace, "expanded": sorted(expanded), "listings": listings}
+        try:
+            os.makedirs(self.dir, exist_ok=True)
+            with open(self.file(workspace), "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except OSError as e:
+            self.base.logger.error(f"Saving explorer state failed: {e}")
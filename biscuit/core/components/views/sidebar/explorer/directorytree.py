@@ -1,19 +1,23 @@
+import itertools
 import os
 import platform
+import queue
 import shutil
 import subprocess
-import threading
 import tkinter as tk
+from collections import deque
 from tkinter.messagebox import askyesno
 
 import pyperclip
 
 from biscuit.core.components.floating.palette.actionset import ActionSet
-from biscuit.core.utils import Tree
+from biscuit.core.utils import VirtualTree
 
 from ..item import SidebarViewItem
+from .cache import ExplorerCache
 from .menu import ExplorerContextMenu
 from .placeholder import DirectoryTreePlaceholder
+from .scanner import DirectoryScanner
 from .watcher import DirectoryTreeWatcher
 
 
@@ -31,7 +35,8 @@ class DirectoryTree(SidebarViewItem):
         self.ignore_dir_patterns = ["*/.git/*", "*/__pycache__/*", "*/.pytest_cache/*", "*/node_modules/*", "*/debug/*", "*/dist/*", "*/build/*"]
         self.ignore_exts = [".pyc"]
 
-        self.tree = Tree(self.content, startpath, doubleclick=self.openfile, singleclick=self.preview_file, *args, **kwargs)
+        # only the visible rows are drawn, directories with 100k entries stay responsive
+        self.tree = VirtualTree(self.content, startpath, doubleclick=self.openfile, singleclick=self.preview_file, *args, **kwargs)
         self.tree.grid(row=0, column=0, sticky=tk.NSEW)
         self.tree.grid_remove()
         self.tree.bind("<<Open>>", self.toggle_node)
@@ -41,7 +46,22 @@ class DirectoryTree(SidebarViewItem):
 
         self.path = startpath
         self.watcher = DirectoryTreeWatcher(self, self.tree, observe_changes)
-        self.loading = False
+
+        # directories are scanned on a worker, nodes are inserted here in batches
+        self.scanner = DirectoryScanner(self)
+        self.generation = 0
+        self.pending = 0
+        self.polling = False
+        self.inserting = deque()
+        self.batch_size = 200
+
+        # last listings {path: (mtime, entries)} and directories to expand once inserted,
+        # persisted per workspace so reopening it shows the tree without waiting on scans
+        self.cache = ExplorerCache(self.base)
+        self.listings: dict[str, tuple[float, list]] = {}
+        self.expanded: set[str] = set()
+        # listing the children of each directory node were inserted from
+        self.shown: dict[str, list] = {}
 
         self.ctxmenu = ExplorerContextMenu(self, "ExplorerContextMenu")
         self.tree.bind('<Button-3>', self.right_click)
@@ -64,14 +84,22 @@ class DirectoryTree(SidebarViewItem):
         """Changes the current directory and updates the treeview.
         Main interface for changing the current directory and updating the treeview."""
 
+        self.save_state()
+
+        # results of scans from the previous directory are dropped
+        self.generation += 1
+        self.inserting.clear()
+
         self.nodes.clear()
+        self.shown.clear()
         self.path = os.path.abspath(path) if path else path
         self.nodes[self.path] = ''
         if self.path:
+            self.expanded, self.listings = self.cache.load(self.path)
             self.placeholder.grid_remove()
             self.tree.grid()
             self.tree.clear_tree()
-            self.create_root(self.path, subdir=False)
+            self.load_directory(self.path)
             self.watcher.watch()
 
             self.set_title(os.path.basename(self.path))
@@ -80,28 +108,143 @@ class DirectoryTree(SidebarViewItem):
             self.placeholder.grid()
             self.set_title('No folder opened')
 
-    def create_root(self, path: str, parent='', subdir=True) -> None:
-        """Creates the root node of the treeview."""
+    def create_root(self, path: str) -> None:
+        """Queues the directory to be (re)loaded into the treeview.
+        The children of its node are replaced once the directory is scanned."""
 
-        if self.loading:
+        # directories that aren't in the tree yet are loaded when their parent is
+        if not path or (path := os.path.abspath(path)) not in self.nodes:
             return
 
-        self.loading = True
-        t = threading.Thread(target=self.run_create_sub_root if subdir else self.run_create_root, args=(path, parent))
-        t.daemon = True
-        t.start()
+        self.request_scan(path)
+
+    def load_directory(self, path: str) -> None:
+        """Shows the cached listing of the directory right away if there is one,
+        it is only rescanned (in the background) if it changed since. Children
+        already inserted from that listing are kept as they are."""
+
+        if path not in self.listings:
+            return self.request_scan(path)
+
+        mtime, entries = self.listings[path]
+        if self.shown.get(path) is not entries:
+            self.inserting.append([path, entries, iter(entries), False])
+        self.request_scan(path, mtime)
+
+    def request_scan(self, path: str, mtime: float=None) -> None:
+        if self.scanner.request(path, self.generation, mtime):
+            self.pending += 1
+
+        if not self.polling and (self.pending or self.inserting):
+            self.polling = True
+            self.after(10, self.process_scans)
+
+    def process_scans(self) -> None:
+        """Inserts the scanned entries into the treeview, at most `batch_size` per tick
+        so that huge directories don't freeze the UI."""
+
+        while True:
+            try:
+                path, generation, mtime, entries = self.scanner.results.get_nowait()
+            except queue.Empty:
+                break
+
+            self.pending -= 1
+            if generation != self.generation:
+                continue
+
+            if mtime is None:
+                self.remove_directory(path)
+            elif entries is not None:
+                self.listings[path] = (mtime, entries)
+                # [path, entries, remaining entries, whether the old children were cleared]
+                self.inserting.append([path, entries, iter(entries), False])
+
+        budget = self.batch_size
+        while self.inserting and budget:
+            job = self.inserting[0]
+            path, listing, entries, started = job
+
+            node = self.nodes.get(path)
+            if node is None or (node and not self.tree.exists(node)):
+                # node was removed before its contents arrived
+                self.inserting.popleft()
+                continue
+
+            if not started:
+                # directories expanded now stay expanded after the reload
+                for child in self.tree.get_children(node):
+                    if self.tree.item_type(child) == 'directory' and self.tree.is_open(child):
+                        self.expanded.add(self.tree.item_fullpath(child))
+
+                self.tree.clear_node(node)
+                self.shown[path] = listing
+                job[3] = True
+
+            inserted = 0
+            for name, fullpath, is_dir in itertools.islice(entries, budget):
+                self.insert_entry(node, name, fullpath, is_dir)
+                inserted += 1
+
+            if inserted < budget:
+                self.inserting.popleft()
+            budget -= inserted
+
+        if self.inserting:
+            self.after_idle(self.process_scans)
+        elif self.pending:
+            self.after(10, self.process_scans)
+        else:
+            self.polling = False
+
+    def remove_directory(self, path: str) -> None:
+        """Drops a directory that is gone, along with everything known under it."""
+
+        prefix = path + os.sep
+        for known in [i for i in self.nodes if i == path or i.startswith(prefix)]:
+            if known == self.path:
+                # the root stays, it is replaced when the workspace changes
+                continue
+            if (node := self.nodes.pop(known)) and self.tree.exists(node):
+                self.tree.delete(node)
+        for known in [i for i in self.listings if i == path or i.startswith(prefix)]:
+            self.listings.pop(known)
+            self.shown.pop(known, None)
+        self.expanded.difference_update([i for i in self.expanded if i == path or i.startswith(prefix)])
+
+    def insert_entry(self, parent: str, name: str, path: str, is_dir: bool) -> None:
+        """Inserts a single scanned entry under the parent node."""
+
+        if is_dir:
+            # a fresh node, nothing is inserted under it yet
+            self.shown.pop(path, None)
+            expand = path in self.expanded
+            # contents are loaded when it is expanded (<<Open>>)
+            node = self.tree.insert(parent, "end", text=name, values=[path, 'directory'], image='foldericon',
+                                    open=expand, lazy=not expand)
+            if expand:
+                self.expanded.discard(path)
+                self.nodes[path] = node
+                self.load_directory(path)
+        else:
+            #TODO check filetype and get matching icon, cases
+            node = self.tree.insert(parent, "end", text=name, values=[path, 'file'], image='document')
 
-    def run_create_root(self, path: str, parent='') -> None:
-        """Updates the treeview with the contents of the given directory."""
+        self.nodes[path] = node
 
-        self.update_treeview(path, parent)
-        self.loading = False
-    
-    def run_create_sub_root(self, path: str, parent='') -> None:
-        """Updates the treeview with the contents of the given directory."""
+    def save_state(self) -> None:
+        """Persists the expanded directories of the workspace and their listings."""
+
+        if not self.path:
+            return
+
+        expanded = set(self.expanded)
+        for path, node in self.nodes.items():
+            if node and self.tree.exists(node) and self.tree.is_open(node):
+                expanded.add(path)
 
-        self.update_treeview(path, parent)
-        self.loading = False
+        listings = {path: self.listings[path] for path in expanded | {self.path} if path in self.listings}
+        self.cache.save(self.path, expanded, listings)
 
     def get_all_files(self) -> list:
         """Returns a list of all files in the treeview."""
@@ -113,58 +256,14 @@ class DirectoryTree(SidebarViewItem):
 
         return files
 
-    def scandir(self, path) -> list:
-        """Returns a list of entries in the given directory.
-        Heloper function for updating the treeview."""
-
-        entries = []
-        for entry in os.scandir(path):
-            entries.append((entry.name, os.path.join(self.path, entry.path)))
-        return entries
-
     def update_path(self, path) -> None:
         """Updates the treeview with the contents of the given directory."""
 
         if not path or any(path.endswith(i) for i in self.ignore_dirs):
             return
 
-        node = self.nodes.get(os.path.abspath(path)) 
-        for i in self.tree.get_children(node):
-            self.tree.delete(i)
-
-        self.create_root(path, node)
-
-    def update_treeview(self, parent_path, parent="") -> None:
-        """Updates the treeview with the contents of the given directory."""
-
-        if not os.path.exists(parent_path):
-            return
-
-        entries = self.scandir(parent_path)
-        # sort: directories first, then files (alphabetic order)
-        entries.sort(key=lambda x: (not os.path.isdir(x[1]), x[0]))
-
-        try:
-            for name, path in entries:
-                if os.path.isdir(path):
-                    if name in self.ignore_dirs:
-                        continue
-
-                    node = self.tree.insert(parent, "end", text=f"  {name}", values=[path, 'directory'], image='foldericon', open=False)
-                    self.nodes[os.path.abspath(path)] = node
-                    self.tree.insert(node, "end", text="loading...")
-
-                    # recursive mode loading (not good for large projects)
-                    #self.update_treeview(path, node)
-                else:
-                    if name.split(".")[-1] in self.ignore_exts:
-                        continue
-
-                    #TODO check filetype and get matching icon, cases
-                    node = self.tree.insert(parent, "end", text=f"  {name}", values=[path, 'file'], image='document')
-                    self.nodes[os.path.abspath(path)] = node
-        except Exception as e:
-            self.base.logger.error(f"Error updating treeview: {e}")
+        # children are replaced once the new contents are scanned
+        self.create_root(path)
 
     def selected_directory(self) -> str:
         """Returns the selected directory path, or the current path if no directory is selected."""
@@ -188,7 +287,7 @@ class DirectoryTree(SidebarViewItem):
         
         with open(path, 'w+') as f:
             f.write("")
-        self.create_root(parent, self.nodes[parent])
+        self.create_root(parent)
 
     def new_folder(self, foldername) -> None:
         """Creates a new folder in the selected directory."""
@@ -204,7 +303,7 @@ class DirectoryTree(SidebarViewItem):
             self.base.logger.error(f"Creating folder failed: no permission to write ('{path}')")
             self.base.notifications.error("Creating folder failed: see logs")
             return
-        self.create_root(parent, self.nodes[parent])
+        self.create_root(parent)
 
     def copy_path(self, *_) -> None:
         """Copies the absolute path of the selected item to the clipboard."""
@@ -287,8 +386,7 @@ class DirectoryTree(SidebarViewItem):
     def collapse_all(self, *_) -> None:
         """Collapses all nodes in the treeview."""
 
-        for node in self.tree.get_children(''):
-            self.tree.item(node, open=False)
+        self.tree.collapse_all()
 
     def refresh_selected_parent(self, *_) -> None:
         """Reloads entire parent node of the selected node."""
@@ -308,11 +406,8 @@ class DirectoryTree(SidebarViewItem):
     def toggle_node(self, *_) -> None:
         """Toggles the selected node, if it's a directory."""
 
-        node = self.tree.focus()
-        for i in self.tree.get_children(node):
-            self.tree.delete(i)
-
-        self.create_root(self.tree.selected_path(), node)
+        if (path := self.tree.selected_path()) and os.path.abspath(path) in self.nodes:
+            self.load_directory(os.path.abspath(path))
 
     def openfile(self, _) -> None:
         """Opens the selected file in an editor."""
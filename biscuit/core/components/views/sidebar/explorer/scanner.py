@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import typing
+
+if typing.TYPE_CHECKING:
+    from .directorytree import DirectoryTree
+
+
+class DirectoryScanner:
+    """Scans directories for the explorer on a worker thread.
+
+    Requests are queued per directory, so asking for several directories in a row
+    doesn't drop any of them, while a directory that is already waiting to be scanned
+    is not queued twice. Results are only ever handed to the UI through the `results`
+    queue, the worker never touches Tk.
+
+    A request can carry the modification time of a cached listing of the directory,
+    the directory is then only rescanned if it changed since.
+    """
+
+    def __init__(self, master: DirectoryTree) -> None:
+        self.master = master
+
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+
+        self.lock = threading.Lock()
+        self.queued: set[tuple[str, int]] = set()
+        self.thread: threading.Thread = None
+
+    def request(self, path: str, generation: int, mtime: float=None) -> bool:
+        """Queues the directory for scanning, returns False if it is already queued"""
+
+        with self.lock:
+            if (path, generation) in self.queued:
+                return False
+            self.queued.add((path, generation))
+
+        self.requests.put((path, generation, mtime))
+        if not self.thread:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+        return True
+
+    def run(self) -> None:
+        while True:
+            path, generation, cached_mtime = self.requests.get()
+            with self.lock:
+                # changes from here on need a fresh scan
+                self.queued.discard((path, generation))
+
+            # (path, generation, mtime, entries), entries are None if the directory
+            # is unchanged since the cached listing or can't be read (mtime None)
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                self.results.put((path, generation, None, None))
+                continue
+
+            entries = None if mtime == cached_mtime else self.scan(path)
+            self.results.put((path, generation, mtime, entries))
+
+    def scan(self, path: str) -> list[tuple[str, str, bool]] | None:
+        """Returns the (name, path, is_dir) of entries in the directory, directories
+        first, ignored directories and extensions left out. None if it can't be read."""
+
+        entries = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+
+                    if is_dir:
+                        if entry.name in self.master.ignore_dirs:
+                            continue
+                    elif os.path.splitext(entry.name)[1] in self.master.ignore_exts:
+                        continue
+
+                    entries.append((entry.name, os.path.abspath(entry.path), is_dir))
+        except OSError:
+            return None
+
+        entries.sort(key=lambda x: (not x[2], x[0]))
+        return entries
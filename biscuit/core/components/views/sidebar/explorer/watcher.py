@@ -6,6 +6,8 @@ if typing.TYPE_CHECKING:
     from .directorytree import DirectoryTree
 
 import os
+import queue
+import time
 
 import watchdog.events
 from watchdog.events import PatternMatchingEventHandler
@@ -13,45 +15,104 @@ from watchdog.observers import Observer
 
 
 class DirectoryTreeWatcher(PatternMatchingEventHandler):
-    def __init__(self, master: DirectoryTree, tree, observe_changes) -> None:
+    """Watches the opened directory for changes.
+
+    Events arrive on the watchdog thread and are only queued there, the watchdog thread
+    never touches tk. The UI thread drains the queue every `debounce` seconds and once
+    things have been quiet for `debounce` seconds (or at most every `max_delay` seconds
+    during a long burst like a checkout or npm install), refreshes every changed
+    directory once and invalidates the git status once per batch.
+    """
+
+    def __init__(self, master: DirectoryTree, tree, observe_changes, debounce=0.15, max_delay=1.0) -> None:
         self.master = master
         self.base = master.base
         self.tree = tree
         self.observe_changes = observe_changes
+        self.debounce = debounce
+        self.max_delay = max_delay
 
         super().__init__(ignore_patterns=self.master.ignore_dir_patterns)
-        
+
+        # (time, changed directories, git status dirty) per event, from the watchdog thread
+        self.events: queue.Queue[tuple[float, tuple[str, ...], bool]] = queue.Queue()
+        self.changed: set[str] = set()
+        self.git_dirty = False
+        self.first_event = self.last_event = 0.0
+        self.polling = None
+
         self.observer = Observer()
         self.observer.start()
 
     def watch(self) -> None:
         self.observer.unschedule_all()
+        self.drain()
+        self.changed.clear()
+        self.git_dirty = False
+
         if self.master.path and self.observe_changes:
             self.observer.schedule(self, self.master.path, recursive=True)
+            if not self.polling:
+                self.polling = self.master.after(int(self.debounce * 1000), self.poll)
 
     def stop_watch(self) -> None:
         self.observer.stop()
+        if self.polling:
+            self.master.after_cancel(self.polling)
+            self.polling = None
+
+    def queue(self, *paths: str, git=True) -> None:
+        """Records changed directories, called from the watchdog thread"""
+
+        self.events.put((time.monotonic(), paths, git))
+
+    def drain(self) -> None:
+        "Collects the events queued since the last poll"
+
+        while True:
+            try:
+                when, paths, git = self.events.get_nowait()
+            except queue.Empty:
+                return
+
+            if not (self.changed or self.git_dirty):
+                self.first_event = when
+            self.last_event = when
+            self.changed.update(paths)
+            self.git_dirty |= git
+
+    def poll(self) -> None:
+        self.polling = self.master.after(int(self.debounce * 1000), self.poll)
+        self.drain()
+        if not (self.changed or self.git_dirty):
+            return
+
+        # quiet for `debounce` seconds, or the burst has gone on for `max_delay`
+        if time.monotonic() >= min(self.last_event + self.debounce, self.first_event + self.max_delay):
+            self.flush()
+
+    def flush(self) -> None:
+        """Hands the collected changes to the explorer and source control, on the UI thread"""
+
+        changed, self.changed = self.changed, set()
+        git_dirty, self.git_dirty = self.git_dirty, False
+
+        for path in changed:
+            self.master.update_path(path)
+
+        if git_dirty:
+            self.base.source_control.reload_tree()
 
     def on_created(self, event) -> None:
-        self.master.update_path(os.path.dirname(event.src_path))
-        self.base.source_control.reload_tree()
-        print('created', event.src_path)
+        self.queue(os.path.dirname(event.src_path))
 
     def on_deleted(self, event) -> None:
-        self.master.update_path(os.path.dirname(event.src_path))
-        self.base.source_control.reload_tree()
-        print('deleted', event.src_path)
+        self.queue(os.path.dirname(event.src_path))
 
     def on_modified(self, event) -> None:
-        # self.master.update_path(os.path.dirname(event.src_path))
-        # self.base.source_control.reload_tree()
-        # print('modified', event.src_path)
-        ...
+        # contents changed, the tree stays the same but git status may not
+        if not event.is_directory:
+            self.queue(git=True)
 
     def on_moved(self, event):
-        try:
-            self.master.update_path(os.path.dirname(event.src_path))
-            self.base.source_control.reload_tree()
-            print('moved', event.src_path, event.dest_path)
-        except FileNotFoundError:
-            pass
+        self.queue(os.path.dirname(event.src_path), os.path.dirname(event.dest_path))
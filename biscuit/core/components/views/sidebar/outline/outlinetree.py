@@ -6,7 +6,6 @@ from tkinter import ttk
 
 import tarts as lsp
 
-from biscuit.core.components.floating.palette.actionset import ActionSet
 from biscuit.core.utils import Frame
 
 from .placeholder import OutlineTreePlaceholder
@@ -23,8 +22,6 @@ class OutlineTree(Frame):
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
 
-        self.actionset = ActionSet("Goto symbol in Editor", "@", [])
-
         # self.tree = ttk.Treeview(self, show="tree", columns=("kind", "pos"), displaycolumns='', 
         #                          selectmode=tk.BROWSE, *args, **kwargs)
         self.tree = Tree(self)
@@ -38,16 +35,19 @@ class OutlineTree(Frame):
         self.tree.config(yscrollcommand=self.scrollbar.set)
         self.scrollbar.config(command=self.tree.yview)
 
+        # tab whose symbols are shown
+        self.tab: Text = None
+
         self.placeholder = OutlineTreePlaceholder(self)
         self.placeholder.grid(row=0, column=0, sticky=tk.NSEW)
-
-        self.bind("<Double-Button-1>", self.goto_symbol)
     
     def clear(self) -> None:
-        # self.tree.delete(*self.tree.get_children())
-        self.tree.delete('1.0', tk.END)
+        self.tree.config(state=tk.NORMAL)
+        self.tree.clear()
+        self.tree.config(state=tk.DISABLED)
 
     def update_symbols(self, tab: Text=None, response: list[lsp.DocumentSymbol]=None) -> None:
+        self.tab = tab
         if not response:
             self.placeholder.show(tab)
             self.tree.grid_remove()
@@ -58,26 +58,11 @@ class OutlineTree(Frame):
         self.tree.grid()
         self.scrollbar.grid()
 
+        # only the rows of changed symbols are rewritten
         self.tree.config(state=tk.NORMAL)
-        self.clear()
         self.tree.add_items(response)
         self.tree.config(state=tk.DISABLED)
     
-    def add_items(self, parent: str, items: list[lsp.DocumentSymbol]) -> None:
-        if not items:
-            return
-        
-        for item in items:
-            if item.kind == lsp.SymbolKind.MODULE:
-                continue
-            id = self.tree.insert(parent, 'end', text=item.name, values=(item.range.start), open=True)
-            self.add_items(id, item.children)
-
     def collapse_all(self, *_) -> None:
         for node in self.tree.get_children(''):
             self.tree.item(node, open=False)
-            
-    def goto_symbol(self, _: str) -> None:
-        item = self.tree.item(self.tree.focus())
-        if item:
-            self.base.goto_location_in_active_editor(item.values[1])
@@ -1,4 +1,6 @@
 import tkinter as tk
+import typing
+from difflib import SequenceMatcher
 
 import tarts as lsp
 
@@ -8,46 +10,78 @@ from biscuit.core.utils import Text, get_codicon
 from .kinds import kinds
 
 
+class Row(typing.NamedTuple):
+    level: int
+    kind: int
+    name: str
+    position: str
+
+
+def flatten(items: list[lsp.DocumentSymbol], level=0) -> typing.Iterator[Row]:
+    """Symbols in the order they are shown, one row per line"""
+
+    for item in items or ():
+        if item.kind == lsp.SymbolKind.MODULE:
+            continue
+
+        yield Row(level, item.kind, item.name, decode_position(item.range.start))
+        yield from flatten(item.children, level + 1)
+
+
 class Tree(Text):
+    """Outline drawn as lines of text.
+
+    Updates are diffed against the shown rows, so only the lines of symbols that were
+    added, removed or renamed are rewritten. Clicks are bound once and look the symbol
+    up by line, positions are updated on every update without touching the text."""
+
     def __init__(self, master):
         super().__init__(master, wrap="none", borderwidth=0, highlightthickness=0)
         self.master = master
         self.base = master.base
         self.config(cursor= "hand2", **self.base.theme.views.sidebar.item.content, font=("Segoi UI", 10), padx=10, pady=10, spacing1=0, spacing2=0, spacing3=0)
-        
+
         for kind in kinds:
             if kind[1]:
                 self.tag_config(kind[0], foreground=kind[1])
             self.tag_config(kind[0], font="codicon 12")
         self.tag_config("line", foreground=self.base.theme.border, font=("Segoi UI", 15))
 
-        # self.bind("<Button-1>", self.onclick)
-        # self.bind("<Enter>", self.hoverin)
-        # self.bind("<Leave>", self.hoverout)
-    
-    # def hoverin(self, _: tk.Event) -> None:
-    #     self.tag_config("line", foreground=self.base.theme.border)
-    
-    # def hoverout(self, _: tk.Event) -> None:
-    #     self.tag_config("line", foreground=self.base.theme.views.sidebar.item.content.background)
-    
-    def add_items(self, items: list[lsp.DocumentSymbol], level=0) -> None:
-        if not items:
-            return
-        
-        for item in items:
-            if item.kind == lsp.SymbolKind.MODULE:
+        self.rows: list[Row] = []
+        self.bind("<Button-1>", self.onclick)
+
+    def add_items(self, items: list[lsp.DocumentSymbol]) -> None:
+        rows = list(flatten(items))
+
+        old = [row[:3] for row in self.rows]
+        new = [row[:3] for row in rows]
+        opcodes = SequenceMatcher(None, old, new, autojunk=False).get_opcodes()
+
+        # bottom up, so the line numbers of the ranges above stay valid
+        for op, i1, i2, j1, j2 in reversed(opcodes):
+            if op == 'equal':
                 continue
 
-            tag = f"{item.name}{item.kind}"
-            self.insert(tk.END, "┊" * level, "line")
-            self.insert(tk.END, get_codicon(kinds[item.kind - 1][0]), kinds[item.kind - 1][0])
-            self.insert(tk.END, f" {item.name}\n", tag)
-            self.add_items(item.children, level + 1)
-            self.tag_bind(tag, "<Button-1>", lambda e, i=item: self.base.goto_location_in_active_editor(decode_position(i.range.start)))
-    
-    # def onclick(self, event: tk.Event) -> None:
-    #     self.config(state=tk.NORMAL)
-    #     index = self.index(f"@{event.x},{event.y}")
-    #     self.tag_add(tk.SEL, f'{index} linestart', f'{index} lineend+1c')
-    #     self.config(state=tk.DISABLED)
\ No newline at end of file
+            self.delete(f"{i1 + 1}.0", f"{i2 + 1}.0")
+            if j1 < j2:
+                self.insert(f"{i1 + 1}.0", *self.render(rows[j1:j2]))
+
+        self.rows = rows
+
+    def render(self, rows: list[Row]) -> list[str]:
+        "Arguments for a single insert call: text and tags of every part of the rows"
+
+        args = []
+        for row in rows:
+            icon = kinds[row.kind - 1][0]
+            args += ["┊" * row.level, "line", get_codicon(icon), icon, f" {row.name}\n", ()]
+        return args
+
+    def clear(self) -> None:
+        self.delete('1.0', tk.END)
+        self.rows = []
+
+    def onclick(self, event: tk.Event) -> None:
+        line = int(self.index(f"@{event.x},{event.y}").split('.')[0])
+        if 0 < line <= len(self.rows):
+            self.base.goto_location_in_active_editor(self.rows[line - 1].position)
@@ -5,7 +5,7 @@ import re
 import tkinter as tk
 from tkinter.messagebox import askyesno
 
-from biscuit.core.utils import Frame, Label, Tree
+from biscuit.core.utils import Frame, Label, VirtualTree
 
 
 class Results(Frame):
@@ -15,7 +15,7 @@ class Results(Frame):
         self.label = Label(self, text="Search")
         self.label.pack(fill=tk.X)
 
-        self.treeview = Tree(self)
+        self.treeview = VirtualTree(self, doubleclick=self.click, singleclick=None)
         self.treeview.pack(fill=tk.BOTH, expand=True)
 
         self.ignore_folders = [
@@ -33,10 +33,10 @@ class Results(Frame):
         self.replacing = False
         self.r_matchcase = False
 
-    def add_item(self, parent: str, index: str, text: str, open=False) -> str:
+    def add_item(self, parent: str, index: str, text: str, open=False, values=()) -> str:
         "Add an item to the tree for the search"
         try:
-            result = self.treeview.insert(parent=parent, index=index, text=text, open=open)
+            result = self.treeview.insert(parent=parent, index=index, text=text, open=open, values=values)
             return result
 
         except Exception as e:
@@ -44,7 +44,7 @@ class Results(Frame):
 
     def clear_tree(self) -> None:
         "Clear all items from the tree"
-        self.treeview.delete(*self.treeview.get_children())
+        self.treeview.clear_tree()
 
     def delete_item(self, item: str) -> None:
         "Remove an item from the tree"
@@ -57,9 +57,10 @@ class Results(Frame):
         item = self.treeview.focus()
 
         try: # Click on child item
-            self.base.goto_location(self.treeview.item(item)["tags"][0], str(float(self.treeview.item(item)["tags"][1])))
+            file_path, line_number = self.treeview.item(item, "values")
+            self.base.goto_location(file_path, str(float(line_number)))
 
-        except IndexError: # Click on parent item
+        except (KeyError, ValueError): # Click on parent item
             print("You clicked on a parent item")
 
     def search_casesensitive(self, _) -> None:
@@ -190,10 +191,8 @@ class Results(Frame):
                                    text=f"{os.path.basename(file_path)} | {file_path}")
 
             for line_number, line in result_lines:
-                child_elm = self.add_item(parent=parent, index=tk.END, 
-                                          text=f"line {line_number}: {line}")
-                self.treeview.item(child_elm, tags=(file_path, line_number))
-                self.treeview.bind("<Double-1>", self.click)
+                self.add_item(parent=parent, index=tk.END, text=f"line {line_number}: {line}",
+                              values=(file_path, line_number))
 
                 self.results.append({
                     "file_path": file_path,
@@ -13,12 +13,14 @@ class SourceControl(SidebarView):
 
         self.tree = Git(self)
         self.add_widget(self.tree)
-        self.bind('<Visibility>', self.reload_tree)
+        # showing the view only rereads the status if the index or HEAD changed
+        self.bind('<Visibility>', lambda _: self.tree.open_repo(invalidate=False))
 
         self.menu = SourceControlMenu(self, 'files')
         self.menu.add_checkable("Show Staged", self.tree.toggle_staged, checked=True)
         self.menu.add_separator(10)
         self.menu.add_checkable("Show Changes", self.tree.toggle_changes, checked=True)
+        self.menu.add_checkable("Show History", self.tree.toggle_history, checked=True)
         self.add_button('refresh', self.refresh)
         self.add_button('ellipsis', self.menu.show)
     
@@ -1,57 +1,176 @@
+import os
 import tkinter as tk
+from tkinter.messagebox import askyesno
+
+from biscuit.core.utils import VirtualTree
 
 from ..item import SidebarViewItem
-from .item import ChangeItem
+
+KINDS = [("D", "Deleted", "red"), ("A", "Added", "green"), ("M", "Modified", "orange"), ("U", "Untracked", "green")]
 
 
 class Changes(SidebarViewItem):
+    """
+    Changes tree, files grouped by directory.
+    Kinds:
+        0 - deleted
+        1 - added
+        2 - modified
+        3 - untracked
+
+    Rows are drawn by a virtualized tree, and updates only touch the rows of the
+    files that were added, removed or changed kind. Files of a directory group are
+    only inserted once the group is expanded.
+    """
+    title = "Changes"
+
     def __init__(self, master, *args, **kwargs) -> None:
-        self.__buttons__ = (('discard', self.git_discard_all), ('add', self.git_add_all))
-        self.title = "Changes"
+        self.__buttons__ = self.get_buttons()
         super().__init__(master, *args, **kwargs)
         self.config(**self.base.theme.views.sidebar.item)
-        self.items = {}
+
+        self.tree = VirtualTree(self.content, doubleclick=self.open_diff, singleclick=None,
+                                loader=self.load_group, actions=self.get_actions())
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+
+        # groups holding fewer changes than this are expanded right away
+        self.expand_limit = 50
+
+        self.items: dict[str, int] = {}
+        self.groups: dict[str, str] = {}
+        self.counts: dict[str, int] = {}
+        self.nodes: dict[str, str] = {}
+
+    def get_buttons(self) -> tuple:
+        return (('discard', self.git_discard_all), ('add', self.git_add_all))
+
+    def get_actions(self) -> list:
+        return [('discard', self.git_discard), ('add', self.git_add)]
 
     def refresh(self) -> None:
         if not self.items:
             self.itembar.hide_content()
         else:
             self.itembar.show_content()
-        # self.update()
 
     def clear_tree(self, *_) -> None:
-        for item, _ in self.items.values():
-            try:
-                item.pack_forget()
-                item.destroy()
-            except:
-                pass
-
+        self.tree.clear_tree()
         self.items.clear()
+        self.groups.clear()
+        self.counts.clear()
+        self.nodes.clear()
+
+    def update_items(self, changed: dict, removed: set) -> None:
+        for path in removed:
+            self.remove_item(path)
+        for path, kind in changed.items():
+            self.add_item(path, kind)
+
+        self.refresh()
+
+    def group_of(self, path) -> str:
+        """Node the file row goes under, '' for files at the root of the repository"""
+
+        directory = os.path.dirname(path)
+        if not directory:
+            return ''
 
-    def clear(self, otherthan: list=[]) -> None:
-        if not otherthan:
-            return self.clear_tree()
-        
-        for path, val in list(self.items.items()):
-            if (path, val[1]) not in otherthan:
-                self.items[path][0].destroy()
-                del self.items[path]
+        if directory not in self.groups:
+            self.groups[directory] = self.tree.insert('', text=directory, values=(directory, 'directory'),
+                                                      icon='folder', lazy=True)
+            if len(self.items) <= self.expand_limit:
+                self.tree.open_node(self.groups[directory])
+
+        return self.groups[directory]
 
     def add_item(self, path, kind) -> None:
-        if path in self.items and self.items[path][1] == kind:
+        if self.items.get(path) == kind:
+            return
+
+        if node := self.nodes.get(path):
+            # same file, only its kind changed
+            self.items[path] = kind
+            self.tree.item(node, detail=KINDS[kind][0], detailcolor=KINDS[kind][2])
             return
 
-        new_item = ChangeItem(self.content, path, kind)
-        new_item.master = self
-        new_item.pack(fill=tk.X)
-        self.items[path] = (new_item, kind)
+        directory = os.path.dirname(path)
+        if path not in self.items:
+            self.counts[directory] = self.counts.get(directory, 0) + 1
+        self.items[path] = kind
+
+        group = self.group_of(path)
+        if path in self.nodes or group and self.tree.item(group, 'lazy'):
+            # inserted by expanding the group, or picked up when it is expanded
+            return
+
+        self.insert_row(group, path, kind)
+
+    def insert_row(self, group, path, kind) -> None:
+        self.nodes[path] = self.tree.insert(group, text=os.path.basename(path), values=(path, 'file'),
+                                            icon='file', detail=KINDS[kind][0], detailcolor=KINDS[kind][2])
+
+    def remove_item(self, path) -> None:
+        if self.items.pop(path, None) is None:
+            return
+
+        if node := self.nodes.pop(path, None):
+            self.tree.delete(node)
+
+        directory = os.path.dirname(path)
+        self.counts[directory] -= 1
+        if not self.counts[directory]:
+            del self.counts[directory]
+            if directory:
+                self.tree.delete(self.groups.pop(directory))
+
+    def load_group(self, group) -> None:
+        directory = self.tree.item_fullpath(group)
+        for path, kind in self.items.items():
+            if os.path.dirname(path) == directory and path not in self.nodes:
+                self.insert_row(group, path, kind)
+
+    def paths(self, node) -> list:
+        """Files of the row, all files of the directory for group rows"""
+
+        path = self.tree.item_fullpath(node)
+        if self.tree.item_type(node) == 'file':
+            return [path]
+        return [i for i in self.items if os.path.dirname(i) == path]
+
+    def open_diff(self, _) -> None:
+        if (node := self.tree.focus()) and self.tree.item_type(node) == 'file':
+            path = self.tree.item_fullpath(node)
+            self.base.open_diff(path, self.items[path])
+
+    def git_add(self, node) -> None:
+        if paths := self.paths(node):
+            self.base.git.repo.stage_files(*[(path, self.items[path]) for path in paths])
+            self.master.master.open_repo()
+
+    def git_discard(self, node) -> None:
+        if paths := self.paths(node):
+            self.discard(paths)
 
     def git_add_all(self, *_) -> None:
-        if unstaged := [(path, item[1]) for path, item in self.items.items()]:
+        if unstaged := list(self.items.items()):
             self.base.git.repo.stage_files(*unstaged)
-            self.master.open_repo()
+            self.master.master.open_repo()
 
     def git_discard_all(self, *_) -> None:
-        self.base.git.repo.discard_changes(self.path)
+        if paths := list(self.items):
+            self.discard(paths)
+
+    def discard(self, paths) -> None:
+        """Restores the tracked files, untracked ones are deleted only once confirmed"""
+
+        tracked = [path for path in paths if self.items[path] != 3]
+        untracked = [path for path in paths if self.items[path] == 3]
+        if untracked and not askyesno(
+                "Discard Changes", f"Delete {len(untracked)} untracked file(s)? This cannot be undone."):
+            untracked = []
+
+        if not (tracked or untracked):
+            return
+        self.base.git.repo.discard_changes(*tracked)
+        self.base.git.repo.delete_untracked(*untracked)
         self.master.master.open_repo()
@@ -2,9 +2,9 @@ import tkinter as tk
 
 from biscuit.core.utils import Button, Entry, Frame, IconButton
 from biscuit.core.utils.iconlabelbutton import IconLabelButton
-from biscuit.core.utils.scrollableframe import ScrollableFrame
 
 from .changes import Changes
+from .history import History
 from .placeholder import ChangesTreePlaceholder
 from .stagedchanges import StagedChanges
 
@@ -27,83 +27,54 @@ class Git(Frame):
         # self.more.config(**self.base.theme.utils.button)
         # self.more.pack(fill=tk.BOTH)
 
-        self.container = ScrollableFrame(self, **self.base.theme.views.sidebar.item)
-        self.container.canvas.config(**self.base.theme.views.sidebar.item)
+        # the change lists scroll on their own, only visible rows are drawn
+        self.container = Frame(self, **self.base.theme.views.sidebar.item)
 
         self.staged_changes_tree = StagedChanges(self.container, *args, **kwargs)
-        self.container.add(self.staged_changes_tree, fill=tk.BOTH, expand=True)
+        self.staged_changes_tree.pack(fill=tk.BOTH, expand=True)
         self.changes_tree = Changes(self.container, *args, **kwargs)
-        self.container.add(self.changes_tree, fill=tk.BOTH, expand=True)
+        self.changes_tree.pack(fill=tk.BOTH, expand=True)
+        self.history = History(self.container, *args, **kwargs)
+        self.history.pack(fill=tk.BOTH, expand=True)
 
         self.placeholder = ChangesTreePlaceholder(self)
         self.placeholder.pack(fill=tk.BOTH, expand=True)
 
-    def add_staged_changes(self, changed_files=(), kind=0) -> None:
-        for file in changed_files:
-            self.staged_changes_tree.add_item(file, kind)
+    def update_changes(self, staged, unstaged) -> None:
+        """Applies the changes since the last git status, called on the UI thread.
+        Both are ({path: kind} added or changed kind, {paths} removed)."""
 
-        self.staged_changes_tree.refresh()
+        self.staged_changes_tree.update_items(*staged)
+        self.changes_tree.update_items(*unstaged)
 
-    def add_changes(self, changed_files=(), kind=0) -> None:
-        for file in changed_files:
-            self.changes_tree.add_item(file, kind)
-
-        self.changes_tree.refresh()
-
-    def open_repo(self) -> None:
-        # self.staged_changes_tree.clear_tree()
-        # self.changes_tree.clear_tree()
-        # self.set_title(f"{os.path.basename(self.base.active_directory)}({self.base.git.active_branch})")
+    def open_repo(self, invalidate=True) -> None:
+        """Rereads the git status in the background, the working tree is considered
+        changed unless `invalidate` is False."""
 
         if not self.base.git.repo:
             return
-        
-        staged = []
-
-        if deleted := self.base.git.repo.get_staged_deleted_files():
-            self.add_staged_changes(deleted, 0)
-            staged += deleted
-        if added := self.base.git.repo.get_staged_added_files():
-            self.add_staged_changes(added, 1)
-            staged += added
-        if modified := self.base.git.repo.get_staged_modified_files():
-            self.add_staged_changes(modified, 2)
-            staged += modified
-
-        if staged:
-            self.staged_changes_tree.clear(otherthan=staged)
-
-        unstaged = []
-    
-        if deleted := self.base.git.repo.get_deleted_files():
-            self.add_changes(deleted, 0)
-            unstaged += [(i, 0) for i in deleted]
-        if added := self.base.git.repo.get_added_files():
-            self.add_changes(added, 1)
-            unstaged += [(i, 1) for i in added]
-        if modified := self.base.git.repo.get_modified_files():
-            self.add_changes(modified, 2)
-            unstaged += [(i, 2) for i in modified]
-
-        # untracked files
-        if untracked := self.base.git.repo.get_untracked_files():
-            self.add_changes(untracked, 3)
-            unstaged += [(i, 3) for i in untracked]
-            
-        if unstaged:
-            self.changes_tree.clear(otherthan=unstaged)
+
+        if invalidate:
+            self.base.git.status.invalidate()
+        self.base.git.status.refresh()
 
     def toggle_staged(self, *_) -> None:
         if not self.base.git_found:
             return
         
-        self.staged_changes_tree.pack_forget() if self.staged_changes_tree.winfo_ismapped() else self.staged_changes_tree.pack(fill=tk.BOTH, before=self.changes_tree)
+        self.staged_changes_tree.pack_forget() if self.staged_changes_tree.winfo_ismapped() else self.staged_changes_tree.pack(fill=tk.BOTH, expand=True, before=self.changes_tree)
 
     def toggle_changes(self, *_) -> None:
         if not self.base.git_found:
             return
         
-        self.changes_tree.pack_forget() if self.changes_tree.winfo_ismapped() else self.changes_tree.pack(fill=tk.BOTH, after=self.staged_changes_tree)
+        self.changes_tree.pack_forget() if self.changes_tree.winfo_ismapped() else self.changes_tree.pack(fill=tk.BOTH, expand=True, after=self.staged_changes_tree)
+
+    def toggle_history(self, *_) -> None:
+        if not self.base.git_found:
+            return
+        
+        self.history.pack_forget() if self.history.winfo_ismapped() else self.history.pack(fill=tk.BOTH, expand=True, after=self.changes_tree)
 
     def enable_tree(self) -> None:
         self.placeholder.pack_forget()
@@ -112,7 +83,9 @@ class Git(Frame):
 
         self.staged_changes_tree.clear_tree()
         self.changes_tree.clear_tree()
+        self.base.git.status.reset()
         self.open_repo()
+        self.history.refresh()
 
     def disable_tree(self) -> None:
         self.commitbox.pack_forget()
@@ -0,0 +1,181 @@
+import os
+import queue
+import tkinter as tk
+from collections import deque
+
+from biscuit.core.utils import VirtualTree
+
+from ..item import SidebarViewItem
+
+
+class History(SidebarViewItem):
+    """Commit history of the repository, or of the active file.
+
+    Only a window of `max_pages` pages of commits is kept in the tree. Scrolling to
+    either end of it reads the next or the previous page from git and drops the page
+    at the other end, so browsing a history of any length takes the same memory.
+    Expanding a commit loads the files it changed along with their line stats.
+    """
+
+    # pages of commits kept in the tree at once
+    max_pages = 5
+
+    def __init__(self, master, *args, **kwargs) -> None:
+        self.__buttons__ = (('file', self.toggle_file_history), ('refresh', self.refresh))
+        self.title = "History"
+        super().__init__(master, *args, **kwargs)
+        self.config(**self.base.theme.views.sidebar.item)
+
+        self.tree = VirtualTree(self.content, singleclick=self.open_file, loader=self.load_stats,
+                                onscrollend=self.load_more, onscrolltop=self.load_earlier)
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+
+        # path of the file whose history is shown, relative to the repo
+        self.file = None
+        self.nodes: dict[str, str] = {}
+
+        # position in the log of the first commit shown, and the node ids of each page shown
+        self.offset = 0
+        self.pages: deque[list[str]] = deque()
+
+        self.generation = 0
+        self.loading = False
+        self.finished = True
+        self.pending_stats = 0
+        self.polling = False
+
+    @property
+    def history(self):
+        return self.base.git.history
+
+    def refresh(self, *_) -> None:
+        self.tree.clear_tree()
+        self.nodes.clear()
+        self.pages.clear()
+        self.offset = 0
+        self.pending_stats = 0
+        self.generation = self.history.start()
+
+        if not self.base.git.repo:
+            self.loading = False
+            self.finished = True
+            return
+
+        self.set_title(f"History: {os.path.basename(self.file)}" if self.file else "History")
+        self.finished = False
+        self.request_page(0)
+
+    def toggle_file_history(self, *_) -> None:
+        """Switches between the history of the repository and of the active file"""
+
+        if self.file:
+            self.file = None
+        elif (repo := self.base.git.repo) and (editor := self.base.editorsmanager.active_editor) and editor.path:
+            self.file = repo.relpath(editor.path)
+        self.refresh()
+
+    def request_page(self, skip: int) -> None:
+        self.loading = True
+        self.history.request_page(self.base.git.repo.working_tree_dir, skip, self.file)
+        self.start_polling()
+
+    def load_more(self) -> None:
+        if not (self.loading or self.finished):
+            self.request_page(self.offset + len(self.pages) * self.history.page_size)
+
+    def load_earlier(self) -> None:
+        if not self.loading and self.offset:
+            self.request_page(self.offset - self.history.page_size)
+
+    def load_stats(self, node) -> None:
+        self.tree.insert(node, text="loading...")
+        self.history.request_stats(self.base.git.repo.working_tree_dir, self.tree.item_fullpath(node))
+        self.pending_stats += 1
+        self.start_polling()
+
+    def start_polling(self) -> None:
+        if not self.polling:
+            self.polling = True
+            self.after(50, self.poll)
+
+    def poll(self) -> None:
+        while True:
+            try:
+                kind, generation, value = self.history.results.get_nowait()
+            except queue.Empty:
+                break
+
+            if generation != self.generation:
+                continue
+
+            if kind == 'stats':
+                self.pending_stats -= 1
+                self.add_stats(*value)
+            elif kind == 'error':
+                self.loading = False
+                self.finished = True
+                self.base.logger.error(f"Reading git history failed: {value}")
+            else:
+                self.loading = False
+                self.add_page(*value)
+
+        if self.loading or self.pending_stats:
+            self.after(50, self.poll)
+        else:
+            self.polling = False
+
+    def add_page(self, skip: int, commits: list) -> None:
+        if skip < self.offset:
+            # an earlier page goes on top, the rows that were in view stay there
+            rows = len(self.tree.model.rows())
+            self.pages.appendleft(self.insert_commits(commits, 0))
+            self.offset = skip
+            self.tree.shift(len(self.tree.model.rows()) - rows)
+
+            if len(self.pages) > self.max_pages:
+                self.drop_page(self.pages.pop())
+                self.finished = False
+            return
+
+        self.finished = len(commits) < self.history.page_size
+        if not commits:
+            return
+
+        self.pages.append(self.insert_commits(commits, 'end'))
+        if len(self.pages) > self.max_pages:
+            rows = len(self.tree.model.rows())
+            self.drop_page(self.pages.popleft())
+            self.offset += self.history.page_size
+            self.tree.shift(len(self.tree.model.rows()) - rows)
+
+    def insert_commits(self, commits: list, index) -> list[str]:
+        nodes = []
+        for i, commit in enumerate(commits):
+            node = self.tree.insert('', index if index == 'end' else index + i, text=commit.subject,
+                                    values=(commit.sha, 'commit'), icon='git-commit', detail=commit.short, lazy=True)
+            self.nodes[commit.sha] = node
+            nodes.append(node)
+        return nodes
+
+    def drop_page(self, nodes: list[str]) -> None:
+        for node in nodes:
+            self.nodes.pop(self.tree.item_fullpath(node), None)
+        self.tree.delete(*nodes)
+
+    def add_stats(self, sha, stats) -> None:
+        if not (node := self.nodes.get(sha)) or not self.tree.exists(node):
+            return
+
+        self.tree.clear_node(node)
+        if stats is None:
+            self.tree.insert(node, text="failed to read changes")
+            return
+
+        root = self.base.git.repo.working_tree_dir
+        for path, added, deleted in stats:
+            detail = "bin" if added == '-' else f"+{added} -{deleted}"
+            self.tree.insert(node, text=path, values=(os.path.join(root, path), 'file'), icon='file', detail=detail)
+
+    def open_file(self, path) -> None:
+        if os.path.isfile(path):
+            self.base.open_editor(path)
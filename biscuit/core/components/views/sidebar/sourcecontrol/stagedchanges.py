@@ -1,51 +1,23 @@
-import tkinter as tk
+from .changes import Changes
 
-from ..item import SidebarViewItem
-from .stageditem import StagedChangeItem
 
+class StagedChanges(Changes):
+    """Staged changes tree, same layout as `Changes` with unstaging actions."""
 
-class StagedChanges(SidebarViewItem):
-    def __init__(self, master, *args, **kwargs) -> None:
-        self.__buttons__ = (('remove', self.git_remove_all),)
-        self.title = "Staged Changes"
-        super().__init__(master, *args, **kwargs)
-        self.config(**self.base.theme.views.sidebar.item)
-        self.items = {}
+    title = "Staged Changes"
 
-    def refresh(self) -> None:
-        if not self.items:
-            self.itembar.hide_content()
-        else:
-            self.itembar.show_content()
+    def get_buttons(self) -> tuple:
+        return (('remove', self.git_remove_all),)
 
-    def clear_tree(self, *_) -> None:
-        for item in self.items.values():
-            try:
-                item.destroy()
-            except:
-                pass
+    def get_actions(self) -> list:
+        return [('remove', self.git_remove)]
 
-        self.items.clear()
-    
-    def clear(self, otherthan: list=[]) -> None:
-        if not otherthan:
-            return self.clear_tree()
-        
-        for path in list(self.items.keys()):
-            if path not in otherthan:
-                self.items[path].destroy()
-                del self.items[path]
-
-    def add_item(self, path, kind) -> None:
-        if path in self.items:
-            return
-
-        new_item = StagedChangeItem(self.content, path, kind)
-        new_item.master = self
-        new_item.pack(fill=tk.X)
-        self.items[path] = new_item
+    def git_remove(self, node) -> None:
+        if paths := self.paths(node):
+            self.base.git.repo.unstage_files(*paths)
+            self.master.master.open_repo()
 
     def git_remove_all(self, *_) -> None:
-        if staged := list(self.items.keys()):
+        if staged := list(self.items):
             self.base.git.repo.unstage_files(*staged)
             self.master.master.open_repo()
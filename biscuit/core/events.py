@@ -100,17 +100,8 @@ class EventManager(GUIManager, ConfigManager):
             return
         
         try:
-            def clone() -> None:
-                repodir = self.git.clone(url, path)
-                if new_window:
-                    self.open_in_new_window(repodir)
-                else:
-                    self.open_directory(repodir)
-
-            temp = threading.Thread(target=clone)
-            temp.daemon = True
-            temp.start()
-
+            # cloned in the background, the repo is opened on the UI thread once done
+            self.git.clone(url, path, self.open_in_new_window if new_window else self.open_directory)
         except Exception as e:
             self.logger.error(f"Cloning repository failed: {e}")
             self.notifications.error("Cloning repository failed: see logs")
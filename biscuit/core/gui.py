@@ -145,6 +145,7 @@ class GUIManager(Tk, ConfigManager):
         self.onfocus_callbacks.append(fn)
     
     def on_close_app(self) -> None:
+        self.explorer.directory.save_state()
         self.editorsmanager.delete_all_editors()
         self.destroy()
 
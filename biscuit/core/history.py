@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import sqlite3
+import time
 import typing
 
 from .components.floating.palette.actionset import ActionSet
@@ -11,9 +12,13 @@ if typing.TYPE_CHECKING:
     from . import App
 
 
+# time after which the weight of a palette selection halves (1 week)
+FRECENCY_HALF_LIFE = 7 * 24 * 60 * 60
+
+
 class HistoryManager:
     """
-    Manages the history of opened files and folders.
+    Manages the history of opened files and folders, and the palette selections.
     Uses an sqlite3 database to store the history.
     """
     def __init__(self, base: App) -> None:
@@ -27,11 +32,22 @@ class HistoryManager:
             """
             CREATE TABLE IF NOT EXISTS file_history (path TEXT NOT NULL);
             CREATE TABLE IF NOT EXISTS folder_history (path TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS palette_history (
+                prefix TEXT NOT NULL,
+                item TEXT NOT NULL,
+                score REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (prefix, item)
+            );
             """
         )
 
         self.file_history = FixedSizeStack(self, "file_history").load_sqlite(self.cursor)
         self.folder_history = FixedSizeStack(self, "folder_history").load_sqlite(self.cursor)
+
+        # {prefix: {item: (score, last_used)}}, palette selections kept in memory for ranking
+        self.palette_history: dict[str, dict[str, tuple[float, float]]] = {}
+        self.load_palette_history()
     
     def generate_actionsets(self) -> None:
         self.base.palette.register_actionset(lambda: ActionSet("Recent files", "recentf:", self.file_history.list))
@@ -43,6 +59,44 @@ class HistoryManager:
     def register_folder_history(self, path: str) -> None:
         self.folder_history.push(path)
     
+    def load_palette_history(self) -> None:
+        now = time.time()
+        stale = []
+        self.cursor.execute("SELECT prefix, item, score, last_used FROM palette_history;")
+        for prefix, item, score, last_used in self.cursor.fetchall():
+            if self.decay(score, last_used, now) < 0.01:
+                stale.append((prefix, item))
+                continue
+            self.palette_history.setdefault(prefix, {})[item] = (score, last_used)
+
+        if stale:
+            self.cursor.executemany("DELETE FROM palette_history WHERE prefix = ? AND item = ?;", stale)
+            self.db.commit()
+
+    def decay(self, score: float, last_used: float, now: float) -> float:
+        return score * 0.5 ** ((now - last_used) / FRECENCY_HALF_LIFE)
+
+    def register_palette_selection(self, prefix: str, item: str) -> None:
+        """Bumps the frecency of a palette item and persists it right away"""
+
+        now = time.time()
+        items = self.palette_history.setdefault(prefix, {})
+        score = self.decay(*items.get(item, (0, now)), now) + 1
+        items[item] = (score, now)
+
+        self.cursor.execute(
+            "INSERT OR REPLACE INTO palette_history (prefix, item, score, last_used) VALUES (?, ?, ?, ?);",
+            (prefix, item, score, now),
+        )
+        self.db.commit()
+
+    def get_frecency(self, prefix: str) -> dict[str, float]:
+        """Returns the current frecency of the used items of an actionset"""
+
+        now = time.time()
+        return {item: self.decay(score, last_used, now)
+                for item, (score, last_used) in self.palette_history.get(prefix, {}).items()}
+
     def dump(self) -> None:
         self.file_history.dump_sqlite(self.cursor)
         self.folder_history.dump_sqlite(self.cursor)
@@ -51,3 +105,6 @@ class HistoryManager:
     def clear_history(self) -> None:
         self.file_history.clear()
         self.folder_history.clear()
+        self.palette_history.clear()
+        self.cursor.execute("DELETE FROM palette_history;")
+        self.db.commit()
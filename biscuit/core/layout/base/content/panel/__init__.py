@@ -85,6 +85,11 @@ class Panel(Frame):
         self.set_active_view(self.terminals)
         self.show_panel()
 
+    def show_problems(self) -> None:
+        "shows the problems if its hidden/minimized"
+        self.set_active_view(self.problems)
+        self.show_panel()
+
     def show_logs(self) -> None:
         "shows the logs if its hidden/minimized"
         self.set_active_view(self.logger)
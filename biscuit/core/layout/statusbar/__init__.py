@@ -47,9 +47,15 @@ class Statusbar(Frame):
         self.branch = SButton(self, text="master", icon="source-control", function=self.base.commands.change_git_branch, description="Checkout branch")
         self.branch.set_pack_data(side=tk.LEFT, padx=(2, 0))
 
-        # process indicator
+        # process indicator, shows the latest of the running background processes
         self.process_indicator = SButton(self, text="setting up environment", icon="sync", description="enabling language extensions")
         self.process_indicator.set_pack_data(side=tk.LEFT, padx=(2, 0))
+        self.processes: dict[str, tuple[str, str, typing.Callable]] = {}
+
+        # error and warning counts of the problems panel
+        self.problems = SButton(self, text="0 errors, 0 warnings", icon="error", function=self.show_problems, description="Show problems")
+        self.problems.set_pack_data(side=tk.LEFT, padx=(2, 0))
+        self.problems.show()
 
         # line and column info
         self.lc_actionset = ActionSet(
@@ -116,6 +122,15 @@ class Statusbar(Frame):
     def toggle_terminal(self) -> None:
         self.base.toggle_terminal()
 
+    def show_problems(self) -> None:
+        self.base.panel.show_problems()
+
+    def update_problems(self, errors: int, warnings: int, infos: int=0) -> None:
+        text = f"{errors} error{'s' * (errors != 1)}, {warnings} warning{'s' * (warnings != 1)}"
+        if infos:
+            text += f", {infos} info{'s' * (infos != 1)}"
+        self.problems.change_text(text)
+
     def toggle_editmode(self, state: bool) -> None:
         if state:
             self.file_type.show()
@@ -133,13 +148,43 @@ class Statusbar(Frame):
     def update_git_info(self) -> None:
         if self.base.git_found:
             self.branch.show()
-            self.branch.change_text("{0}".format(self.base.git.active_branch))
+            self.branch.change_text("{0}".format(self.base.git.active_branch or "(detached)"))
             
             # following has been moved to `git.update_repo_info`
             # self.git_actionset.update([(str(branch), lambda e=None: self.base.git.checkout(str(branch))) for branch in self.base.git.repo.branches])
         else:
             self.branch.hide()
 
+    def start_process(self, key: str, text: str, description: str="", cancel: typing.Callable=None) -> None:
+        """Shows a background process on the process indicator, clicking the indicator
+        calls `cancel` if the process can be cancelled."""
+
+        self.processes.pop(key, None)
+        self.processes[key] = (text, description, cancel)
+        self.update_process_indicator()
+
+    def update_process(self, key: str, text: str) -> None:
+        if key in self.processes:
+            _, description, cancel = self.processes[key]
+            self.processes[key] = (text, description, cancel)
+            self.update_process_indicator()
+
+    def end_process(self, key: str) -> None:
+        if self.processes.pop(key, None):
+            self.update_process_indicator()
+
+    def update_process_indicator(self) -> None:
+        if not self.processes:
+            return self.process_indicator.hide()
+
+        text, description, cancel = self.processes[next(reversed(self.processes))]
+        if cancel:
+            description = f"{description} (click to cancel)" if description else "Click to cancel"
+        self.process_indicator.change_text(text)
+        self.process_indicator.change_description(description)
+        self.process_indicator.change_function(cancel or (lambda *_: None))
+        self.process_indicator.show()
+
     def on_open_file(self, text: Text) -> None:
         self.file_type.change_text(text.language)
         self.encoding.change_text(text.encoding.upper())
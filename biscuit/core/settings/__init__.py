@@ -113,10 +113,7 @@ class Settings:
         )
         self.base.palette.register_actionset(lambda: clone_actionset)
 
-        self.symbols_actionset = ActionSet(
-            "Go to symbol in editor", "@", []
-        )
-        self.base.palette.register_actionset(lambda: self.symbols_actionset)
+        self.base.palette.register_actionset(lambda: self.base.language_server_manager.symbols.actionset)
     
     @property
     def actionset(self):
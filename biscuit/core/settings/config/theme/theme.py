@@ -237,6 +237,9 @@ class Editors(FrameThemeObject):
         self.diff.not_exist = "#d3d3d3"
         self.diff.removed = "#ffa3a3"
         self.diff.addition = "#dbe6c2"
+        self.diff.gutter_added = "#2ea043"
+        self.diff.gutter_modified = "#0078d4"
+        self.diff.gutter_deleted = "#f85149"
 
 class Utils(ThemeObject):
     def __init__(self, *args, **kwargs) -> None:
@@ -13,6 +13,7 @@ from .entry import Entry
 from .filetype import FileType
 from .fixedstack import FixedSizeStack
 from .frame import Frame
+from .fuzzy import FuzzyResult, fuzzy_filter, fuzzy_match
 from .icon import Icon
 from .iconbutton import IconButton
 from .iconlabel import IconLabel
@@ -29,6 +30,7 @@ from .text import Text
 from .textutils import *
 from .toplevel import Toplevel
 from .tree import Tree
+from .virtualtree import VirtualTree
 
 
 @staticmethod
@@ -0,0 +1,173 @@
+"""Fuzzy matching used by the palette and autocomplete.
+
+Scores a query against a candidate as a (case-insensitive) subsequence, rewarding
+matches that start words, follow camelCase humps and run consecutively, and
+penalising gaps. The best alignment is found with a small dynamic program so the
+returned positions can be used for highlighting the matched characters.
+"""
+
+from __future__ import annotations
+
+import heapq
+import typing
+
+__all__ = ['fuzzy_match', 'fuzzy_filter', 'FuzzyResult']
+
+SCORE_MATCH = 16
+BONUS_BOUNDARY = 10
+BONUS_CAMEL = 8
+BONUS_CONSECUTIVE = 6
+BONUS_FIRST_CHAR = 2
+BONUS_CASE = 1
+PENALTY_GAP_START = 3
+PENALTY_GAP_EXTENSION = 1
+
+SEPARATORS = frozenset(" _-./\\:,;()[]{}<>\"'`@#$")
+
+_MIN = float('-inf')
+
+
+class FuzzyResult(typing.NamedTuple):
+    item: typing.Any
+    score: float
+    positions: list[int]
+
+
+def _bonuses(text: str) -> list[int]:
+    """Per character bonus for starting a match at that position"""
+
+    bonuses = []
+    prev = ' '
+    for ch in text:
+        if prev in SEPARATORS:
+            bonuses.append(BONUS_BOUNDARY)
+        elif prev.islower() and ch.isupper() or not prev.isdigit() and ch.isdigit():
+            bonuses.append(BONUS_CAMEL)
+        else:
+            bonuses.append(0)
+        prev = ch
+    return bonuses
+
+
+def fuzzy_match(query: str, text: str) -> tuple[float, list[int]] | None:
+    """Matches query against text.
+
+    Returns (score, positions) where positions are the indices of text that matched,
+    or None if query is not a subsequence of text. An empty query matches everything
+    with a score of 0.
+    """
+
+    if not query:
+        return 0, []
+
+    n, m = len(query), len(text)
+    if n > m:
+        return None
+
+    lowered = text.lower()
+    pattern = query.lower()
+
+    # quick subsequence check, also narrows the window the DP has to look at
+    first = j = lowered.find(pattern[0])
+    if first == -1:
+        return None
+    for ch in pattern[1:]:
+        j = lowered.find(ch, j + 1)
+        if j == -1:
+            return None
+    last = lowered.rfind(pattern[-1]) + 1
+
+    bonuses = _bonuses(text)
+
+    # scores[i][j]: best score with query[i] matched at text[j]
+    # sources[i][j]: text index query[i-1] was matched at for that score
+    scores: list[list[float]] = []
+    sources: list[list[int]] = []
+
+    # leading unmatched characters cost a little, so shorter/tighter candidates win ties,
+    # counted in here so the alignment is chosen with them
+    row = [_MIN] * m
+    for j in range(first, last):
+        if lowered[j] == pattern[0]:
+            row[j] = (SCORE_MATCH + bonuses[j] * BONUS_FIRST_CHAR + (BONUS_CASE if text[j] == query[0] else 0)
+                      - j * PENALTY_GAP_EXTENSION)
+    scores.append(row)
+    sources.append([-1] * m)
+
+    for i in range(1, n):
+        prev = scores[-1]
+        row = [_MIN] * m
+        src = [-1] * m
+
+        # best score so far that ends in a gap, with the index it came from
+        gap, gap_src = _MIN, -1
+        ch = pattern[i]
+        for j in range(first + i, last):
+            if j >= 2 and prev[j - 2] - PENALTY_GAP_START > gap - PENALTY_GAP_EXTENSION:
+                gap, gap_src = prev[j - 2] - PENALTY_GAP_START, j - 2
+            else:
+                gap -= PENALTY_GAP_EXTENSION
+
+            if lowered[j] != ch:
+                continue
+
+            bonus = bonuses[j] + (BONUS_CASE if text[j] == query[i] else 0)
+            consecutive = prev[j - 1] + SCORE_MATCH + max(bonus, BONUS_CONSECUTIVE)
+            gapped = gap + SCORE_MATCH + bonus
+            if consecutive >= gapped and prev[j - 1] != _MIN:
+                row[j], src[j] = consecutive, j - 1
+            elif gap != _MIN:
+                row[j], src[j] = gapped, gap_src
+
+        scores.append(row)
+        sources.append(src)
+
+    best = max(range(first, last), key=scores[-1].__getitem__)
+    score = scores[-1][best]
+    if score == _MIN:
+        return None
+
+    positions = [best]
+    for i in range(n - 1, 0, -1):
+        best = sources[i][best]
+        positions.append(best)
+    positions.reverse()
+
+    return score, positions
+
+
+def fuzzy_filter(query: str, items: typing.Iterable, key: typing.Callable[[typing.Any], str]=None,
+                 limit: int=None, tiebreak: typing.Callable[[typing.Any], float]=None) -> list[FuzzyResult]:
+    """Filters and ranks items by how well they match query.
+
+    Only the best `limit` results are kept (heap selection rather than a full sort).
+    Results with equal scores are ordered by `tiebreak` (higher first), then favor
+    shorter candidates, then keep their original order.
+
+    Args:
+        query (str): the search term
+        items (Iterable): candidates to filter
+        key (Callable): returns the text to match for an item, defaults to the item itself
+        limit (int): maximum number of results to return
+        tiebreak (Callable): returns a secondary score for an item, eg. its frecency
+    """
+
+    key = key or (lambda item: item)
+    tiebreak = tiebreak or (lambda item: 0)
+
+    def matches():
+        for index, item in enumerate(items):
+            text = key(item)
+            if not text:
+                continue
+            if result := fuzzy_match(query, text):
+                # without a query there is nothing to rank on but the tiebreak and order
+                length = -len(text) if query else 0
+                yield (result[0], tiebreak(item), length, -index), FuzzyResult(item, *result)
+
+    if limit is None:
+        ranked = sorted(matches(), key=lambda r: r[0], reverse=True)
+    else:
+        ranked = heapq.nlargest(limit, matches(), key=lambda r: r[0])
+
+    return [result for _, result in ranked]
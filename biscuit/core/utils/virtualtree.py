@@ -0,0 +1,582 @@
+"""Virtualized tree/list widget.
+
+The whole tree lives in a pure python model, and only the rows that are visible
+(plus a small overscan) are drawn on a canvas. Row items are reused while scrolling,
+so a directory with 100k entries or a search with 50k hits costs the same number
+of Tk items as a handful of them. Children can be loaded lazily when a node is
+first expanded.
+
+The API mirrors `Tree` where possible, so views can switch between the two.
+"""
+
+from __future__ import annotations
+
+import itertools
+import tkinter as tk
+import typing
+
+from .codicon import get_codicon
+from .frame import Frame
+from .scrollbar import Scrollbar
+
+__all__ = ['VirtualTree', 'TreeModel', 'TreeNode']
+
+
+class TreeNode:
+    __slots__ = ('iid', 'parent', 'text', 'values', 'image', 'icon', 'iconcolor',
+                 'detail', 'detailcolor', 'open', 'lazy', 'children', 'depth')
+
+    def __init__(self, iid: str, parent: TreeNode=None, text: str="", values: typing.Sequence=(),
+                 image: str=None, icon: str=None, iconcolor: str=None, detail: str=None,
+                 detailcolor: str=None, open: bool=False, lazy: bool=False) -> None:
+        self.iid = iid
+        self.parent = parent
+        self.text = text
+        self.values = list(values)
+        self.image = image
+        self.icon = icon
+        self.iconcolor = iconcolor
+        self.detail = detail
+        self.detailcolor = detailcolor
+        self.open = open
+        self.lazy = lazy
+
+        # ordered set of child ids, O(1) removal for keyed updates
+        self.children: dict[str, None] = {}
+        self.depth = parent.depth + 1 if parent else -1
+
+    @property
+    def expandable(self) -> bool:
+        return bool(self.children) or self.lazy
+
+
+class TreeModel:
+    """Holds the nodes of a `VirtualTree` and the flattened list of visible rows"""
+
+    def __init__(self) -> None:
+        self.counter = itertools.count()
+        self.root = TreeNode('')
+        self.nodes: dict[str, TreeNode] = {'': self.root}
+
+        self._rows: list[str] = []
+        self._row_index: dict[str, int] = {}
+        self.dirty = True
+
+    def __contains__(self, iid: str) -> bool:
+        return iid in self.nodes
+
+    def __getitem__(self, iid: str) -> TreeNode:
+        return self.nodes[iid]
+
+    def insert(self, parent: str='', index: int | str='end', iid: str=None, **options) -> str:
+        parent_node = self.nodes[parent]
+        if iid is None:
+            iid = f"I{next(self.counter):06X}"
+        elif iid in self.nodes:
+            self.delete(iid)
+
+        self.nodes[iid] = TreeNode(iid, parent_node, **options)
+        if index == 'end' or index == tk.END:
+            parent_node.children[iid] = None
+        else:
+            children = list(parent_node.children)
+            children.insert(int(index), iid)
+            parent_node.children = dict.fromkeys(children)
+
+        if parent_node.open or parent_node is self.root:
+            self.dirty = True
+        return iid
+
+    def delete(self, iid: str) -> None:
+        node = self.nodes.get(iid)
+        if node is None or node is self.root:
+            return
+
+        node.parent.children.pop(iid, None)
+        self.clear(iid)
+        del self.nodes[iid]
+        self.dirty = True
+
+    def clear(self, iid: str='') -> None:
+        """Removes all descendants of the node"""
+
+        node = self.nodes[iid]
+        stack = list(node.children)
+        while stack:
+            child = self.nodes.pop(stack.pop())
+            stack.extend(child.children)
+
+        if node.children:
+            node.children = {}
+            self.dirty = True
+
+    def children(self, iid: str='') -> tuple[str, ...]:
+        return tuple(self.nodes[iid].children)
+
+    def set_open(self, iid: str, flag: bool) -> None:
+        node = self.nodes[iid]
+        if node.open != flag:
+            node.open = flag
+            self.dirty = True
+
+    def rows(self) -> list[str]:
+        """Flattened ids of the nodes that are visible (all their ancestors open)"""
+
+        if self.dirty:
+            rows = []
+            stack = list(reversed(self.root.children))
+            while stack:
+                iid = stack.pop()
+                rows.append(iid)
+                node = self.nodes[iid]
+                if node.open and node.children:
+                    stack.extend(reversed(node.children))
+
+            self._rows = rows
+            self._row_index = {}
+            self.dirty = False
+
+        return self._rows
+
+    def row_index(self, iid: str) -> int:
+        """Index of the node in the visible rows, -1 if it's hidden"""
+
+        rows = self.rows()
+        if not self._row_index and rows:
+            self._row_index = {iid: i for i, iid in enumerate(rows)}
+        return self._row_index.get(iid, -1)
+
+
+class VirtualTree(Frame):
+    """Tree/list that only materialises the visible rows.
+
+    Args:
+        doubleclick: called with the event when a row is double clicked
+        singleclick: called with the fullpath of a clicked 'file' row, other rows toggle
+        loader: called with the node id when a lazy node is expanded for the first time,
+            it is expected to insert the children (right away or later)
+        actions: (codicon, callback) buttons shown on the right of the hovered row,
+            the callback is called with the node id
+        onscrollend: called when the rows drawn reach the end, for loading more rows
+        onscrolltop: called when the rows drawn reach the start, for loading earlier rows
+        overscan: rows drawn above and below the visible area
+    """
+
+    def __init__(self, master, startpath=None, doubleclick=lambda _: None, singleclick=lambda _: None,
+                 loader: typing.Callable[[str], None]=None, actions: typing.Sequence[tuple[str, typing.Callable[[str], None]]]=(),
+                 onscrollend: typing.Callable[[], None]=None, onscrolltop: typing.Callable[[], None]=None, columns=("fullpath", "type"), rowheight=25, overscan=10, *args, **kwargs) -> None:
+        super().__init__(master, *args, **kwargs)
+        self.config(**self.base.theme.utils.tree)
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.path = startpath
+        self.doubleclick = doubleclick
+        self.singleclick = singleclick
+        self.loader = loader
+        self.actions = list(actions)
+        self.onscrollend = onscrollend
+        self.onscrolltop = onscrolltop
+        self.columns = list(columns)
+        self.rowheight = rowheight
+        self.overscan = overscan
+        self.indent = 16
+
+        theme = self.base.theme.utils.tree.item
+        self.bg, self.fg, self.hbg = theme.background, theme.foreground, theme.highlightbackground
+        self.sbg, self.sfg = theme.selectedbackground, theme.selectedforeground
+        self.font = ("Segoe UI", 10)
+        self.iconfont = ("codicon", 12)
+
+        self.model = TreeModel()
+        self.focused = ''
+        self.hovered = ''
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, bd=0, bg=self.bg, yscrollincrement=rowheight)
+        self.canvas.grid(row=0, column=0, sticky=tk.NSEW)
+
+        self.scrollbar = Scrollbar(self, orient=tk.VERTICAL, command=self.yview, style="TreeScrollbar")
+        self.scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        self.canvas.config(yscrollcommand=self.on_scroll)
+
+        # pool of drawn rows: (background, chevron, image, icon, text, detail) canvas items
+        self.slots: list[tuple[int, ...]] = []
+        self.render_pending = None
+        # last scrollregion set, setting it again fires yscrollcommand for nothing
+        self.scrollregion = None
+        # last and first row when the end and the start were last reached, None while not shown
+        self.scrollend_row = None
+        self.scrolltop_row = None
+
+        # action buttons are drawn on the hovered row only
+        self.action_items = [self.canvas.create_text(0, 0, font=self.iconfont, fill=self.fg, text=get_codicon(icon),
+                                                     state=tk.HIDDEN) for icon, _ in self.actions]
+
+        self.canvas.bind("<Configure>", self.schedule_render)
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Double-Button-1>", self.on_doubleclick)
+        self.canvas.bind("<Motion>", self.on_motion)
+        self.canvas.bind("<Leave>", self.on_leave)
+        self.canvas.bind("<MouseWheel>", lambda e: self.yview_scroll(-1 * (e.delta // 120 or (1 if e.delta > 0 else -1)), "units") or "break")
+        self.canvas.bind("<Button-4>", lambda _: self.yview_scroll(-3, "units") or "break")
+        self.canvas.bind("<Button-5>", lambda _: self.yview_scroll(3, "units") or "break")
+        self.canvas.bind("<Up>", lambda _: self.move_focus(-1))
+        self.canvas.bind("<Down>", lambda _: self.move_focus(1))
+        self.canvas.bind("<Return>", lambda e: self.activate(self.focused, e))
+
+    def bind(self, *args, **kwargs) -> None:
+        self.canvas.bind(*args, **kwargs)
+
+    # --- model ---------------------------------------------------------------
+
+    def insert(self, parent: str='', index='end', text: str="", values: typing.Sequence=(), image: str=None,
+               icon: str=None, iconcolor: str=None, detail: str=None, detailcolor: str=None,
+               open: bool=False, lazy: bool=False, iid: str=None, **_) -> str:
+        iid = self.model.insert(parent, index, iid, text=text, values=values, image=image, icon=icon,
+                                iconcolor=iconcolor, detail=detail, detailcolor=detailcolor, open=open, lazy=lazy)
+        self.schedule_render()
+        return iid
+
+    def add(self, *a, **kw) -> str:
+        return self.insert('', 'end', *a, **kw)
+
+    def set_children(self, parent: str, items: typing.Iterable[dict]) -> list[str]:
+        """Replaces the children of the node with the items (keyword arguments of `insert`)"""
+
+        self.model.clear(parent)
+        self.model[parent].lazy = False
+        ids = [self.model.insert(parent, 'end', item.pop('iid', None), **item) for item in items]
+        self.schedule_render()
+        return ids
+
+    def delete(self, *iids) -> None:
+        for iid in iids:
+            self.model.delete(iid)
+        if self.focused not in self.model:
+            self.focused = ''
+        self.schedule_render()
+
+    def clear_node(self, node) -> None:
+        self.model.clear(node)
+        if self.focused not in self.model:
+            self.focused = ''
+        self.schedule_render()
+
+    def clear_tree(self) -> None:
+        self.clear_node('')
+
+    def exists(self, node) -> bool:
+        return node in self.model
+
+    def get_children(self, node='') -> tuple[str, ...]:
+        return self.model.children(node)
+
+    def parent(self, node) -> str:
+        parent = self.model[node].parent
+        return parent.iid if parent else ''
+
+    def item(self, node, option: str=None, **kw):
+        """Gets or sets options of the node (text, values, image, icon, iconcolor, detail, detailcolor, open)"""
+
+        n = self.model[node]
+        if option:
+            return getattr(n, option)
+
+        if not kw:
+            return {'text': n.text, 'values': n.values, 'image': n.image, 'open': n.open}
+
+        if 'open' in kw:
+            self.model.set_open(node, kw.pop('open'))
+        for key, value in kw.items():
+            setattr(n, key, list(value) if key == 'values' else value)
+        self.schedule_render()
+
+    def set(self, node, column: str, value=None):
+        n = self.model[node]
+        try:
+            index = self.columns.index(column)
+        except ValueError:
+            return ''
+
+        if value is None:
+            return n.values[index] if index < len(n.values) else ''
+
+        n.values += [''] * (index + 1 - len(n.values))
+        n.values[index] = value
+        self.schedule_render()
+
+    def is_open(self, node) -> bool:
+        return self.model[node].open
+
+    def item_type(self, item):
+        return self.set(item, "type") if item else ''
+
+    def item_fullpath(self, item):
+        return self.set(item, "fullpath") if item else ''
+
+    def focus(self, *args) -> str:
+        if args:
+            self.focused = args[0] if args[0] in self.model else ''
+            self.schedule_render()
+        return self.focused
+
+    def selection_set(self, node) -> None:
+        self.focus(node)
+
+    def parent_selected(self):
+        return self.parent(self.focused) if self.focused else ''
+
+    def selected_parent_path(self):
+        return self.item_fullpath(self.parent_selected())
+
+    def selected_path(self):
+        return self.item_fullpath(self.focused)
+
+    def selected_type(self):
+        return self.item_type(self.focused)
+
+    def identify_row(self, y) -> str:
+        rows = self.model.rows()
+        index = int(self.canvas.canvasy(y) // self.rowheight)
+        return rows[index] if 0 <= index < len(rows) else ''
+
+    # --- expanding -----------------------------------------------------------
+
+    def open_node(self, node) -> None:
+        n = self.model[node]
+        if not n.expandable or n.open:
+            return
+
+        self.model.set_open(node, True)
+        if n.lazy:
+            n.lazy = False
+            if self.loader:
+                self.loader(node)
+        # bindings are made on the canvas
+        self.canvas.event_generate("<<Open>>")
+        self.schedule_render()
+
+    def close_node(self, node) -> None:
+        self.model.set_open(node, False)
+        self.schedule_render()
+
+    def toggle_node(self, node) -> None:
+        if self.model[node].open:
+            self.close_node(node)
+        else:
+            self.open_node(node)
+
+    def collapse_all(self) -> None:
+        for node in self.model.children(''):
+            self.model.set_open(node, False)
+        self.schedule_render()
+
+    def see(self, node) -> None:
+        """Expands the ancestors of the node and scrolls it into view"""
+
+        parent = self.model[node].parent
+        while parent and parent.iid:
+            self.model.set_open(parent.iid, True)
+            parent = parent.parent
+
+        self.update_scrollregion()
+        index = self.model.row_index(node)
+        top = self.canvas.canvasy(0) // self.rowheight
+        visible = max(1, self.canvas.winfo_height() // self.rowheight)
+        if index < top or index >= top + visible:
+            self.canvas.yview_moveto(index / max(1, len(self.model.rows())))
+        self.schedule_render()
+
+    # --- events --------------------------------------------------------------
+
+    def activate(self, node, event=None) -> None:
+        if not node:
+            return
+
+        if self.item_type(node) == 'file' or not self.model[node].expandable:
+            if self.singleclick:
+                self.singleclick(self.item_fullpath(node))
+        else:
+            self.toggle_node(node)
+
+    def on_click(self, e: tk.Event) -> None:
+        self.canvas.focus_set()
+        if not (node := self.identify_row(e.y)):
+            return
+
+        for index, (_, callback) in enumerate(self.actions):
+            if abs(e.x - self.action_x(index)) <= 10:
+                return callback(node)
+
+        self.focus(node)
+        self.activate(node, e)
+
+    def action_x(self, index: int) -> int:
+        """Center of the action button, actions are laid out right to left before the detail"""
+
+        return self.canvas.winfo_width() - 14 - 22 * (len(self.actions) - index)
+
+    def on_doubleclick(self, e: tk.Event) -> None:
+        if self.identify_row(e.y):
+            self.doubleclick(e)
+
+    def on_motion(self, e: tk.Event) -> None:
+        node = self.identify_row(e.y)
+        if node != self.hovered:
+            self.hovered = node
+            self.schedule_render()
+
+    def on_leave(self, _) -> None:
+        if self.hovered:
+            self.hovered = ''
+            self.schedule_render()
+
+    def move_focus(self, delta: int) -> str:
+        rows = self.model.rows()
+        if not rows:
+            return "break"
+
+        index = self.model.row_index(self.focused) if self.focused else -1
+        index = min(max(0, index + delta), len(rows) - 1)
+        self.focus(rows[index])
+        self.see(rows[index])
+        return "break"
+
+    # --- scrolling & drawing -------------------------------------------------
+
+    def yview(self, *args) -> None:
+        self.canvas.yview(*args)
+        self.schedule_render()
+
+    def yview_scroll(self, number: int, what: str) -> None:
+        self.canvas.yview_scroll(number, what)
+        self.schedule_render()
+
+    def on_scroll(self, low, high) -> None:
+        # scrolling through yview/yview_scroll renders already, rendering from
+        # here too would loop as every render may update the scrollregion
+        self.scrollbar.set(low, high)
+
+    def shift(self, rows: int) -> None:
+        """Keeps the same rows in view after `rows` rows were inserted above them,
+        negative if rows were removed"""
+
+        self.update_scrollregion()
+        self.canvas.yview_scroll(rows, "units")
+        self.schedule_render()
+
+    def schedule_render(self, *_) -> None:
+        # coalesce any number of model changes into a single redraw
+        if not self.render_pending:
+            self.render_pending = self.after_idle(self.render)
+
+    def update_scrollregion(self) -> None:
+        scrollregion = (0, 0, self.canvas.winfo_width(), len(self.model.rows()) * self.rowheight)
+        if scrollregion != self.scrollregion:
+            self.scrollregion = scrollregion
+            self.canvas.config(scrollregion=scrollregion)
+
+    def new_slot(self) -> tuple[int, ...]:
+        c = self.canvas
+        return (
+            c.create_rectangle(0, 0, 0, 0, width=0, fill=self.bg),
+            c.create_text(0, 0, anchor=tk.W, font=self.iconfont, fill=self.fg),
+            c.create_image(0, 0, anchor=tk.W),
+            c.create_text(0, 0, anchor=tk.W, font=self.iconfont, fill=self.fg),
+            c.create_text(0, 0, anchor=tk.W, font=self.font, fill=self.fg),
+            c.create_text(0, 0, anchor=tk.E, font=("Segoe UI", 10, "bold"), fill=self.fg),
+        )
+
+    def render(self) -> None:
+        """Draws the visible rows (plus overscan) reusing the pooled canvas items"""
+
+        self.render_pending = None
+        if not self.winfo_exists():
+            return
+
+        rows = self.model.rows()
+        self.update_scrollregion()
+
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), self.rowheight)
+        first = max(0, int(self.canvas.canvasy(0) // self.rowheight) - self.overscan)
+        last = min(len(rows), first + height // self.rowheight + 2 * self.overscan + 1)
+
+        while len(self.slots) < last - first:
+            self.slots.append(self.new_slot())
+
+        c = self.canvas
+        for item in self.action_items:
+            c.itemconfigure(item, state=tk.HIDDEN)
+
+        for slot, index in itertools.zip_longest(self.slots, range(first, last)):
+            if index is None:
+                for item in slot:
+                    c.itemconfigure(item, state=tk.HIDDEN)
+                continue
+
+            node = self.model[rows[index]]
+            bg_item, chevron, image, icon, text, detail = slot
+            top = index * self.rowheight
+            middle = top + self.rowheight // 2
+            x = 4 + node.depth * self.indent
+
+            if node.iid == self.focused:
+                bg, fg = self.sbg, self.sfg
+            elif node.iid == self.hovered:
+                bg, fg = self.hbg, self.fg
+            else:
+                bg, fg = self.bg, self.fg
+
+            c.coords(bg_item, 0, top, width, top + self.rowheight)
+            c.itemconfigure(bg_item, fill=bg, state=tk.NORMAL)
+
+            c.coords(chevron, x, middle)
+            c.itemconfigure(chevron, fill=fg, state=tk.NORMAL if node.expandable else tk.HIDDEN,
+                            text=get_codicon("chevron-down" if node.open else "chevron-right"))
+            x += 18
+
+            if node.image:
+                c.coords(image, x, middle)
+                c.itemconfigure(image, image=node.image, state=tk.NORMAL)
+                x += 18
+            else:
+                c.itemconfigure(image, state=tk.HIDDEN)
+
+            if node.icon:
+                c.coords(icon, x, middle)
+                c.itemconfigure(icon, text=get_codicon(node.icon), fill=node.iconcolor or fg, state=tk.NORMAL)
+                x += 18
+            else:
+                c.itemconfigure(icon, state=tk.HIDDEN)
+
+            c.coords(text, x, middle)
+            c.itemconfigure(text, text=node.text, fill=fg, state=tk.NORMAL)
+
+            if node.detail:
+                c.coords(detail, width - 6, middle)
+                c.itemconfigure(detail, text=node.detail, fill=node.detailcolor or fg, state=tk.NORMAL)
+            else:
+                c.itemconfigure(detail, state=tk.HIDDEN)
+
+            if node.iid == self.hovered:
+                for i, item in enumerate(self.action_items):
+                    c.coords(item, self.action_x(i), middle)
+                    c.itemconfigure(item, fill=fg, state=tk.NORMAL)
+                    c.tag_raise(item)
+
+        # once per reach of the end, again only if the rows there changed meanwhile
+        if last < len(rows):
+            self.scrollend_row = None
+        elif rows and self.scrollend_row != rows[-1]:
+            self.scrollend_row = rows[-1]
+            if self.onscrollend:
+                self.onscrollend()
+
+        if first > 0:
+            self.scrolltop_row = None
+        elif rows and self.scrolltop_row != rows[0]:
+            self.scrolltop_row = rows[0]
+            if self.onscrolltop:
+                self.onscrolltop()
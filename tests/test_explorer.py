@@ -0,0 +1,129 @@
+import os
+from types import SimpleNamespace
+
+from biscuit.core.components.views.sidebar.explorer.cache import ExplorerCache
+from biscuit.core.components.views.sidebar.explorer.directorytree import DirectoryTree
+from biscuit.core.components.views.sidebar.explorer.scanner import DirectoryScanner
+
+
+class FakeLogger:
+    def __init__(self):
+        self.errors = []
+
+    def error(self, text):
+        self.errors.append(text)
+
+
+class FakeTree:
+    def __init__(self, nodes):
+        self.nodes = set(nodes)
+
+    def exists(self, node):
+        return node in self.nodes
+
+    def delete(self, node):
+        self.nodes.discard(node)
+
+
+def explorer(root, **kwargs):
+    "Just the state the explorer keeps about a workspace"
+
+    tree = SimpleNamespace(path=root, nodes={root: ''}, listings={}, expanded=set(), shown={},
+                           inserting=[], ignore_dirs=[".git", "node_modules"], ignore_exts=[".pyc"])
+    tree.__dict__.update(kwargs)
+    tree.request_scan = lambda path, mtime=None: None
+    return tree
+
+
+class TestDirectoryScanner:
+    # Tests that ignored directories and extensions are skipped, directories listed first
+    def test_scan(self, tmp_path):
+        for d in ("b", "a", ".git", "node_modules"):
+            (tmp_path / d).mkdir()
+        for f in ("z.py", "c.py", "c.pyc"):
+            (tmp_path / f).write_text("")
+
+        entries = DirectoryScanner(explorer(str(tmp_path))).scan(str(tmp_path))
+        assert [(name, is_dir) for name, _, is_dir in entries] == [("a", True), ("b", True), ("c.py", False), ("z.py", False)]
+        assert entries[0][1] == os.path.join(str(tmp_path), "a")
+
+    # Tests that unchanged directories are not listed again and vanished ones are reported
+    def test_mtime(self, tmp_path):
+        (tmp_path / "a.py").write_text("")
+        scanner = DirectoryScanner(explorer(str(tmp_path)))
+        mtime = os.stat(tmp_path).st_mtime
+
+        assert scanner.request(str(tmp_path), 1, mtime)
+        assert scanner.results.get(timeout=5) == (str(tmp_path), 1, mtime, None)
+
+        scanner.request(str(tmp_path), 1, mtime - 1)
+        assert scanner.results.get(timeout=5)[3] == [("a.py", str(tmp_path / "a.py"), False)]
+
+        scanner.request(str(tmp_path / "gone"), 1)
+        assert scanner.results.get(timeout=5) == (str(tmp_path / "gone"), 1, None, None)
+
+
+class TestExplorerCache:
+    # Tests that the expanded directories and listings of a workspace survive a restart
+    def test_save_load(self, tmp_path):
+        base = SimpleNamespace(datadir=str(tmp_path), logger=FakeLogger())
+        listings = {"/w": (1.0, [("a", "/w/a", True)]), "/w/a": (2.0, [])}
+        ExplorerCache(base).save("/w", {"/w/a"}, listings)
+
+        assert ExplorerCache(base).load("/w") == ({"/w/a"}, listings)
+        assert ExplorerCache(base).load("/other") == (set(), {})
+
+    # Tests that a cache of another workspace or a corrupt one is ignored
+    def test_invalid(self, tmp_path):
+        base = SimpleNamespace(datadir=str(tmp_path), logger=FakeLogger())
+        cache = ExplorerCache(base)
+        cache.save("/w", {"/w/a"}, {})
+
+        with open(cache.file("/w"), "w", encoding="utf-8") as f:
+            f.write('{"workspace": "/x", "expanded": [], "listings": {}}')
+        assert cache.load("/w") == (set(), {})
+
+        with open(cache.file("/w"), "w", encoding="utf-8") as f:
+            f.write("{")
+        assert cache.load("/w") == (set(), {})
+
+    # Tests that failing to save is logged instead of raised
+    def test_save_error(self, tmp_path):
+        (tmp_path / "explorer").write_text("")
+        base = SimpleNamespace(datadir=str(tmp_path), logger=FakeLogger())
+        ExplorerCache(base).save("/w", set(), {})
+        assert len(base.logger.errors) == 1
+
+
+class TestDirectoryTree:
+    # Tests that a vanished directory is dropped with everything under it, the root stays
+    def test_remove_directory(self):
+        a, sub = os.path.join("/w", "a"), os.path.join("/w", "a", "sub")
+        ab = os.path.join("/w", "ab")
+        tree = explorer("/w", nodes={"/w": '', a: 'n1', sub: 'n2', ab: 'n3'},
+                        listings={a: (1.0, []), sub: (1.0, []), ab: (1.0, [])},
+                        expanded={a, sub, ab}, shown={a: [], sub: []}, tree=FakeTree(['n1', 'n2', 'n3']))
+
+        DirectoryTree.remove_directory(tree, a)
+        assert tree.nodes == {"/w": '', ab: 'n3'} and tree.tree.nodes == {'n3'}
+        assert set(tree.listings) == {ab} and tree.expanded == {ab} and tree.shown == {}
+
+        DirectoryTree.remove_directory(tree, "/w")
+        assert tree.nodes == {"/w": ''}
+
+    # Tests that expanding a directory again keeps the children inserted from its listing
+    def test_reexpand(self):
+        entries = [("a.py", "/w/a.py", False)]
+        tree = explorer("/w", listings={"/w": (1.0, entries)})
+
+        DirectoryTree.load_directory(tree, "/w")
+        assert len(tree.inserting) == 1
+
+        tree.inserting.clear()
+        tree.shown["/w"] = entries
+        DirectoryTree.load_directory(tree, "/w")
+        assert tree.inserting == []
+
+        tree.listings["/w"] = (2.0, entries + [("b.py", "/w/b.py", False)])
+        DirectoryTree.load_directory(tree, "/w")
+        assert len(tree.inserting) == 1
@@ -0,0 +1,35 @@
+from biscuit.core.utils.fuzzy import fuzzy_filter, fuzzy_match
+
+
+class TestFuzzy:
+    # Tests that non subsequences are rejected and empty queries match everything
+    def test_match(self):
+        assert fuzzy_match("zz", "abc") is None
+        assert fuzzy_match("", "abc") == (0, [])
+        assert fuzzy_match("abc", "xaxbxc")[1] == [1, 3, 5]
+
+    # Tests that word boundaries and camelCase humps are preferred
+    def test_bonuses(self):
+        assert fuzzy_match("sf", "showFileSearch")[1] == [0, 4]
+        assert fuzzy_match("gc", "git commit")[0] > fuzzy_match("gc", "bigcat")[0]
+
+    # Tests that filtering ranks consecutive matches first and respects the limit
+    def test_filter(self):
+        results = fuzzy_filter("op", ["toggle panel", "Open file", "close", "open"], limit=2)
+        assert [i.item for i in results] == ["open", "Open file"]
+
+    # Tests that equal scores are ordered by the tiebreak, eg. frecency of palette items
+    def test_tiebreak(self):
+        frecency = {"Open folder": 2.0}
+        results = fuzzy_filter("", ["Open file", "Open folder", "Close"], tiebreak=lambda i: frecency.get(i, 0))
+        assert [i.item for i in results] == ["Open folder", "Open file", "Close"]
+
+    # Tests that the cost of leading unmatched characters is part of choosing the alignment
+    def test_leading_gap(self):
+        assert fuzzy_match("a", "Ac b_aAa") == (36, [0])
+        assert fuzzy_match("a", "xa") == (fuzzy_match("a", "a")[0] - 1 - 2 * 10, [1])
+
+    # Tests that matching the case of the query is rewarded
+    def test_case(self):
+        assert [i.item for i in fuzzy_filter("F", ["file", "File"])] == ["File", "file"]
+        assert [i.item for i in fuzzy_filter("f", ["File", "file"])] == ["file", "File"]
@@ -0,0 +1,85 @@
+import queue
+import subprocess
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from biscuit.core.components.git.history import (Commit, CommitHistory,
+                                                 parse_commit, parse_numstat)
+
+
+def git(cwd, *args):
+    return subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'config', 'user.name', 'Tester')
+    git(tmp_path, 'config', 'user.email', 'tester@example.com')
+    for i in range(25):
+        git(tmp_path, 'commit', '-q', '--allow-empty', '-m', f'commit {i}')
+    return tmp_path
+
+
+def results(history, count, timeout=10):
+    "the next `count` results of the history, waiting for the worker"
+
+    items = []
+    deadline = time.monotonic() + timeout
+    while len(items) < count and time.monotonic() < deadline:
+        try:
+            items.append(history.results.get(timeout=0.1))
+        except queue.Empty:
+            continue
+    return items
+
+
+class TestGitHistory:
+    # Tests that a log record is split into its fields, the subject kept whole
+    def test_parse_commit(self):
+        record = b'\nabc123\0abc\0Some One\x001700000000\0fix: a\0b\n'
+        assert parse_commit(record) == Commit('abc123', 'abc', 'Some One', 1700000000, 'fix: a\0b')
+
+    # Tests that numstat lines are parsed, binary files keeping their '-'
+    def test_parse_numstat(self):
+        data = b'3\t1\tsrc/a.py\n-\t-\timage.png\n0\t2\tdir/with\ttab\n'
+        assert parse_numstat(data) == [
+            ('src/a.py', '3', '1'), ('image.png', '-', '-'), ('dir/with\ttab', '0', '2')]
+
+    # Tests that any page of the log can be read on its own, newest commits first
+    def test_paging(self, repo):
+        history = CommitHistory(SimpleNamespace(base=None))
+        history.page_size = 10
+        generation = history.start()
+
+        for skip in (0, 20, 10):
+            history.request_page(str(repo), skip)
+            (kind, gen, (page_skip, commits)), = results(history, 1)
+            assert (kind, gen, page_skip) == ('page', generation, skip)
+            assert [c.subject for c in commits] == [f'commit {i}' for i in range(24 - skip, max(14 - skip, -1), -1)]
+
+        # past the end of the log
+        history.request_page(str(repo), 30)
+        assert results(history, 1)[0][2] == (30, [])
+
+    # Tests that the history of a single file only lists the commits touching it
+    def test_file(self, repo):
+        (repo / 'a.txt').write_text('a')
+        git(repo, 'add', 'a.txt')
+        git(repo, 'commit', '-q', '-m', 'add a')
+
+        history = CommitHistory(SimpleNamespace(base=None))
+        history.start()
+        history.request_page(str(repo), 0, 'a.txt')
+        _, _, (_, commits) = results(history, 1)[0]
+        assert [c.subject for c in commits] == ['add a']
+
+    # Tests that a repo without commits reads as an empty log
+    def test_empty(self, tmp_path):
+        git(tmp_path, 'init', '-q')
+        history = CommitHistory(SimpleNamespace(base=None))
+        generation = history.start()
+        history.request_page(str(tmp_path), 0)
+        assert results(history, 1) == [('page', generation, (0, []))]
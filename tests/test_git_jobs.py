@@ -0,0 +1,106 @@
+import subprocess
+import time
+from types import SimpleNamespace
+
+from biscuit.core.components.git.jobs import GitJob, GitJobRunner
+
+
+def git(cwd, *args):
+    return subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True).stdout
+
+
+class Recorder:
+    "Stands in for the parts of the app the runner talks to, keeping every call"
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.scheduled = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args))
+
+    def after(self, _, callback) -> None:
+        self.scheduled.append(callback)
+
+
+def make_runner():
+    base = Recorder()
+    base.statusbar = base.notifications = base.logger = base
+    return GitJobRunner(SimpleNamespace(base=base)), base
+
+
+def run_until_idle(runner, base, timeout=30) -> None:
+    deadline = time.monotonic() + timeout
+    while base.scheduled and time.monotonic() < deadline:
+        base.scheduled.pop(0)()
+        time.sleep(0.01)
+    assert runner.current is None
+
+
+def make_remote(tmp_path):
+    remote = tmp_path / 'remote.git'
+    git(tmp_path, 'init', '-q', '--bare', str(remote))
+
+    work = tmp_path / 'work'
+    git(tmp_path, 'init', '-q', str(work))
+    git(work, 'config', 'user.name', 'Tester')
+    git(work, 'config', 'user.email', 'tester@example.com')
+    (work / 'a.txt').write_text('a\n')
+    git(work, 'add', 'a.txt')
+    git(work, 'commit', '-q', '-m', 'first')
+    git(work, 'push', '-q', str(remote), 'HEAD:refs/heads/main')
+    git(remote, 'symbolic-ref', 'HEAD', 'refs/heads/main')
+    return remote
+
+
+class TestGitJobs:
+    # Tests that progress lines are turned into statusbar text and other lines are only kept
+    def test_report(self):
+        runner, _ = make_runner()
+        job = GitJob("Cloning", '.', ['clone'])
+        runner.report(job, "Receiving objects:  45% (450/1000), 1.2 MiB | 600 KiB/s")
+        runner.report(job, "remote: Counting objects: 100% (3/3), done.")
+        runner.report(job, "Cloning into 'x'...")
+        runner.report(job, "")
+
+        assert list(job.output) == [
+            "Receiving objects:  45% (450/1000), 1.2 MiB | 600 KiB/s",
+            "remote: Counting objects: 100% (3/3), done.",
+            "Cloning into 'x'..."]
+        assert [runner.events.get_nowait()[2] for _ in range(2)] == [
+            "Cloning receiving objects 45%", "Cloning counting objects 100%"]
+        assert runner.events.empty()
+
+    # Tests that a clone from a bare repo runs to completion and calls on_done
+    def test_clone(self, tmp_path):
+        remote = make_remote(tmp_path)
+        runner, base = make_runner()
+        done = []
+
+        runner.run("Cloning", str(tmp_path), 'clone', '--progress', remote.as_uri(), 'clone',
+                   on_done=lambda: done.append(True))
+        run_until_idle(runner, base)
+
+        assert done == [True]
+        assert (tmp_path / 'clone' / 'a.txt').read_text() == 'a\n'
+        assert ('start_process', ('git', "Cloning", "git clone")) in base.calls
+        assert ('end_process', ('git',)) in base.calls
+        assert not [call for call in base.calls if call[0] == 'error']
+
+    # Tests that a failing push reports git's error and skips on_done, then the next job runs
+    def test_failure(self, tmp_path):
+        remote = make_remote(tmp_path)
+        git(tmp_path, 'clone', '-q', str(remote), 'clone')
+        runner, base = make_runner()
+        done = []
+
+        runner.run("Pushing", str(tmp_path / 'clone'), 'push', 'no-such-remote', 'main',
+                   on_done=lambda: done.append('push'))
+        runner.run("Fetching", str(tmp_path / 'clone'), 'fetch', on_done=lambda: done.append('fetch'))
+        run_until_idle(runner, base)
+
+        assert done == ['fetch']
+        errors = [args[0] for name, args in base.calls if name == 'error']
+        assert len(errors) == 2
+        assert errors[0].startswith("git push no-such-remote main failed")
+        assert errors[1].startswith("Pushing failed: ")
@@ -0,0 +1,18 @@
+from biscuit.core.components.git.status import diff_status, parse_status
+
+
+class TestGitStatus:
+    # Tests that staged, unstaged, renamed and untracked entries are parsed
+    def test_parse(self):
+        data = (b"1 M. N... 100644 100644 100644 aa bb b\0"
+                b"1 .D N... 100644 100644 000000 aa aa c d\0"
+                b"2 R. N... 100644 100644 100644 aa aa R100 a2\0a\0"
+                b"? new\0")
+        staged, unstaged = parse_status(data)
+        assert staged == {'b': 2, 'a2': 1, 'a': 0}
+        assert unstaged == {'c d': 0, 'new': 3}
+
+    # Tests that only added, removed and kind changed entries are reported
+    def test_diff(self):
+        changed, removed = diff_status({'a': 1, 'b': 2, 'd': 1}, {'b': 0, 'c': 3, 'd': 1})
+        assert changed == {'b': 0, 'c': 3} and removed == {'a'}
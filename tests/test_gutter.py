@@ -0,0 +1,14 @@
+from biscuit.core.components.editors.texteditor.gutter import diff_markers
+
+
+class TestGutter:
+    # Tests that added, modified and deleted lines are marked with editor line numbers
+    def test_markers(self):
+        old = ["a", "b", "c", "d", "e"]
+        new = ["a", "x", "c", "new", "d"]
+        assert diff_markers(old, new) == {2: 'modified', 4: 'added', 5: 'deleted'}
+
+    # Tests that unchanged content has no markers
+    def test_unchanged(self):
+        assert diff_markers(["a", "b"], ["a", "b"]) == {}
+        assert diff_markers([], ["a"]) == {1: 'added'}
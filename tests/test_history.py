@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from biscuit.core import history
+from biscuit.core.components.floating.palette.actionset import item_key
+from biscuit.core.history import FRECENCY_HALF_LIFE, HistoryManager
+
+
+class TestHistory:
+    # Tests that palette selections are ranked by frecency and survive a restart
+    def test_persistence(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(history.time, "time", lambda: 1000.0)
+        base = SimpleNamespace(datadir=str(tmp_path))
+
+        manager = HistoryManager(base)
+        manager.register_palette_selection("file:", "/a/main.py")
+        manager.register_palette_selection("file:", "/a/main.py")
+        manager.register_palette_selection("file:", "/b/main.py")
+        manager.db.close()
+
+        frecency = HistoryManager(base).get_frecency("file:")
+        assert frecency == {"/a/main.py": 2.0, "/b/main.py": 1.0}
+
+    # Tests that scores halve every half life and forgotten selections are pruned on load
+    def test_decay(self, tmp_path, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(history.time, "time", lambda: now[0])
+        base = SimpleNamespace(datadir=str(tmp_path))
+
+        manager = HistoryManager(base)
+        manager.register_palette_selection(">", "Open file")
+        now[0] += FRECENCY_HALF_LIFE
+        assert manager.get_frecency(">") == {"Open file": 0.5}
+
+        manager.register_palette_selection(">", "Open file")
+        assert manager.get_frecency(">") == {"Open file": 1.5}
+        manager.db.close()
+
+        now[0] += 10 * FRECENCY_HALF_LIFE
+        manager = HistoryManager(base)
+        assert manager.get_frecency(">") == {}
+        assert manager.cursor.execute("SELECT COUNT(*) FROM palette_history;").fetchone() == (0,)
+
+    # Tests that same named files are told apart by their path
+    def test_item_key(self):
+        assert item_key(("Open file", lambda _: None)) == "Open file"
+        assert item_key(("main.py", None, "a", "/a/main.py")) == "/a/main.py"
+        assert item_key(("main.py", None, "b", "/b/main.py")) != item_key(("main.py", None, "a", "/a/main.py"))
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+from biscuit.core.components.lsp import io
+from biscuit.core.components.lsp.io import IO
+
+SLEEPER = f'"{sys.executable}" -c "import time; time.sleep(30)"'
+
+
+class FakeManager:
+    def __init__(self):
+        self.notified = 0
+
+    def notify(self, _):
+        self.notified += 1
+
+
+class FakeClient:
+    def __init__(self):
+        self.master = FakeManager()
+        self.base = None
+
+
+class TestLspIO:
+    # Tests that a server spawned after stop() was called is killed instead of leaked
+    def test_stop_while_spawning(self, monkeypatch):
+        spawned, Popen = [], subprocess.Popen
+
+        def popen(*args, **kwargs):
+            spawned.append(Popen(*args, **kwargs))
+            return spawned[-1]
+        monkeypatch.setattr(io.subprocess, 'Popen', popen)
+
+        server = IO(FakeClient(), SLEEPER, '.')
+        server.stop()
+        server._spawn()
+
+        assert len(spawned) == 1 and spawned[0].poll() is not None
+        assert server.p is None and server.t_out is None
+
+    # Tests that stop() kills a running server
+    def test_stop(self):
+        server = IO(FakeClient(), SLEEPER, '.')
+        server._spawn()
+        assert server.p.poll() is None
+
+        server.stop()
+        assert server.p.poll() is not None
@@ -0,0 +1,115 @@
+import subprocess
+import sys
+import time
+
+from biscuit.core.components.lsp.lifecycle import ServerLifecycle
+
+# fake server that only holds on to some memory
+FAKE_SERVER = "import time; data = bytearray(64 * 1024 * 1024); data[::4096] = b'x' * len(data[::4096]); time.sleep(30)"
+
+
+class FakeLogger:
+    def warning(self, text):
+        pass
+
+
+class FakeBase:
+    def __init__(self):
+        self.logger = FakeLogger()
+        self.timers = {}
+
+    def after(self, ms, callback):
+        timer = f"after#{len(self.timers)}"
+        self.timers[timer] = callback
+        return timer
+
+    def after_cancel(self, timer):
+        self.timers.pop(timer, None)
+
+    def fire(self, timer):
+        self.timers.pop(timer)()
+
+
+class FakeManager:
+    def __init__(self):
+        self.base = FakeBase()
+        self.lifecycle = ServerLifecycle(self)
+        self.killed = []
+        self.restarted = []
+
+    def kill(self, instance):
+        self.killed.append(instance)
+        self.lifecycle.stopped(instance)
+
+    def restart(self, instance):
+        self.restarted.append(instance)
+
+
+class FakeIO:
+    def __init__(self, p=None):
+        self.p = p
+
+
+class FakeInstance:
+    def __init__(self, language, tabs=(), p=None):
+        self.language = language
+        self.tabs_opened = set(tabs)
+        self.io = FakeIO(p)
+
+
+class TestLifecycle:
+    # Tests that idle timers of different servers don't cancel each other
+    def test_idle_per_instance(self):
+        manager = FakeManager()
+        python, rust = FakeInstance("Python"), FakeInstance("Rust")
+        for i in (python, rust):
+            manager.lifecycle.started(i)
+            manager.lifecycle.idle(i)
+
+        for timer in list(manager.lifecycle.idle_timers.values()):
+            manager.base.fire(timer)
+        assert manager.killed == [python, rust]
+
+    # Tests that a server used again before its timeout keeps running
+    def test_touch_cancels_idle(self):
+        manager = FakeManager()
+        python = FakeInstance("Python")
+        manager.lifecycle.started(python)
+        manager.lifecycle.idle(python)
+        manager.lifecycle.touch(python)
+        assert not manager.lifecycle.idle_timers
+
+    # Tests that the least recently used server is evicted, unused ones first
+    def test_eviction(self):
+        manager = FakeManager()
+        manager.lifecycle.max_servers = 2
+        a, b, c, d = (FakeInstance(i, tabs=["tab"]) for i in "abcd")
+        manager.lifecycle.started(a)
+        manager.lifecycle.started(b)
+        manager.lifecycle.touch(a)
+        manager.lifecycle.started(c)
+        assert manager.killed == [b]
+
+        a.tabs_opened.clear()
+        manager.lifecycle.started(d)
+        assert manager.killed == [b, a]
+
+    # Tests that a scripted server above the memory cap gets restarted
+    def test_memory_cap(self):
+        manager = FakeManager()
+        manager.lifecycle.memory_cap = 32 * 1024 * 1024
+
+        p = subprocess.Popen([sys.executable, "-c", FAKE_SERVER])
+        small = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            big, idle = FakeInstance("big", p=p), FakeInstance("small", p=small)
+            manager.lifecycle.started(big)
+            manager.lifecycle.started(idle)
+
+            time.sleep(1)
+            manager.lifecycle.sample()
+            assert manager.restarted == [big]
+            assert manager.lifecycle.sampler is not None
+        finally:
+            p.kill()
+            small.kill()
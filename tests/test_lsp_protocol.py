@@ -0,0 +1,52 @@
+import json
+
+from biscuit.core.components.lsp.protocol import Client, capabilities
+
+
+def messages(data: bytes) -> list[dict]:
+    "Unframes the messages a client queued"
+
+    result = []
+    while data:
+        header, _, data = data.partition(b"\r\n\r\n")
+        length = int(header.split(b"Content-Length:")[1].split(b"\r\n")[0])
+        result.append(json.loads(data[:length]))
+        data = data[length:]
+    return result
+
+
+def response(id: int, result) -> bytes:
+    body = json.dumps({"jsonrpc": "2.0", "id": id, "result": result}).encode()
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+class TestLspProtocol:
+    # Tests that initialize advertises the capabilities of this client only
+    def test_capabilities(self):
+        caps = capabilities({"semanticTokens": {"dynamicRegistration": False}})
+        client = Client(process_id=None, root_uri=None, capabilities=caps)
+
+        initialize = messages(client.send())[0]
+        assert initialize["method"] == "initialize"
+        assert initialize["params"]["capabilities"]["textDocument"]["semanticTokens"] == {"dynamicRegistration": False}
+        assert "semanticTokens" not in capabilities()["textDocument"]
+
+    # Tests that requests, cancellation and unanswered ids keep working with the installed tarts,
+    # these reach past its public API
+    def test_private_api(self):
+        client = Client(process_id=None, root_uri=None, capabilities=capabilities())
+        initialize = messages(client.send())[0]
+        assert client.unanswered() == {initialize["id"]}
+
+        list(client.recv(response(initialize["id"], {"capabilities": {}})))
+        assert client.unanswered() == set()
+        assert [i["method"] for i in messages(client.send())] == ["initialized"]
+
+        request_id = client.send_request("textDocument/semanticTokens/full", {"textDocument": {"uri": "file:///a.py"}})
+        assert client.unanswered() == {request_id}
+        client.cancel_request(request_id)
+
+        sent = messages(client.send())
+        assert [(i["method"], i.get("id")) for i in sent] == [("textDocument/semanticTokens/full", request_id),
+                                                              ("$/cancelRequest", None)]
+        assert sent[1]["params"] == {"id": request_id}
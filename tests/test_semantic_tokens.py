@@ -0,0 +1,22 @@
+from biscuit.core.components.lsp.semantic import apply_edits, changed_lines, decode_tokens
+
+TYPES = ['function', 'variable', 'keyword']
+DATA = [0, 4, 3, 0, 0,  0, 5, 2, 1, 0,  2, 0, 6, 2, 0]
+
+
+class TestSemanticTokens:
+    # Tests that relative lines and starts are decoded to absolute positions per line
+    def test_decode(self):
+        assert decode_tokens(DATA, TYPES) == {
+            0: [(4, 3, 'function'), (9, 2, 'variable')],
+            2: [(0, 6, 'keyword')],
+        }
+
+    # Tests that delta edits are applied and only lines with different tokens are reported
+    def test_delta(self):
+        data = apply_edits(DATA, [{'start': 5, 'deleteCount': 5, 'data': [1, 0, 2, 1, 0]}])
+        assert data == [0, 4, 3, 0, 0,  1, 0, 2, 1, 0,  2, 0, 6, 2, 0]
+
+        old, new = decode_tokens(DATA, TYPES), decode_tokens(data, TYPES)
+        assert changed_lines(old, new) == {0, 1, 2, 3}
+        assert changed_lines(new, new) == set()
@@ -0,0 +1,54 @@
+from biscuit.core.components.lsp.scanners import (CLASS, CONSTANT, FUNCTION,
+                                                  METHOD, REGEX_SCANNERS,
+                                                  scan_file, scan_python,
+                                                  scan_regex)
+
+PYTHON = '''
+import os
+
+DEBUG = True
+
+class Foo:
+    def bar(self):
+        local = 1
+
+async def baz():
+    pass
+
+if os.name == "nt":
+    def windows_only():
+        pass
+'''
+
+GO = '''package main
+
+func main() {
+}
+
+func (s *Server) Serve() error {
+'''
+
+
+class TestSymbolScanners:
+    # Tests that python classes, methods, functions and globals are found, but not locals
+    def test_python(self):
+        assert scan_python(PYTHON) == [
+            ("DEBUG", CONSTANT, 4, 0, ""),
+            ("Foo", CLASS, 6, 0, ""),
+            ("bar", METHOD, 7, 4, "Foo"),
+            ("baz", FUNCTION, 10, 0, ""),
+            ("windows_only", FUNCTION, 14, 4, ""),
+        ]
+
+    # Tests that the regex scanners report the line and column of the name
+    def test_regex(self):
+        assert scan_regex(GO, REGEX_SCANNERS[".go"]) == [
+            ("main", FUNCTION, 3, 5, ""),
+            ("Serve", FUNCTION, 6, 17, ""),
+        ]
+
+    # Tests that files which don't parse are indexed as having no symbols
+    def test_broken_file(self, tmp_path):
+        path = tmp_path / "broken.py"
+        path.write_text("def (:\n")
+        assert scan_file(str(path)) == []
@@ -0,0 +1,31 @@
+from biscuit.core.utils.virtualtree import TreeModel
+
+
+class TestTreeModel:
+    # Tests that only children of open nodes show up in the flattened rows
+    def test_rows(self):
+        model = TreeModel()
+        a = model.insert('', iid='a', text='a')
+        b = model.insert('', iid='b', text='b', open=True)
+        model.insert(a, iid='a1')
+        model.insert(b, iid='b1')
+        model.insert(b, 0, iid='b0')
+        assert model.rows() == ['a', 'b', 'b0', 'b1']
+
+        model.set_open(a, True)
+        assert model.rows() == ['a', 'a1', 'b', 'b0', 'b1']
+        assert model.row_index('b1') == 4
+
+    # Tests that deleting and clearing drop the whole subtree
+    def test_delete(self):
+        model = TreeModel()
+        a = model.insert('', open=True)
+        child = model.insert(a, open=True)
+        model.insert(child)
+        model.insert('')
+
+        model.clear(a)
+        assert len(model.nodes) == 3 and model.children(a) == ()
+
+        model.delete(a)
+        assert a not in model and len(model.rows()) == 1